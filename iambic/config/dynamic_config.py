@@ -29,7 +29,9 @@ from iambic.core.models import (
     ExecutionMessage,
     TemplateChangeDetails,
 )
-from iambic.core.utils import sort_dict, yaml
+from iambic.core.parser import set_template_parse_worker_count
+from iambic.core.template_fingerprint import load_template_fingerprint_store
+from iambic.core.utils import resource_staging_store, sort_dict, yaml
 from iambic.plugins.v0_1_0 import PLUGIN_VERSION, aws, azure_ad, google_workspace, okta
 
 try:
@@ -59,6 +61,11 @@ class DetectionMessages(BaseModel):
 
 class CoreConfig(BaseModel):
     minimum_ulimit: int = 64000
+    template_parse_workers: Optional[int] = Field(
+        None,
+        description="The number of processes used to parse templates. "
+        "Defaults to half of the available CPUs.",
+    )
     exception_reporting: Optional[ExceptionReporting] = None
     detection_messages: Optional[DetectionMessages] = None
 
@@ -249,6 +256,8 @@ class Config(ConfigMixin, BaseTemplate):
         output_dir: str,
     ):
         ctx.command = exe_message.parent_command
+        # Templates whose provider resources are unchanged since the last import are not rewritten
+        template_fingerprint_store = load_template_fingerprint_store(output_dir)
         # It's the responsibility of the provider to handle throttling.
         if exe_message.provider_type:
             plugin = [
@@ -256,9 +265,12 @@ class Config(ConfigMixin, BaseTemplate):
                 for plugin in self.configured_plugins
                 if plugin.config_name == exe_message.provider_type
             ][0]
-            await plugin.async_import_callable(
-                exe_message, self.get_config_plugin(plugin), output_dir
-            )
+            try:
+                await plugin.async_import_callable(
+                    exe_message, self.get_config_plugin(plugin), output_dir
+                )
+            finally:
+                template_fingerprint_store.save()
         else:
             tasks = []
             for plugin in self.configured_plugins:
@@ -270,7 +282,12 @@ class Config(ConfigMixin, BaseTemplate):
                     )
                 )
 
-            await asyncio.gather(*tasks)
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # The staged resources are no longer needed once the templates are written
+                resource_staging_store.clear(exe_message.execution_id)
+                template_fingerprint_store.save()
 
     async def run_apply(
         self, exe_message: ExecutionMessage, templates: list[BaseTemplate]
@@ -553,6 +570,8 @@ async def process_config(
     config = dynamic_config(
         plugin_instances=all_plugins, file_path=config_path, **config_dict
     )
+    if config.core and config.core.template_parse_workers:
+        set_template_parse_worker_count(config.core.template_parse_workers)
 
     if configure_plugins:
         log.info("Setting config metadata...")
@@ -1,10 +1,49 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Awaitable, TypeVar
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from iambic.core.logger import log
 
 T = TypeVar("T")
 
+# {event loop: [async callables to run before the loop is closed]}
+_LOOP_CLEANUP_CALLABLES: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, list[Callable[[], Awaitable]]
+] = weakref.WeakKeyDictionary()
+
+
+def register_loop_cleanup(cleanup_callable: Callable[[], Awaitable]):
+    """Run the async callable before the running event loop is closed by run_with_loop_cleanup.
+
+    Used to release resources bound to the event loop, e.g. async clients and their sessions.
+    """
+    loop = asyncio.get_running_loop()
+    _LOOP_CLEANUP_CALLABLES.setdefault(loop, []).append(cleanup_callable)
+
+
+async def run_loop_cleanups():
+    loop = asyncio.get_running_loop()
+    for cleanup_callable in _LOOP_CLEANUP_CALLABLES.pop(loop, []):
+        try:
+            await cleanup_callable()
+        except Exception as err:
+            log.warning("Loop cleanup failed.", error=repr(err))
+
+
+def run_with_loop_cleanup(awaitable: Awaitable[T]) -> T:
+    """asyncio.run the awaitable and run the registered loop cleanups once it completes."""
+
+    async def run() -> T:
+        try:
+            return await awaitable
+        finally:
+            await run_loop_cleanups()
+
+    return asyncio.run(run())
+
 
 async def gather_limit(
     *args: Awaitable[T],
@@ -84,3 +123,78 @@ async def gather_limit(
             ret[lst[i]] = ret[lst[0]]
 
     return ret
+
+
+def get_dependency_order(
+    num_nodes: int, dependencies: dict[int, set[int]]
+) -> list[int]:
+    """
+    Topologically sort the nodes 0..num_nodes-1 so every node comes after its dependencies.
+
+    :param dependencies: {node: {nodes it depends on}}
+    Raises a ValueError if the dependencies contain a cycle.
+    """
+    dependents: dict[int, list[int]] = {node: [] for node in range(num_nodes)}
+    remaining_dependencies = [0] * num_nodes
+    for node, node_dependencies in dependencies.items():
+        for dependency in node_dependencies:
+            dependents[dependency].append(node)
+            remaining_dependencies[node] += 1
+
+    ready = deque(node for node in range(num_nodes) if not remaining_dependencies[node])
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for dependent in dependents[node]:
+            remaining_dependencies[dependent] -= 1
+            if not remaining_dependencies[dependent]:
+                ready.append(dependent)
+
+    if len(order) != num_nodes:
+        raise ValueError(
+            "Unable to order the nodes because the dependencies contain a cycle."
+        )
+    return order
+
+
+async def gather_dependency_graph(
+    *fncs: Callable[[], Awaitable[T]],
+    dependencies: dict[int, set[int]],
+    return_exceptions: bool = False,
+    limit: int = -1,
+) -> list[Any]:
+    """
+    Like gather_limit but each callable is only called once the callables it depends on have finished.
+
+    A node runs as soon as its own dependencies are done instead of waiting on the rest of the graph.
+    Only running nodes count towards the limit.
+    A dependency that raised is still considered finished.
+
+    Example::
+
+        results = await gather_dependency_graph(
+            create_policy, create_group, create_user,
+            dependencies={1: {0}, 2: {0, 1}},
+            limit=2,
+        )
+
+    :param dependencies: {index of a callable: {indexes of the callables it depends on}}
+    """
+    order = get_dependency_order(len(fncs), dependencies)
+    semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+    tasks: list[asyncio.Future] = [None] * len(fncs)
+
+    async def run_node(node: int):
+        if node_dependencies := dependencies.get(node):
+            await asyncio.wait([tasks[dependency] for dependency in node_dependencies])
+
+        if semaphore:
+            async with semaphore:
+                return await fncs[node]()
+        return await fncs[node]()
+
+    for node in order:
+        tasks[node] = asyncio.ensure_future(run_node(node))
+
+    return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
@@ -24,6 +24,39 @@ def group_detect_messages(group_by: str, messages: list) -> dict:
     return grouped_messages
 
 
+def coalesce_detect_messages(messages: list, *resource_id_attrs: str) -> list:
+    """Collapse the messages of a detect cycle to a single message per resource.
+
+    Messages are keyed by their account_id and the resource_id_attrs.
+    The latest message for a resource is kept unless the resource was deleted
+    during the cycle, a delete message always wins.
+
+    Args:
+        messages (list): The messages to coalesce, in the order they were received.
+        resource_id_attrs (str): The attributes that identify the resource within the account.
+
+    Returns:
+        list: One message per resource, in the order each resource was first seen.
+    """
+    coalesced_messages = dict()
+    for message in messages:
+        message_key = (
+            message.account_id,
+            *[getattr(message, attr) for attr in resource_id_attrs],
+        )
+        existing_message = coalesced_messages.get(message_key)
+        if (
+            existing_message is not None
+            and getattr(existing_message, "delete", False)
+            and not getattr(message, "delete", False)
+        ):
+            continue
+
+        coalesced_messages[message_key] = message
+
+    return list(coalesced_messages.values())
+
+
 def generate_template_output(
     excluded_provider_ids: list[str],
     provider_child_map: dict[str, ProviderChild],
@@ -1,23 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
 import os
 import re
-from io import StringIO
 from typing import TYPE_CHECKING, Optional, Type
+from urllib.parse import urlparse
 
+import xxhash
 from deepdiff import DeepDiff
-from git.exc import GitCommandError
+from git.exc import BadName, GitCommandError
 from git.repo import Repo
 from pydantic import BaseModel as PydanticBaseModel
 
 from iambic.core.logger import log
 from iambic.core.models import BaseTemplate
-from iambic.core.parser import load_templates
-from iambic.core.utils import NOQ_TEMPLATE_REGEX, file_regex_search, yaml
+from iambic.core.parser import load_templates, load_yaml_contents
+from iambic.core.utils import NOQ_TEMPLATE_REGEX, aio_wrapper
 
 if TYPE_CHECKING:
     from iambic.config.dynamic_config import Config
 
+# template_type is the first key of a template so the header is enough to identify one
+TEMPLATE_HEADER_READ_SIZE = 4096
+# Lambda keeps /tmp across warm invocations of the same execution environment
+GIT_REPO_CACHE_LAMBDA_DIRECTORY = "/tmp/.iambic/cache/git_repos"
+
+# {(git_dir, remote_name): default branch} resolved by get_remote_default_branch
+_REMOTE_DEFAULT_BRANCH_CACHE: dict[tuple[str, str], str] = {}
+
 
 class GitDiff(PydanticBaseModel):
     path: str
@@ -56,33 +67,223 @@ async def clone_git_repos(config, repo_dir: str) -> dict[str, Repo]:
     return repos
 
 
+def get_git_repo_cache_directory() -> Optional[str]:
+    """The persistent directory holding a bare mirror of every repo cloned by clone_git_repo.
+
+    Set with IAMBIC_GIT_REPO_CACHE_DIR, defaults to /tmp when running in Lambda.
+    """
+    if cache_dir := os.environ.get("IAMBIC_GIT_REPO_CACHE_DIR"):
+        return cache_dir
+    elif os.environ.get("AWS_LAMBDA_FUNCTION_NAME", False):
+        return GIT_REPO_CACHE_LAMBDA_DIRECTORY
+    return None
+
+
+def get_git_repo_mirror_path(repo_url: str, cache_dir: str) -> str:
+    # The url may contain a short-lived token so the credentials are not part of the key
+    parse_result = urlparse(repo_url)
+    parse_result = parse_result._replace(netloc=parse_result.netloc.rsplit("@", 1)[-1])
+    repo_hash = xxhash.xxh64(parse_result.geturl().encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{repo_hash}.git")
+
+
+def update_git_repo_mirror(repo_url: str, cache_dir: str) -> Repo:
+    """Create or incrementally fetch the bare mirror of the repo in the cache directory."""
+    mirror_path = get_git_repo_mirror_path(repo_url, cache_dir)
+    if os.path.exists(os.path.join(mirror_path, "HEAD")):
+        mirror = Repo(mirror_path)
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        mirror = Repo.init(mirror_path, bare=True)
+        with mirror.config_writer() as config_writer:
+            # Clones borrow objects from the mirror so they must never be pruned
+            config_writer.set_value("gc", "auto", 0)
+
+    # The url is passed on every call instead of being stored as a remote
+    # so credentials are never persisted in the cache.
+    mirror.git.fetch(repo_url, "+refs/heads/*:refs/heads/*", "--prune")
+    for line in mirror.git.ls_remote("--symref", repo_url, "HEAD").splitlines():
+        if line.startswith("ref: "):
+            mirror.git.symbolic_ref("HEAD", line[len("ref: ") :].split()[0])
+            break
+
+    return mirror
+
+
 def clone_git_repo(repo_url: str, repo_path: str, remote_branch_name: str):
+    if cache_dir := get_git_repo_cache_directory():
+        try:
+            mirror = update_git_repo_mirror(repo_url, cache_dir)
+            # --shared borrows the objects of the mirror instead of copying them
+            repo = Repo.clone_from(
+                mirror.git_dir, repo_path, branch=remote_branch_name, shared=True
+            )
+            repo.remotes.origin.set_url(repo_url)
+            return repo
+        except GitCommandError as err:
+            log.warning(
+                "Unable to clone from the git repo cache. Cloning from the remote.",
+                cache_dir=cache_dir,
+                error=repr(err),
+            )
+
     repo = Repo.clone_from(repo_url, repo_path, branch=remote_branch_name)
     return repo
 
 
-def get_remote_default_branch(repo: Repo, remote_name: str = "origin"):
-    # This is relying on `git remote show origin`
-    # includes information  HEAD branch: THE_ACTUAL_BRANCH_NAME
-    #
-    remote_info_lines = repo.git.remote("show", remote_name).split("\n")
-    default_branch = ""
-    for line in remote_info_lines:
-        if "HEAD branch" in line:
-            default_branch = line.split(":")[1].strip()
-            break
-    if default_branch == "":
-        default_branch = "main"
+def _get_local_remote_head_branch(repo: Repo, remote_name: str) -> Optional[str]:
+    # refs/remotes/<remote>/HEAD is set by clone and `git remote set-head`
+    remote_head_prefix = f"refs/remotes/{remote_name}/"
+    try:
+        remote_head = repo.git.symbolic_ref(f"{remote_head_prefix}HEAD")
+    except GitCommandError:
+        return None
+
+    if remote_head.startswith(remote_head_prefix):
+        return remote_head[len(remote_head_prefix) :]
+
+
+def get_remote_default_branch(
+    repo: Repo, remote_name: str = "origin", default_branch: Optional[str] = None
+) -> str:
+    """Resolve the default branch of the remote, memoized per repo.
+
+    Resolution order:
+    - The remote HEAD that is known locally
+    - default_branch if provided, e.g. the default_branch of the repo from the GitHub API
+    - `git remote show <remote_name>` which contacts the remote
+    - main
+    """
+    cache_key = (repo.git_dir, remote_name)
+    if cached_default_branch := _REMOTE_DEFAULT_BRANCH_CACHE.get(cache_key):
+        return cached_default_branch
+
+    if local_default_branch := _get_local_remote_head_branch(repo, remote_name):
+        default_branch = local_default_branch
+    elif not default_branch:
+        # This is relying on `git remote show origin`
+        # includes information  HEAD branch: THE_ACTUAL_BRANCH_NAME
+        #
+        remote_info_lines = repo.git.remote("show", remote_name).split("\n")
+        for line in remote_info_lines:
+            if "HEAD branch" in line:
+                default_branch = line.split(":")[1].strip()
+                break
+        if not default_branch:
+            default_branch = "main"
+
+    _REMOTE_DEFAULT_BRANCH_CACHE[cache_key] = default_branch
     return default_branch
 
 
+def _is_template_file(file_path: str) -> bool:
+    """Check if the file is a template.
+
+    template_type is expected at the top of a template,
+    so the rest of the file is only read if it isn't in the header.
+    """
+    try:
+        with open(file_path, "r") as f:
+            header = f.read(TEMPLATE_HEADER_READ_SIZE)
+            if re.search(NOQ_TEMPLATE_REGEX, header):
+                return True
+            elif remainder := f.read():
+                return bool(re.search(NOQ_TEMPLATE_REGEX, header + remainder))
+    except FileNotFoundError:
+        # race condition with different providers
+        pass
+
+    return False
+
+
+def _read_file(file_path: str) -> str:
+    with open(file_path, "r") as f:
+        return f.read()
+
+
+def _get_default_branch_commit(repo: Repo, remote_name: str, fetch: bool):
+    if fetch:
+        # Fetch latest
+        for remote in repo.remotes:
+            remote.fetch()
+    else:
+        # Use the default branch as it was last fetched without contacting the remote
+        try:
+            return repo.commit(f"{remote_name}/HEAD")
+        except (BadName, ValueError):
+            log.debug(
+                "The remote HEAD is not set locally. Resolving the default branch.",
+                remote_name=remote_name,
+            )
+
+    # TODO: We should consider if the default branch is named other than `main`
+    default_branch = get_remote_default_branch(repo, remote_name)
+    return repo.commit(f"{remote_name}/{default_branch}")
+
+
+async def _classify_renamed_files(
+    template_map: dict[str, Type[BaseTemplate]],
+    renamed_files: list[tuple[GitDiff, GitDiff]],
+    files: dict[str, list[GitDiff]],
+):
+    """Add the renamed templates to files based on how they changed.
+
+    :param renamed_files: [(the renamed file, the file as it was before the rename)]
+    """
+    if not renamed_files:
+        return
+
+    # Parse both versions of every renamed template in a single batch
+    template_contents = await asyncio.gather(
+        *[aio_wrapper(_read_file, file.path) for file, _ in renamed_files]
+    )
+    renamed_file_dicts = load_yaml_contents(
+        [
+            content
+            for template_content, (_, deleted_file) in zip(
+                template_contents, renamed_files
+            )
+            for content in (template_content, deleted_file.content)
+        ]
+    )
+    for idx, (file, deleted_file) in enumerate(renamed_files):
+        template_dict = renamed_file_dicts[idx * 2]
+        main_template_dict = renamed_file_dicts[idx * 2 + 1]
+        if template_dict == main_template_dict or not DeepDiff(
+            template_dict,
+            main_template_dict,
+            ignore_order=True,
+            report_repetition=True,
+        ):
+            continue  # Just renamed but no file changes
+
+        if not (template_cls := _get_template_map(template_map, main_template_dict)):
+            continue
+
+        main_template = template_cls(file_path=deleted_file.path, **main_template_dict)
+        main_template.is_memory_only = True
+        template = template_cls(file_path=file.path, **template_dict)
+        if main_template.resource_id != template.resource_id:
+            files["deleted_files"].append(deleted_file)
+            files["new_files"].append(GitDiff(path=file.path))
+            continue
+
+        files["modified_files"].append(file)
+
+
 async def retrieve_git_changes(
     repo_dir: str,
     template_map: dict[str, Type[BaseTemplate]],
     allow_dirty: bool = False,
     from_sha=None,
     to_sha=None,
+    fetch: Optional[bool] = None,
 ) -> dict[str, list[GitDiff]]:
+    """Classify the templates changed between from_sha and to_sha.
+
+    :param fetch: Fetch the remotes before comparing against the default branch when from_sha is None.
+        Defaults to True unless IAMBIC_GIT_SKIP_FETCH is set, e.g. in CI that already fetched.
+    """
     repo = Repo(repo_dir)
     if repo.is_dirty():
         log.error(
@@ -91,19 +292,12 @@ async def retrieve_git_changes(
             file_path=repo_dir,
         )
 
-    from_sha_obj = None
-    to_sha_obj = None
+    if fetch is None:
+        fetch = not os.environ.get("IAMBIC_GIT_SKIP_FETCH", False)
 
     if from_sha is None:
-        # Fetch latest
-        for remote in repo.remotes:
-            remote.fetch()
         # Comparing against default_branch
-        remote_name = "origin"
-        default_branch = get_remote_default_branch(repo, remote_name)
-        commit_origin_main = repo.commit(f"{remote_name}/{default_branch}")
-        # TODO: We should consider if the default branch is named other than `main`
-        from_sha_obj = commit_origin_main
+        from_sha_obj = _get_default_branch_commit(repo, "origin", fetch)
     else:
         from_sha_obj = repo.commit(from_sha)
     if to_sha is None:
@@ -120,14 +314,6 @@ async def retrieve_git_changes(
         "modified_files": [],
     }
 
-    # Collect all new files
-    for file_obj in diff_index.iter_change_type("A"):
-        if (path := str(os.path.join(repo_dir, file_obj.b_path))).endswith(
-            ".yaml"
-        ) and (await file_regex_search(path, NOQ_TEMPLATE_REGEX)):
-            file = GitDiff(path=str(os.path.join(repo_dir, path)))
-            files["new_files"].append(file)
-
     # Collect all deleted files
     if (
         False
@@ -142,54 +328,59 @@ async def retrieve_git_changes(
                 if re.search(NOQ_TEMPLATE_REGEX, file.content):
                     files["deleted_files"].append(file)
 
-    # Collect all modified files
-    for file_obj in diff_index.iter_change_type("M"):
-        if (path := str(os.path.join(repo_dir, file_obj.b_path))).endswith(
-            ".yaml"
-        ) and (await file_regex_search(path, NOQ_TEMPLATE_REGEX)):
-            if (
-                main_path := str(os.path.join(repo_dir, file_obj.a_path))
-            ) != path:  # File was renamed
-                deleted_file = GitDiff(
-                    path=str(os.path.join(repo_dir, main_path)),
-                    content=file_obj.a_blob.data_stream.read().decode("utf-8"),
-                    is_deleted=True,
-                )
+    new_file_objs = [
+        file_obj
+        for file_obj in diff_index.iter_change_type("A")
+        if file_obj.b_path.endswith(".yaml")
+    ]
+    modified_file_objs = [
+        file_obj
+        for file_obj in diff_index.iter_change_type("M")
+        if file_obj.b_path.endswith(".yaml")
+    ]
+    # Check every file concurrently
+    is_template_results = await asyncio.gather(
+        *[
+            aio_wrapper(_is_template_file, str(os.path.join(repo_dir, file_obj.b_path)))
+            for file_obj in itertools.chain(new_file_objs, modified_file_objs)
+        ]
+    )
+    new_file_results = is_template_results[: len(new_file_objs)]
+    modified_file_results = is_template_results[len(new_file_objs) :]
 
-                if re.search(NOQ_TEMPLATE_REGEX, deleted_file.content):
-                    template_dict = yaml.load(open(path))
-                    main_template_dict = yaml.load(StringIO(deleted_file.content))
-                    if not DeepDiff(
-                        template_dict,
-                        main_template_dict,
-                        ignore_order=True,
-                        report_repetition=True,
-                    ):
-                        continue  # Just renamed but no file changes
+    # Collect all new files
+    for file_obj, is_template in zip(new_file_objs, new_file_results):
+        if is_template:
+            files["new_files"].append(
+                GitDiff(path=str(os.path.join(repo_dir, file_obj.b_path)))
+            )
 
-                    if not (
-                        template_cls := _get_template_map(
-                            template_map, main_template_dict
-                        )
-                    ):
-                        continue
+    # Collect all modified files
+    renamed_files = []
+    for file_obj, is_template in zip(modified_file_objs, modified_file_results):
+        if not is_template:
+            continue
 
-                    main_template = template_cls(
-                        file_path=deleted_file.path, **main_template_dict
+        path = str(os.path.join(repo_dir, file_obj.b_path))
+        file = GitDiff(
+            path=path,
+            content=file_obj.a_blob.data_stream.read().decode("utf-8"),
+        )
+        if (
+            main_path := str(os.path.join(repo_dir, file_obj.a_path))
+        ) != path:  # File was renamed
+            if re.search(NOQ_TEMPLATE_REGEX, file.content):
+                renamed_files.append(
+                    (
+                        file,
+                        GitDiff(path=main_path, content=file.content, is_deleted=True),
                     )
-                    main_template.is_memory_only = True
-                    template = template_cls(file_path=path, **template_dict)
-                    if main_template.resource_id != template.resource_id:
-                        files["deleted_files"].append(deleted_file)
-                        files["new_files"].append(GitDiff(path=path))
-                        continue
+                )
+                continue
 
-            file = GitDiff(
-                path=str(os.path.join(repo_dir, path)),
-                content=file_obj.a_blob.data_stream.read().decode("utf-8"),
-            )
-            files["modified_files"].append(file)
+        files["modified_files"].append(file)
 
+    await _classify_renamed_files(template_map, renamed_files, files)
     return files
 
 
@@ -202,8 +393,10 @@ def create_templates_for_deleted_files(
     Add that instance to templates
     """
     templates = []
-    for git_diff in deleted_files:
-        template_dict = yaml.load(StringIO(git_diff.content))
+    template_dicts = load_yaml_contents(
+        [git_diff.content for git_diff in deleted_files]
+    )
+    for git_diff, template_dict in zip(deleted_files, template_dicts):
         if not (template_cls := _get_template_map(template_map, template_dict)):
             continue
 
@@ -221,15 +414,29 @@ def create_templates_for_deleted_files(
 def create_templates_for_modified_files(
     config: Config,
     modified_files: list[GitDiff],
+    modified_templates: Optional[list[BaseTemplate]] = None,
 ) -> list:
     """
     Create a class instance of the original file content and the new file content with its template type
     Check for aws_accounts that were removed from included_accounts or added to excluded_accounts
     Update the template to be applied to delete the role from the aws_accounts that hit on the above statement
+
+    :param modified_templates: The templates already loaded from the modified files.
+        Loaded in a single batch if not provided. They are not mutated.
     """
+    if modified_templates is None:
+        modified_templates = load_templates(
+            [git_diff.path for git_diff in modified_files], config.template_map
+        )
+    modified_template_map = {
+        str(template.file_path): template for template in modified_templates
+    }
+    main_template_dicts = load_yaml_contents(
+        [git_diff.content for git_diff in modified_files]
+    )
+
     templates = []
-    for git_diff in modified_files:
-        main_template_dict = yaml.load(StringIO(git_diff.content))
+    for git_diff, main_template_dict in zip(modified_files, main_template_dicts):
         template_type_string = main_template_dict["template_type"]
         template_cls = config.template_map.get(template_type_string, None)
 
@@ -243,10 +450,11 @@ def create_templates_for_modified_files(
             continue
 
         main_template = template_cls(file_path=git_diff.path, **main_template_dict)
-
-        # template_dict = yaml.load(open(git_diff.path))
-        # template = template_cls(file_path=git_diff.path, **template_dict)
-        template = load_templates([git_diff.path], config.template_map)[0]
+        if not (template := modified_template_map.get(str(git_diff.path))):
+            # The current version is not a valid template which was logged when it was loaded
+            continue
+        # The loaded template is shared with the caller so work on a copy
+        template = template.copy(deep=True)
 
         # EN-1634 dealing with providers that have no concept of multi-accounts
         # a hack to just ignore template that does not have included_accounts attribute
@@ -42,6 +42,7 @@ from iambic.core.utils import (
     create_commented_map,
     get_rendered_template_str_value,
     get_writable_directory,
+    resource_staging_store,
     simplify_dt,
     snake_to_camelcap,
     sort_dict,
@@ -464,6 +465,12 @@ class ProviderChild(PydanticBaseModel):
         IambicManaged.UNDEFINED,
         description="Controls the directionality of iambic changes",
     )
+    variable_templatizers: dict = Field(
+        default_factory=dict,
+        description="(Auto-populated) The compiled variable substitutions used on import",
+        exclude=True,
+        hidden_from_schema=True,
+    )
 
     @property
     def parent_id(self) -> Optional[str]:
@@ -764,6 +771,10 @@ class ExecutionMessage(PydanticBaseModel):
     template_id: Optional[str]
     metadata: Optional[Dict[str, Any]] = None
     templates: Optional[List[str]] = None
+    checkpoint: bool = Field(
+        False,
+        description="Checkpoint completed units of work so the execution can be resumed",
+    )
 
     @root_validator
     def check_parent_command(cls, values: dict):
@@ -806,6 +817,48 @@ class ExecutionMessage(PydanticBaseModel):
     def get_file_path(self, *path_dirs, file_name_and_extension: str) -> str:
         return os.path.join(self.get_directory(*path_dirs), file_name_and_extension)
 
+    def get_checkpoint_path(self, unit: str) -> str:
+        path_params = [
+            path_param
+            for path_param in [self.provider_type, self.provider_id]
+            if path_param
+        ]
+        return os.path.join(
+            get_writable_directory(),
+            ".iambic",
+            self.execution_id,
+            "checkpoints",
+            *path_params,
+            f"{unit}.checkpoint",
+        )
+
+    def is_checkpointed(self, unit: str) -> bool:
+        """Returns True if the unit of work already completed for this execution and provider"""
+        return os.path.exists(self.get_checkpoint_path(unit))
+
+    async def set_checkpoint(self, unit: str):
+        """Record the unit of work as completed for this execution and provider.
+
+        The resources staged under the execution directory are written to disk first
+        so a resumed execution can reuse them instead of collecting them again.
+        """
+        await resource_staging_store.persist(self.get_execution_dir())
+        checkpoint_path = self.get_checkpoint_path(unit)
+        os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+        # Written to a temporary file first so an interrupted write is never mistaken for a checkpoint
+        async with aiofiles.open(f"{checkpoint_path}.tmp", mode="w") as f:
+            await f.write(
+                json.dumps(
+                    {
+                        "unit": unit,
+                        "completed_at": datetime.datetime.now(
+                            datetime.timezone.utc
+                        ).isoformat(),
+                    }
+                )
+            )
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
     async def get_sub_exe_files(
         self,
         *path_dirs,
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import atexit
+import contextlib
 import json
 import os
-import sys
+import pickle
+import tempfile
 import time
 import traceback
-from functools import partial
-from typing import Type, Union
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache, partial
+from importlib.metadata import PackageNotFoundError, version
+from multiprocessing import TimeoutError as PoolTimeoutError
+from typing import Any, Callable, Iterable, Iterator, Optional, Type, Union
 
-from pydantic import ValidationError
-from ruamel.yaml.scanner import ScannerError
+import xxhash
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import Field, ValidationError
+from ruamel.yaml.error import MarkedYAMLError
 
 from iambic.core.logger import log
 from iambic.core.models import BaseTemplate
-from iambic.core.utils import transform_comments, yaml
+from iambic.core.utils import get_writable_directory, transform_comments, yaml
 
 # we must avoid import multiprocessing pool in the module loading time
 if os.environ.get("AWS_LAMBDA_FUNCTION_NAME", False):
@@ -23,6 +32,37 @@ if os.environ.get("AWS_LAMBDA_FUNCTION_NAME", False):
 else:
     from multiprocessing import Pool, cpu_count
 
+# Bump when the structure of the cached template dicts changes
+TEMPLATE_CACHE_VERSION = "1"
+# Cached templates that have not been used for this many days are removed
+TEMPLATE_CACHE_MAX_AGE_DAYS = int(
+    os.environ.get("IAMBIC_TEMPLATE_CACHE_MAX_AGE_DAYS", 30)
+)
+# How often a cache hit refreshes the mtime used to evict the entry
+TEMPLATE_CACHE_TOUCH_INTERVAL_SECONDS = 24 * 60 * 60
+_PRUNED_TEMPLATE_CACHE_DIRS: set[str] = set()
+_TEMPLATE_PARSE_EXECUTOR: Optional[TemplateParseExecutor] = None
+
+
+class TemplateLoadError(PydanticBaseModel):
+    """A template that could not be parsed or validated."""
+
+    file_path: str
+    error: str = Field(..., description="repr of the underlying error")
+    template_type: Optional[str] = None
+    hints: Optional[str] = Field(
+        None, description="Human readable hints for pydantic validation errors"
+    )
+    exception: Optional[Any] = Field(
+        None,
+        description="The underlying exception. Only set when raised in this process.",
+        exclude=True,
+    )
+
+    @property
+    def message(self) -> str:
+        return f"{self.file_path} template has validation error. \n{self.hints or self.error}"
+
 
 # line number is zero-th based
 def resolve_location(loc_list: list[str], ruamel_dict) -> Union[None, int]:
@@ -76,14 +116,156 @@ def format_validation_error(err, ruamel_dict):
         return f"Unable to compute hints: {captured_traceback}"
 
 
-def load_template(template_path: str, raise_validation_err: bool = True) -> dict:
+@lru_cache(maxsize=1)
+def get_template_cache_key_prefix() -> bytes:
+    try:
+        iambic_version = version("iambic-core")
+    except PackageNotFoundError:
+        iambic_version = "unknown"
+
+    return f"{TEMPLATE_CACHE_VERSION}:{iambic_version}:".encode("utf-8")
+
+
+def get_template_cache_dir() -> Optional[str]:
+    """
+    The directory parsed templates are cached in.
+
+    Returns None if the cache has been disabled with IAMBIC_DISABLE_TEMPLATE_CACHE.
+    """
+    if os.environ.get("IAMBIC_DISABLE_TEMPLATE_CACHE", False):
+        return None
+
+    return os.path.join(get_writable_directory(), ".iambic", "cache", "templates")
+
+
+def _write_template_cache(cache_path: str, template_dict: dict):
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temp file and move it into place so a concurrent reader
+        # never sees a partially written file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(template_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as err:
+        log.debug("Unable to cache template", cache_path=cache_path, error=repr(err))
+
+
+def prune_template_cache(
+    cache_dir: str, max_age_days: int = TEMPLATE_CACHE_MAX_AGE_DAYS
+) -> int:
+    """
+    Remove the cached templates that have not been used within max_age_days.
+
+    Entries are keyed by the template contents so every edit leaves the previous entry behind.
+    Returns the number of entries removed.
+    """
+    min_mtime = time.time() - (max_age_days * 24 * 60 * 60)
+    removed = 0
+    try:
+        sub_dirs = [entry.path for entry in os.scandir(cache_dir) if entry.is_dir()]
+    except FileNotFoundError:
+        return removed
+
+    for sub_dir in sub_dirs:
+        try:
+            cache_entries = list(os.scandir(sub_dir))
+        except FileNotFoundError:
+            continue
+
+        for cache_entry in cache_entries:
+            try:
+                if cache_entry.stat().st_mtime < min_mtime:
+                    os.remove(cache_entry.path)
+                    removed += 1
+            except OSError:
+                # Removed by a concurrent prune
+                continue
+
+    if removed:
+        log.debug("Pruned the template cache", cache_dir=cache_dir, removed=removed)
+    return removed
+
+
+def _prune_template_cache_once(cache_dir: str):
+    if cache_dir in _PRUNED_TEMPLATE_CACHE_DIRS:
+        return
+
+    _PRUNED_TEMPLATE_CACHE_DIRS.add(cache_dir)
+    prune_template_cache(cache_dir)
+
+
+def _touch_template_cache(cache_path: str, cache_file):
+    # Keep entries that are still being used from being pruned
+    try:
+        if (
+            time.time() - os.fstat(cache_file.fileno()).st_mtime
+            > TEMPLATE_CACHE_TOUCH_INTERVAL_SECONDS
+        ):
+            os.utime(cache_path)
+    except OSError:
+        pass
+
+
+def load_template_dict(template_path: str, cache_dir: Optional[str] = None):
+    """
+    Load a template file as a comment transformed dict.
+
+    If a cache_dir is provided the parsed dict is cached using a hash of
+    the file contents and IAMbic version, so unchanged templates skip yaml parsing.
+    """
+    if not cache_dir:
+        return transform_comments(yaml.load(open(template_path)))
+
+    with open(template_path, "rb") as f:
+        file_content = f.read()
+
+    content_hash = xxhash.xxh3_128_hexdigest(
+        get_template_cache_key_prefix() + file_content
+    )
+    cache_path = os.path.join(cache_dir, content_hash[:2], f"{content_hash}.pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            template_dict = pickle.load(f)
+            _touch_template_cache(cache_path, f)
+            return template_dict
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        log.debug(
+            "Unable to read cached template", cache_path=cache_path, error=repr(err)
+        )
+
+    template_dict = transform_comments(yaml.load(file_content.decode("utf-8")))
+    _write_template_cache(cache_path, template_dict)
+    return template_dict
+
+
+def _load_yaml_content(content: str):
+    return yaml.load(content)
+
+
+def load_yaml_contents(contents: list[str], use_multiprocessing: bool = True) -> list:
+    """Parse yaml strings, like the previous version of a template in git, in a single batched pass."""
+    if use_multiprocessing and len(contents) > 1:
+        return list(get_template_parse_executor().map(_load_yaml_content, contents))
+
+    return [_load_yaml_content(content) for content in contents]
+
+
+def load_template(
+    template_path: str,
+    raise_validation_err: bool = True,
+    cache_dir: Optional[str] = None,
+) -> dict:
     try:
-        template_dict = transform_comments(yaml.load(open(template_path)))
+        template_dict = load_template_dict(template_path, cache_dir)
         template_type = template_dict.get("template_type")
         if template_type and template_type not in ["NOQ::Core::Config"]:
             template_dict["file_path"] = template_path
             return template_dict
-    except ScannerError as err:
+    except MarkedYAMLError as err:
         log.critical(
             "Invalid template structure", file_path=template_path, error=repr(err)
         )
@@ -91,39 +273,230 @@ def load_template(template_path: str, raise_validation_err: bool = True) -> dict
             raise ValueError(f"{template_path} template has validation error.") from err
 
 
-def load_templates(
+def _run_chunk(fn: Callable, chunk: list[tuple]) -> list:
+    return [fn(*args) for args in chunk]
+
+
+class PoolFuture(Future):
+    """A concurrent.futures.Future backed by a multiprocessing AsyncResult.
+
+    The vendored lambda Pool doesn't support callbacks,
+    so the result is pulled from the AsyncResult when it is requested.
+    """
+
+    def __init__(self, async_result):
+        super().__init__()
+        self._async_result = async_result
+        self.set_running_or_notify_cancel()
+
+    def _resolve(self, timeout: Optional[float] = None):
+        try:
+            self.set_result(self._async_result.get(timeout))
+        except PoolTimeoutError as err:
+            raise FutureTimeoutError() from err
+        except Exception as err:
+            self.set_exception(err)
+
+    def done(self) -> bool:
+        if not super().done() and self._async_result.ready():
+            self._resolve(0)
+        return super().done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not super().done():
+            self._resolve(timeout)
+        return super().result(0)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        if not super().done():
+            self._resolve(timeout)
+        return super().exception(0)
+
+
+class TemplateParseExecutor:
+    """A process wide, lazily created pool for parsing templates.
+
+    Exposes a concurrent.futures style API so callers don't need to know if
+    multiprocessing.Pool or the vendored lambda Pool is being used.
+    The pool is created on first use and reused until shutdown
+    so repeated template loads within a command share warm workers.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or get_template_parse_worker_count()
+        self._pool = None
+        self._pid = None
+
+    def _get_pool(self):
+        if self._pool is not None and self._pid != os.getpid():
+            # The pool was inherited from a forked parent so its workers aren't ours
+            self._pool = None
+
+        if self._pool is None:
+            self._pool = Pool(self.max_workers)
+            # The vendored lambda Pool starts its children on __enter__
+            self._pool.__enter__()
+            self._pid = os.getpid()
+
+        return self._pool
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        return PoolFuture(self._get_pool().apply_async(fn, args, kwargs))
+
+    def map(
+        self,
+        fn: Callable,
+        *iterables: Iterable,
+        chunksize: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator:
+        """Like Executor.map but the work is sent to the workers in chunks.
+
+        If ordered is False, results are yielded as soon as their chunk completes.
+        """
+        args_list = list(zip(*iterables))
+        if not args_list:
+            return iter([])
+
+        if not chunksize:
+            chunksize, extra = divmod(len(args_list), self.max_workers * 4)
+            if extra:
+                chunksize += 1
+
+        futures = [
+            self.submit(_run_chunk, fn, args_list[elem : elem + chunksize])
+            for elem in range(0, len(args_list), chunksize)
+        ]
+
+        def _result_iterator():
+            for future in futures:
+                yield from future.result()
+
+        def _unordered_result_iterator():
+            pending = list(futures)
+            while pending:
+                done = [future for future in pending if future.done()]
+                if not done:
+                    # Block briefly on the oldest chunk rather than busy looping
+                    with contextlib.suppress(FutureTimeoutError):
+                        pending[0].result(timeout=0.05)
+                    continue
+
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+
+        return _result_iterator() if ordered else _unordered_result_iterator()
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is None:
+            return
+
+        if self._pid == os.getpid():
+            if wait:
+                self._pool.close()
+                self._pool.join()
+            self._pool.terminate()
+
+        self._pool = None
+        self._pid = None
+
+
+def get_template_parse_worker_count() -> int:
+    if worker_count := os.environ.get("IAMBIC_TEMPLATE_PARSE_WORKERS"):
+        return max(1, int(worker_count))
+
+    return max(1, cpu_count() // 2)
+
+
+def get_template_parse_executor() -> TemplateParseExecutor:
+    global _TEMPLATE_PARSE_EXECUTOR
+
+    if _TEMPLATE_PARSE_EXECUTOR is None:
+        _TEMPLATE_PARSE_EXECUTOR = TemplateParseExecutor()
+
+    return _TEMPLATE_PARSE_EXECUTOR
+
+
+def set_template_parse_worker_count(max_workers: int):
+    """Resize the shared executor. Workers are recreated on next use."""
+    template_parse_executor = get_template_parse_executor()
+    max_workers = max(1, max_workers)
+    if template_parse_executor.max_workers != max_workers:
+        template_parse_executor.shutdown()
+        template_parse_executor.max_workers = max_workers
+
+
+def shutdown_template_parse_executor():
+    global _TEMPLATE_PARSE_EXECUTOR
+
+    if _TEMPLATE_PARSE_EXECUTOR is not None:
+        _TEMPLATE_PARSE_EXECUTOR.shutdown(wait=False)
+        _TEMPLATE_PARSE_EXECUTOR = None
+
+
+atexit.register(shutdown_template_parse_executor)
+
+
+def _load_template_or_error(
+    template_path: str, cache_dir: Optional[str] = None
+) -> Union[dict, TemplateLoadError, None]:
+    try:
+        return load_template(template_path, cache_dir=cache_dir)
+    except ValueError as err:
+        return TemplateLoadError(
+            file_path=str(template_path), error=repr(err.__cause__ or err)
+        )
+    except OSError as err:
+        # e.g. the template was deleted after it was gathered or can't be read
+        log.critical(
+            "Unable to read template", file_path=template_path, error=repr(err)
+        )
+        return TemplateLoadError(file_path=str(template_path), error=repr(err))
+
+
+def iter_templates(
     template_paths: list[str],
     template_map: dict[str, Type[BaseTemplate]],
-    raise_validation_err: bool = True,
-    use_multiprocessing=True,
-) -> list[BaseTemplate]:
-    templates = []
-    template_dicts = None
+    ordered: bool = True,
+    use_multiprocessing: bool = True,
+) -> Iterator[Union[BaseTemplate, TemplateLoadError]]:
+    """Yield templates as they are parsed.
+
+    A template that fails to parse or validate is yielded as a TemplateLoadError
+    instead of aborting the remaining templates.
+    Unknown template types are logged and skipped.
+
+    :param ordered: If False, templates are yielded in the order the workers finish them.
+    """
+    # Resolved here rather than in the workers so they use the parent's writable directory
+    cache_dir = get_template_cache_dir()
+    if cache_dir:
+        _prune_template_cache_once(cache_dir)
 
-    if use_multiprocessing:
-        load_template_fn = partial(
-            load_template, raise_validation_err=raise_validation_err
+    # Sending a single template to a worker costs more than parsing it
+    if use_multiprocessing and len(template_paths) > 1:
+        template_dicts = get_template_parse_executor().map(
+            partial(_load_template_or_error, cache_dir=cache_dir),
+            template_paths,
+            ordered=ordered,
         )
-        with Pool(max(1, cpu_count() // 2)) as p:
-            template_dicts = p.map(load_template_fn, template_paths)
-            if getattr(sys, "gettrace", None):
-                # When in debug mode, subprocesses can exit
-                # before debugger can attach
-                # https://github.com/microsoft/debugpy/issues/712
-                time.sleep(0.5)
     else:
-        template_dicts = [
-            load_template(path, raise_validation_err) for path in template_paths
-        ]
+        template_dicts = (
+            _load_template_or_error(path, cache_dir) for path in template_paths
+        )
 
     for template_dict in template_dicts:
         if not template_dict:
             continue
+        elif isinstance(template_dict, TemplateLoadError):
+            yield template_dict
+            continue
 
         try:
             template_cls = template_map[template_dict["template_type"]]
             template_cls.update_forward_refs()
-            templates.append(template_cls(**template_dict))
+            yield template_cls(**template_dict)
         except KeyError:
             log.critical(
                 "Invalid template type",
@@ -138,10 +511,28 @@ def load_templates(
                 file_path=template_dict["file_path"],
                 error=repr(err),
             )
-            if raise_validation_err:
-                hints = format_validation_error(err, template_dict)
-                raise ValueError(
-                    f"{template_dict['file_path']} template has validation error. \n{hints}"
-                ) from err
+            yield TemplateLoadError(
+                file_path=str(template_dict["file_path"]),
+                template_type=template_dict["template_type"],
+                error=repr(err),
+                hints=format_validation_error(err, template_dict),
+                exception=err,
+            )
+
+
+def load_templates(
+    template_paths: list[str],
+    template_map: dict[str, Type[BaseTemplate]],
+    raise_validation_err: bool = True,
+    use_multiprocessing=True,
+) -> list[BaseTemplate]:
+    templates = []
+    for template in iter_templates(
+        template_paths, template_map, use_multiprocessing=use_multiprocessing
+    ):
+        if not isinstance(template, TemplateLoadError):
+            templates.append(template)
+        elif raise_validation_err:
+            raise ValueError(template.message) from template.exception
 
     return templates
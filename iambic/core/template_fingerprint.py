@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+import xxhash
+
+from iambic.core import noq_json as json
+from iambic.core.logger import log
+from iambic.core.utils import get_writable_directory
+
+if TYPE_CHECKING:
+    from iambic.core.models import BaseTemplate, ProviderChild
+
+
+TEMPLATE_FINGERPRINT_VERSION = 1
+
+# {fingerprint_file_path: TemplateFingerprintStore} for every repo being imported by this process.
+_TEMPLATE_FINGERPRINT_STORE_CACHE: dict[str, TemplateFingerprintStore] = {}
+
+
+def get_template_fingerprint(
+    template: BaseTemplate, all_provider_children: list[ProviderChild]
+) -> str:
+    """An xxhash of the normalized template generated from the provider resources.
+
+    The provider children are part of the fingerprint because merge_model
+    uses them to resolve the access rules of the existing template.
+    """
+    return xxhash.xxh3_128_hexdigest(
+        json.dumps(
+            {
+                "file_path": str(template.file_path),
+                "template": template.dict(),
+                "provider_children": sorted(
+                    provider_child.preferred_identifier
+                    for provider_child in all_provider_children
+                ),
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    )
+
+
+class TemplateFingerprintStore:
+    """
+    A persistent record of the fingerprint each template in a repo was last imported with.
+
+    Every template written by an import is tracked by its path relative to the repo root.
+    Each entry stores:
+    - fingerprint: The get_template_fingerprint of the template that was written
+    - mtime_ns, size: The stat of the file once written, used to detect local edits
+    """
+
+    def __init__(self, repo_dir: Union[str, Path]):
+        self.repo_dir = Path(repo_dir).expanduser().absolute()
+        self.entries: dict[str, dict] = {}
+        self._is_dirty = False
+
+    @property
+    def fingerprint_file_path(self) -> Path:
+        repo_hash = xxhash.xxh64(str(self.repo_dir).encode("utf-8")).hexdigest()
+        return Path(
+            get_writable_directory(),
+            ".iambic",
+            "cache",
+            "template_fingerprints",
+            f"{repo_hash}.json",
+        )
+
+    def _get_rel_path(self, file_path: Union[str, Path]) -> Optional[str]:
+        try:
+            return (
+                Path(file_path)
+                .expanduser()
+                .absolute()
+                .relative_to(self.repo_dir)
+                .as_posix()
+            )
+        except ValueError:
+            return None
+
+    def load(self):
+        try:
+            with open(self.fingerprint_file_path, "r") as f:
+                fingerprint_dict = json.loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception as err:
+            log.warning(
+                "Unable to read the template fingerprints. Rebuilding.",
+                file_path=str(self.fingerprint_file_path),
+                error=repr(err),
+            )
+            return
+
+        if fingerprint_dict.get("version") == TEMPLATE_FINGERPRINT_VERSION:
+            self.entries = fingerprint_dict.get("entries", {})
+
+    def save(self):
+        if not self._is_dirty:
+            return
+
+        fingerprint_file_path = self.fingerprint_file_path
+        try:
+            os.makedirs(fingerprint_file_path.parent, exist_ok=True)
+            # Write to a temp file and move it into place to avoid partial writes
+            # if multiple iambic processes share a writable directory.
+            fd, tmp_path = tempfile.mkstemp(dir=fingerprint_file_path.parent)
+            with os.fdopen(fd, "w") as f:
+                f.write(
+                    json.dumps(
+                        {
+                            "version": TEMPLATE_FINGERPRINT_VERSION,
+                            "entries": self.entries,
+                        }
+                    )
+                )
+            os.replace(tmp_path, fingerprint_file_path)
+            self._is_dirty = False
+        except OSError as err:
+            log.warning(
+                "Unable to persist the template fingerprints.",
+                file_path=str(fingerprint_file_path),
+                error=repr(err),
+            )
+
+    def is_unchanged(self, file_path: Union[str, Path], fingerprint: str) -> bool:
+        """Returns True if the template file was last written with the fingerprint and hasn't been edited since."""
+        rel_path = self._get_rel_path(file_path)
+        if not rel_path or not (entry := self.entries.get(rel_path)):
+            return False
+
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return False
+
+        return (
+            entry["fingerprint"] == fingerprint
+            and entry["mtime_ns"] == file_stat.st_mtime_ns
+            and entry["size"] == file_stat.st_size
+        )
+
+    def set_fingerprint(self, file_path: Union[str, Path], fingerprint: str):
+        if not (rel_path := self._get_rel_path(file_path)):
+            return
+
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            self.entries.pop(rel_path, None)
+        else:
+            self.entries[rel_path] = {
+                "fingerprint": fingerprint,
+                "mtime_ns": file_stat.st_mtime_ns,
+                "size": file_stat.st_size,
+            }
+        self._is_dirty = True
+
+
+def load_template_fingerprint_store(
+    repo_dir: Union[str, Path]
+) -> TemplateFingerprintStore:
+    """Return the TemplateFingerprintStore for the repo, loading it from disk on first use."""
+    fingerprint_store = TemplateFingerprintStore(repo_dir)
+    store_key = str(fingerprint_store.fingerprint_file_path)
+    if cached_store := _TEMPLATE_FINGERPRINT_STORE_CACHE.get(store_key):
+        return cached_store
+
+    fingerprint_store.load()
+    _TEMPLATE_FINGERPRINT_STORE_CACHE[store_key] = fingerprint_store
+    return fingerprint_store
+
+
+def get_template_fingerprint_store(
+    file_path: Union[str, Path]
+) -> Optional[TemplateFingerprintStore]:
+    """Return the loaded TemplateFingerprintStore of the repo containing the file, if any."""
+    for fingerprint_store in _TEMPLATE_FINGERPRINT_STORE_CACHE.values():
+        if fingerprint_store._get_rel_path(file_path):
+            return fingerprint_store
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import itertools
+import re
 from collections import OrderedDict, defaultdict
-from typing import Type, Union
+from typing import Iterator, Type, Union
 
 import xxhash
 
@@ -10,6 +12,11 @@ from iambic.core.iambic_enum import IambicManaged
 from iambic.core.logger import log
 from iambic.core.models import AccessModelMixin, BaseModel, BaseTemplate, ProviderChild
 from iambic.core.parser import load_templates
+from iambic.core.template_fingerprint import (
+    get_template_fingerprint,
+    get_template_fingerprint_store,
+)
+from iambic.core.template_index import get_template_index
 from iambic.core.utils import (
     IAMBIC_ERR_MSG,
     evaluate_on_provider,
@@ -54,6 +61,10 @@ async def get_existing_template_map(
     templates = load_templates(
         await gather_templates(repo_dir, template_type), template_map
     )
+    template_index = await get_template_index(repo_dir)
+    template_index.set_resource_ids(templates)
+    template_index.save()
+
     if not nested:
         return {template.resource_id: template for template in templates}
 
@@ -63,6 +74,80 @@ async def get_existing_template_map(
     return response
 
 
+class VariableTemplatizer:
+    """Replaces the values of a provider child's variables with their template references.
+
+    The variable values are sanitized once on creation and every value is matched
+    by a single combined regex so a resource is templatized in one pass.
+    When several values match at the same position the variable defined first wins,
+    the same precedence the variables have always had.
+    The variables themselves are left untouched.
+    """
+
+    def __init__(self, variables: list, valid_characters_re: str):
+        replacements = {}
+        for var in variables:
+            value = var.value
+            if isinstance(value, str):
+                value = sanitize_string(value, valid_characters_re)
+            if value and value not in replacements:
+                replacements[value] = "{{{{var.{}}}}}".format(var.key)
+
+        self.signature = self.get_signature(variables)
+        self._replacements = replacements
+        self._pattern = (
+            re.compile("|".join(re.escape(value) for value in replacements))
+            if replacements
+            else None
+        )
+
+    @staticmethod
+    def get_signature(variables: list) -> tuple:
+        return tuple((var.key, var.value) for var in variables)
+
+    def _replace(self, match: re.Match) -> str:
+        return self._replacements[match.group(0)]
+
+    def templatize_str(self, resource: str) -> str:
+        if self._pattern is None:
+            return resource
+        return self._pattern.sub(self._replace, resource)
+
+    def templatize(self, resource):
+        """Templatizes every str key and value of a resource without serializing it"""
+        if isinstance(resource, str):
+            return self.templatize_str(resource)
+        elif isinstance(resource, dict):
+            return {
+                self.templatize(key): self.templatize(val)
+                for key, val in resource.items()
+            }
+        elif isinstance(resource, (list, tuple)):
+            return [self.templatize(elem) for elem in resource]
+        return resource
+
+
+def get_variable_templatizer(
+    provider_child: ProviderChild, valid_characters_re: str
+) -> VariableTemplatizer:
+    """Returns the VariableTemplatizer of the provider child.
+
+    It is cached on the provider child and rebuilt if its variables change.
+    """
+    variables = getattr(provider_child, "variables", None) or []
+    templatizers = getattr(provider_child, "variable_templatizers", None)
+    if templatizers is None:
+        return VariableTemplatizer(variables, valid_characters_re)
+
+    templatizer = templatizers.get(valid_characters_re)
+    if not templatizer or templatizer.signature != VariableTemplatizer.get_signature(
+        variables
+    ):
+        templatizer = VariableTemplatizer(variables, valid_characters_re)
+        templatizers[valid_characters_re] = templatizer
+    return templatizer
+
+
 def templatize_resource(
     provider_child: ProviderChild,
     resource,
@@ -70,26 +155,15 @@ def templatize_resource(
     substitute_variables: bool = True,
 ):
     resource_type = type(resource)
+    templatizer = (
+        get_variable_templatizer(provider_child, valid_characters_re)
+        if substitute_variables
+        else VariableTemplatizer([], valid_characters_re)
+    )
 
     if isinstance(resource, dict) or isinstance(resource, list):
-        resource = json.dumps(resource)
-    elif resource_type != str:
-        resource = str(resource)
-
-    if substitute_variables:
-        if variables := getattr(provider_child, "variables", None):
-            for var in variables:
-                if isinstance(var.value, str):
-                    var.value = sanitize_string(var.value, valid_characters_re)
-
-                var_key_str = "{{var.{}}}".format(var.key)
-                resource = resource.replace(var.value, "{{{}}}".format(var_key_str))
-
-    return (
-        json.loads(resource)
-        if resource_type == dict or resource_type == list
-        else resource_type(resource)
-    )
+        return templatizer.templatize(resource)
+    return resource_type(templatizer.templatize_str(str(resource)))
 
 
 def base_group_int_attribute(
@@ -112,6 +186,90 @@ def base_group_int_attribute(
     return response
 
 
+def _null_out_resource_keys(
+    provider_child_resource: dict,
+    resource_elem: int,
+    key_map_key: str,
+    elem_key_map_key: str,
+):
+    """Remove every representation of the resource from the look-ups of the provider child"""
+    for resource_key in provider_child_resource[elem_key_map_key][resource_elem]:
+        provider_child_resource[key_map_key][resource_key] = None
+    provider_child_resource[elem_key_map_key][resource_elem] = []
+
+
+def _group_shared_resource_keys(
+    provider_child_resources: list[dict],
+    key_map_key: str,
+    elem_key_map_key: str,
+) -> Iterator[tuple[str, tuple[int, int], list[tuple[int, int]]]]:
+    """Yields each resource key that is shared across provider children.
+
+    Each provider child resource must have a map of resource key to resource elem under key_map_key
+        and the reverse, resource elem to all of its resource keys, under elem_key_map_key.
+
+    An inverted index from resource key to the provider children that have it is used
+        so each provider child is only compared with the provider children it shares a key with.
+    A provider child's resource can only be part of a single group,
+        so once grouped all representations of the resource are nulled out.
+
+    :return: Iterator[(resource_key, (outer_elem, outer_resource_elem), list[(inner_elem, inner_resource_elem)])]
+        The outer_elem is the first provider child with the key,
+        the inner elems are the remaining provider children with the key in order.
+    """
+    # resource_key -> list[provider_child_elem]
+    key_provider_children: dict[str, list[int]] = defaultdict(list)
+    # The position of the provider child in key_provider_children[resource_key]
+    key_positions: list[dict[str, int]] = []
+    for provider_child_elem, provider_child_resource in enumerate(
+        provider_child_resources
+    ):
+        positions = {}
+        for resource_key in provider_child_resource[key_map_key].keys():
+            positions[resource_key] = len(key_provider_children[resource_key])
+            key_provider_children[resource_key].append(provider_child_elem)
+        key_positions.append(positions)
+
+    for outer_elem, outer_provider_child_resource in enumerate(
+        provider_child_resources
+    ):
+        for resource_key, outer_resource_elem in outer_provider_child_resource[
+            key_map_key
+        ].items():
+            if outer_resource_elem is None:  # It hit on something already
+                continue
+
+            inner_matches = []
+            for inner_elem in itertools.islice(
+                key_provider_children[resource_key],
+                key_positions[outer_elem][resource_key] + 1,
+                None,
+            ):
+                inner_provider_child_resource = provider_child_resources[inner_elem]
+                inner_resource_elem = inner_provider_child_resource[key_map_key][
+                    resource_key
+                ]
+                if inner_resource_elem is None:
+                    continue
+
+                inner_matches.append((inner_elem, inner_resource_elem))
+                _null_out_resource_keys(
+                    inner_provider_child_resource,
+                    inner_resource_elem,
+                    key_map_key,
+                    elem_key_map_key,
+                )
+
+            if inner_matches:
+                _null_out_resource_keys(
+                    outer_provider_child_resource,
+                    outer_resource_elem,
+                    key_map_key,
+                    elem_key_map_key,
+                )
+                yield resource_key, (outer_elem, outer_resource_elem), inner_matches
+
+
 async def base_group_str_attribute(
     provider_child_map: dict[str, ProviderChild],
     provider_child_resources: list[dict],
@@ -187,55 +345,17 @@ async def base_group_str_attribute(
     grouped_resource_map = defaultdict(
         list
     )  # val:str = list(dict(name: str, path: str, account_id: str))
-    # Iterate everything looking for shared names across provider children
-    for outer_elem in range(len(provider_child_resources)):
-        for resource_val, outer_resource_elem in provider_child_resources[outer_elem][
-            "resource_val_map"
-        ].items():
-            if outer_resource_elem is None:  # It hit on something already
-                continue
-            for inner_elem in range(outer_elem + 1, len(provider_child_resources)):
-                if (
-                    inner_resource_elem := provider_child_resources[inner_elem][
-                        "resource_val_map"
-                    ].get(resource_val)
-                ) is not None:
-                    if not grouped_resource_map.get(resource_val):
-                        # Null out the outer_resource_elem in all the places
-                        for rn in provider_child_resources[outer_elem][
-                            "elem_resource_val_map"
-                        ][outer_resource_elem]:
-                            provider_child_resources[outer_elem]["resource_val_map"][
-                                rn
-                            ] = None
-                        provider_child_resources[outer_elem]["elem_resource_val_map"][
-                            outer_resource_elem
-                        ] = []
-
-                        grouped_resource_map[resource_val] = [
-                            provider_child_resources[inner_elem]["resources"][
-                                inner_resource_elem
-                            ],
-                            provider_child_resources[outer_elem]["resources"][
-                                outer_resource_elem
-                            ],
-                        ]
-                    else:
-                        grouped_resource_map[resource_val].append(
-                            provider_child_resources[inner_elem]["resources"][
-                                inner_resource_elem
-                            ]
-                        )
-
-                    for rn in provider_child_resources[inner_elem][
-                        "elem_resource_val_map"
-                    ][inner_resource_elem]:
-                        provider_child_resources[inner_elem]["resource_val_map"][
-                            rn
-                        ] = None
-                    provider_child_resources[inner_elem]["elem_resource_val_map"][
-                        inner_resource_elem
-                    ] = []
+    for resource_val, outer, inner_matches in _group_shared_resource_keys(
+        provider_child_resources, "resource_val_map", "elem_resource_val_map"
+    ):
+        outer_elem, outer_resource_elem = outer
+        grouped_resource_map[resource_val] = [
+            provider_child_resources[inner_elem]["resources"][inner_resource_elem]
+            for inner_elem, inner_resource_elem in inner_matches
+        ]
+        grouped_resource_map[resource_val].insert(
+            1, provider_child_resources[outer_elem]["resources"][outer_resource_elem]
+        )
 
     # Set the remaining attributes unique attributes
     for provider_child_resource in provider_child_resources:
@@ -333,59 +453,21 @@ async def base_group_dict_attribute(
     grouped_resource_map = (
         dict()
     )  # val:str = list(dict(name: str, path: str, provider_child_key_id: str))
-    # Iterate everything looking for shared names across aws_accounts
-    for outer_elem in range(len(provider_child_resources)):
-        for resource_hash, outer_resource_elem in provider_child_resources[outer_elem][
-            "resource_hash_map"
-        ].items():
-            if outer_resource_elem is None:  # It hit on something already
-                continue
-            for inner_elem in range(outer_elem + 1, len(provider_child_resources)):
-                if (
-                    inner_resource_elem := provider_child_resources[inner_elem][
-                        "resource_hash_map"
-                    ].get(resource_hash)
-                ) is not None:
-                    if not grouped_resource_map.get(resource_hash):
-                        grouped_resource_map[resource_hash] = {
-                            "resource_val": hash_map[resource_hash],
-                            included_children_key: [
-                                provider_child_resources[inner_elem][
-                                    provider_child_key_id
-                                ],
-                                provider_child_resources[outer_elem][
-                                    provider_child_key_id
-                                ],
-                            ],
-                        }
-
-                        # Null out the outer_resource_elem in all the places
-                        for rn in provider_child_resources[outer_elem][
-                            "elem_resource_hash_map"
-                        ][outer_resource_elem]:
-                            provider_child_resources[outer_elem]["resource_hash_map"][
-                                rn
-                            ] = None
-                        provider_child_resources[outer_elem]["elem_resource_hash_map"][
-                            outer_resource_elem
-                        ] = []
-                    else:
-                        grouped_resource_map[resource_hash][
-                            included_children_key
-                        ].append(
-                            provider_child_resources[inner_elem][provider_child_key_id]
-                        )
-
-                    # Null out the inner_resource_elem in all the places
-                    for rn in provider_child_resources[inner_elem][
-                        "elem_resource_hash_map"
-                    ][inner_resource_elem]:
-                        provider_child_resources[inner_elem]["resource_hash_map"][
-                            rn
-                        ] = None
-                    provider_child_resources[inner_elem]["elem_resource_hash_map"][
-                        inner_resource_elem
-                    ] = []
+    for resource_hash, outer, inner_matches in _group_shared_resource_keys(
+        provider_child_resources, "resource_hash_map", "elem_resource_hash_map"
+    ):
+        outer_elem, _ = outer
+        included_children = [
+            provider_child_resources[inner_elem][provider_child_key_id]
+            for inner_elem, _ in inner_matches
+        ]
+        included_children.insert(
+            1, provider_child_resources[outer_elem][provider_child_key_id]
+        )
+        grouped_resource_map[resource_hash] = {
+            "resource_val": hash_map[resource_hash],
+            included_children_key: included_children,
+        }
 
     # Set the remaining attributes unique attributes
     for provider_child_resource in provider_child_resources:
@@ -585,18 +667,32 @@ def create_or_update_template(
         **template_params,
     )
 
+    fingerprint = None
+    if fingerprint_store := get_template_fingerprint_store(file_path):
+        fingerprint = get_template_fingerprint(new_template, all_provider_children)
+
     # iambic-specific knowledge requires us to load the existing template
     # because it will not be reflected by AWS API.
     if existing_template := existing_template_map.get(identifier, None):
         if existing_template.iambic_managed == IambicManaged.ENFORCED:
             # If the template is marked as ENFORCED, we should not update it during import.
             return
+        elif fingerprint and fingerprint_store.is_unchanged(
+            existing_template.file_path, fingerprint
+        ):
+            # Neither the provider resource nor the template changed since the last import
+            return existing_template
+
         merged_template = merge_model(
             new_template, existing_template, all_provider_children
         )
 
         try:
             merged_template.write()
+            if fingerprint:
+                fingerprint_store.set_fingerprint(
+                    merged_template.file_path, fingerprint
+                )
             return merged_template
         except Exception as err:
             log.exception(
@@ -608,6 +704,8 @@ def create_or_update_template(
     else:
         try:
             new_template.write()
+            if fingerprint:
+                fingerprint_store.set_fingerprint(new_template.file_path, fingerprint)
             return new_template
         except Exception as err:
             log.exception(
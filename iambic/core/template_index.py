@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+import aiofiles
+import xxhash
+
+from iambic.core import noq_json as json
+from iambic.core.aio_utils import gather_limit
+from iambic.core.logger import log
+from iambic.core.utils import NOQ_TEMPLATE_REGEX, aio_wrapper, get_writable_directory
+
+if TYPE_CHECKING:
+    from iambic.core.models import BaseTemplate
+
+
+TEMPLATE_INDEX_VERSION = 1
+# Captures the complete template_type line(s) so type filters can be evaluated
+# against the index the same way they were evaluated against the whole file.
+TEMPLATE_HEADER_REGEX = rf"{NOQ_TEMPLATE_REGEX}.*"
+TEMPLATE_TYPE_REGEX = r"NOQ::\S+"
+
+# {index_file_path: TemplateIndex} so repeated lookups within a process
+# don't need to re-read the index from disk.
+_TEMPLATE_INDEX_CACHE: dict[str, TemplateIndex] = {}
+
+
+class TemplateIndex:
+    """
+    A persistent index of the IAMbic templates in a repo.
+
+    Every yaml file in the repo is tracked by its path relative to the repo root.
+    An entry is only rebuilt when the file's mtime or size changes,
+    so unchanged files are never opened after the initial scan.
+
+    Each entry stores:
+    - mtime_ns, size: Used to detect changes
+    - headers: The template_type line(s) matching NOQ_TEMPLATE_REGEX. Empty for non-templates.
+    - template_type: e.g. NOQ::AWS::IAM::Role
+    - resource_id: Set once the template has been loaded, None otherwise
+    """
+
+    def __init__(self, repo_dir: Union[str, Path]):
+        self.repo_dir = Path(repo_dir)
+        self.entries: dict[str, dict] = {}
+        self._is_dirty = False
+
+    @property
+    def index_file_path(self) -> Path:
+        repo_hash = xxhash.xxh64(
+            str(self.repo_dir.expanduser().absolute()).encode("utf-8")
+        ).hexdigest()
+        return Path(
+            get_writable_directory(),
+            ".iambic",
+            "cache",
+            "template_index",
+            f"{repo_hash}.json",
+        )
+
+    def load(self):
+        try:
+            with open(self.index_file_path, "r") as f:
+                index_dict = json.loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception as err:
+            log.warning(
+                "Unable to read the template index. Rebuilding.",
+                file_path=str(self.index_file_path),
+                error=repr(err),
+            )
+            return
+
+        if index_dict.get("version") == TEMPLATE_INDEX_VERSION:
+            self.entries = index_dict.get("entries", {})
+
+    def save(self):
+        if not self._is_dirty:
+            return
+
+        index_file_path = self.index_file_path
+        try:
+            os.makedirs(index_file_path.parent, exist_ok=True)
+            # Write to a temp file and move it into place to avoid partial writes
+            # if multiple iambic processes share a writable directory.
+            fd, tmp_path = tempfile.mkstemp(dir=index_file_path.parent)
+            with os.fdopen(fd, "w") as f:
+                f.write(
+                    json.dumps(
+                        {"version": TEMPLATE_INDEX_VERSION, "entries": self.entries}
+                    )
+                )
+            os.replace(tmp_path, index_file_path)
+            self._is_dirty = False
+        except OSError as err:
+            log.warning(
+                "Unable to persist the template index.",
+                file_path=str(index_file_path),
+                error=repr(err),
+            )
+
+    async def _index_file(self, rel_path: str, file_stat: os.stat_result):
+        try:
+            async with aiofiles.open(self.repo_dir.joinpath(rel_path), mode="r") as f:
+                file_content = await f.read()
+        except FileNotFoundError:
+            # race condition with different providers
+            self.entries.pop(rel_path, None)
+            return
+
+        headers = re.findall(TEMPLATE_HEADER_REGEX, file_content)
+        template_type = None
+        if headers and (match := re.search(TEMPLATE_TYPE_REGEX, headers[0])):
+            template_type = match.group(0)
+
+        self.entries[rel_path] = {
+            "mtime_ns": file_stat.st_mtime_ns,
+            "size": file_stat.st_size,
+            "headers": headers,
+            "template_type": template_type,
+            "resource_id": None,
+        }
+
+    def _scan(self) -> tuple[set[str], list[tuple[str, os.stat_result]]]:
+        """Walk the repo and stat every yaml file.
+
+        :return: (The relative path of every yaml file, [(rel_path, file_stat)] of the files that changed)
+        """
+        # since multiple glob pattern can potential intersect, we use a set data structure
+        # to suppress any duplicate for defensive measure
+        # Support both yaml and yml extensions for templates
+        file_path_set = set()
+        file_path_set.update(self.repo_dir.glob("**/*.yaml"))
+        file_path_set.update(self.repo_dir.glob("**/*.yml"))
+
+        seen_paths = set()
+        stale_files = []
+        for file_path in file_path_set:
+            try:
+                file_stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+
+            rel_path = file_path.relative_to(self.repo_dir).as_posix()
+            seen_paths.add(rel_path)
+            entry = self.entries.get(rel_path)
+            if (
+                entry
+                and entry["mtime_ns"] == file_stat.st_mtime_ns
+                and entry["size"] == file_stat.st_size
+            ):
+                continue
+
+            stale_files.append((rel_path, file_stat))
+
+        return seen_paths, stale_files
+
+    async def refresh(self):
+        """Sync the index with the repo, only reading files that changed since the last refresh."""
+        # The walk is run in a thread so it doesn't block the event loop on large repos
+        seen_paths, stale_files = await aio_wrapper(self._scan)
+        for rel_path in set(self.entries.keys()) - seen_paths:
+            self.entries.pop(rel_path)
+            self._is_dirty = True
+
+        if stale_files:
+            log.debug(
+                "Updating the template index.",
+                repo_dir=str(self.repo_dir),
+                stale_files=len(stale_files),
+            )
+            await gather_limit(
+                *[
+                    self._index_file(rel_path, file_stat)
+                    for rel_path, file_stat in stale_files
+                ],
+                limit=int(os.environ.get("IAMBIC_GATHER_TEMPLATES_LIMIT", 10)),
+            )
+            self._is_dirty = True
+
+    def get_template_paths(self, template_type: Optional[str] = None) -> list[Path]:
+        regex_pattern = re.compile(
+            rf"{NOQ_TEMPLATE_REGEX}.*{template_type}"
+            if template_type
+            else NOQ_TEMPLATE_REGEX
+        )
+        return [
+            self.repo_dir.joinpath(rel_path)
+            for rel_path, entry in self.entries.items()
+            if any(regex_pattern.search(header) for header in entry["headers"])
+        ]
+
+    def set_resource_ids(self, templates: list[BaseTemplate]):
+        """Record the resource_id of loaded templates that belong to this repo."""
+        repo_dir = self.repo_dir.expanduser().absolute()
+        for template in templates:
+            try:
+                rel_path = (
+                    Path(template.file_path)
+                    .expanduser()
+                    .absolute()
+                    .relative_to(repo_dir)
+                    .as_posix()
+                )
+            except ValueError:
+                continue
+
+            if (entry := self.entries.get(rel_path)) and entry.get(
+                "resource_id"
+            ) != template.resource_id:
+                entry["resource_id"] = template.resource_id
+                self._is_dirty = True
+
+
+async def get_template_index(repo_dir: Union[str, Path]) -> TemplateIndex:
+    """Return the refreshed TemplateIndex for the repo, loading it from disk on first use."""
+    template_index = TemplateIndex(repo_dir)
+    index_key = str(template_index.index_file_path)
+    if cached_index := _TEMPLATE_INDEX_CACHE.get(index_key):
+        # Entries are relative so the same index serves any spelling of repo_dir
+        cached_index.repo_dir = template_index.repo_dir
+        template_index = cached_index
+    else:
+        await aio_wrapper(template_index.load)
+        _TEMPLATE_INDEX_CACHE[index_key] = template_index
+
+    await template_index.refresh()
+    await aio_wrapper(template_index.save)
+    return template_index
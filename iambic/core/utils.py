@@ -9,6 +9,7 @@ import sys
 import tempfile
 import typing
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from io import StringIO
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Coroutine, Optional, Union
@@ -17,12 +18,12 @@ from urllib.parse import unquote_plus
 import aiofiles
 import jwt
 from asgiref.sync import sync_to_async
-from jinja2 import BaseLoader
+from jinja2 import BaseLoader, Template
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from ruamel.yaml import YAML, scalarstring
 
 from iambic.core import noq_json as json
-from iambic.core.aio_utils import gather_limit
+from iambic.core.context import ctx
 from iambic.core.exceptions import RateLimitException
 from iambic.core.iambic_enum import IambicManaged
 from iambic.core.logger import log
@@ -101,18 +102,107 @@ async def plugin_apply_wrapper(
     return proposed_changes
 
 
+class ResourceStagingStore:
+    """
+    Keeps the resources collected during an execution in memory.
+
+    Resources are keyed by the file path they are staged under.
+    The path is derived from the ExecutionMessage
+    so it is unique per execution, provider, account and resource.
+
+    The files are only written when the execution is distributed to remote workers,
+    otherwise collectors and generators exchange the resources in process.
+    """
+
+    def __init__(self):
+        self._resources: dict[str, dict] = {}
+
+    @staticmethod
+    def _get_key(file_path: Union[str, pathlib.Path]) -> str:
+        return os.path.abspath(file_path)
+
+    @property
+    def persist_to_disk(self) -> bool:
+        return ctx.use_remote
+
+    @staticmethod
+    async def _read_file(file_path: str) -> Optional[dict]:
+        if not os.path.exists(file_path) or os.stat(file_path).st_size == 0:
+            return None
+
+        async with aiofiles.open(file_path, mode="r") as f:
+            return json.loads(await f.read())
+
+    async def upsert(
+        self,
+        file_path: Union[str, pathlib.Path],
+        content_as_dict: dict,
+        replace_file: bool = False,
+    ):
+        key = self._get_key(file_path)
+        # Store the resource as it would be represented on disk
+        content_as_dict = json.loads(json.dumps(content_as_dict))
+        if not replace_file:
+            existing_content = self._resources.get(key)
+            if existing_content is None:
+                existing_content = await self._read_file(key)
+            if existing_content:
+                content_as_dict = {**existing_content, **content_as_dict}
+
+        self._resources[key] = content_as_dict
+        if self.persist_to_disk:
+            async with aiofiles.open(key, mode="w") as f:
+                await f.write(json.dumps(content_as_dict, indent=2))
+
+    async def load(self, file_path: Union[str, pathlib.Path]) -> dict:
+        """Get a staged resource, falling back to the file written by a remote worker"""
+        key = self._get_key(file_path)
+        if (content := self._resources.get(key)) is None:
+            content = await self._read_file(key)
+            if content is None:
+                raise FileNotFoundError(f"No resource staged for {file_path}")
+        return dict(content)
+
+    def _write_files(self, keys: list[str]):
+        for key in keys:
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            with open(key, "w") as f:
+                f.write(json.dumps(self._resources[key], indent=2))
+
+    async def persist(self, directory: Union[str, pathlib.Path]):
+        """Write every resource staged under the directory to its file path"""
+        directory = os.path.join(self._get_key(directory), "")
+        if keys := [key for key in self._resources if key.startswith(directory)]:
+            await aio_wrapper(self._write_files, keys)
+
+    def clear(self, execution_id: str = None):
+        if not execution_id:
+            self._resources.clear()
+            return
+
+        execution_dir = os.path.join(
+            os.path.abspath(get_writable_directory()), ".iambic", execution_id, ""
+        )
+        for key in [key for key in self._resources if key.startswith(execution_dir)]:
+            self._resources.pop(key, None)
+
+
+resource_staging_store = ResourceStagingStore()
+
+
 async def resource_file_upsert(
     file_path: Union[str, pathlib.Path],
     content_as_dict: dict,
     replace_file: bool = False,
 ):
     """
-    Update or create a resource file with the given content.
+    Update or create a staged resource with the given content.
 
-    This function updates or creates a resource file at the given file path with the given content, which is
-    represented as a dictionary. If the file already exists and `replace_file` is False, the function merges
-    the existing content with the new content. If `replace_file` is True, the function overwrites the file
+    This function updates or creates the resource staged at the given file path with the given content, which is
+    represented as a dictionary. If the resource already exists and `replace_file` is False, the function merges
+    the existing content with the new content. If `replace_file` is True, the function overwrites the resource
     with the new content.
+    The resource is kept in the `resource_staging_store` and only written to the file path for remote execution.
 
     Args:
     - file_path (Union[str, pathlib.Path]): The file path for the resource file.
@@ -123,17 +213,14 @@ async def resource_file_upsert(
     Returns:
     - None
     """
-    if (
-        not replace_file
-        and os.path.exists(file_path)
-        and os.stat(file_path).st_size != 0
-    ):
-        async with aiofiles.open(file_path, mode="r") as f:
-            content_dict = json.loads(await f.read())
-            content_as_dict = {**content_dict, **content_as_dict}
+    await resource_staging_store.upsert(file_path, content_as_dict, replace_file)
 
-    async with aiofiles.open(file_path, mode="w") as f:
-        await f.write(json.dumps(content_as_dict, indent=2))
+
+async def load_resource_file(file_path: Union[str, pathlib.Path]) -> dict:
+    """
+    Get the content of a resource written with `resource_file_upsert`.
+    """
+    return await resource_staging_store.load(file_path)
 
 
 async def file_regex_search(
@@ -150,6 +237,8 @@ async def file_regex_search(
 
 
 async def gather_templates(repo_dir: str, template_type: str = None) -> list[str]:
+    from iambic.core.template_index import get_template_index
+
     repo_dir_path = Path(repo_dir)
     if not repo_dir_path.is_dir():
         raise ValueError(f"{repo_dir_path} is not a directory")
@@ -158,25 +247,9 @@ async def gather_templates(repo_dir: str, template_type: str = None) -> list[str
         # Strip the prefix, so it plays nice with NOQ_TEMPLATE_REGEX
         template_type = template_type.replace("NOQ::", "")
 
-    regex_pattern = (
-        rf"{NOQ_TEMPLATE_REGEX}.*{template_type}"
-        if template_type
-        else NOQ_TEMPLATE_REGEX
-    )
-    # since multiple glob pattern can potential intersect, we use a set data structure
-    # to suppress any duplicate for defensive measure
-    # Support both yaml and yml extensions for templates
-    file_path_set = set()
-    # >>> glob.glob('**/*.txt', recursive=True)
-    # ['2.txt', 'sub/3.txt']
-    file_path_set.update(repo_dir_path.glob("**/*.yaml"))
-    file_path_set.update(repo_dir_path.glob("**/*.yml"))
-
-    file_paths = await gather_limit(
-        *[file_regex_search(fp, regex_pattern) for fp in file_path_set],
-        limit=int(os.environ.get("IAMBIC_GATHER_TEMPLATES_LIMIT", 10)),
-    )
-    return [fp for fp in file_paths if fp]
+    # The index only reads files that were added or changed since the last call
+    template_index = await get_template_index(repo_dir_path)
+    return template_index.get_template_paths(template_type)
 
 
 async def aio_wrapper(fnc, *args, **kwargs):
@@ -452,6 +525,85 @@ yaml.representer.ignore_aliases = lambda *data: True
 yaml.width = 4096
 
 
+class AccessRuleMatcher:
+    """
+    The compiled included and excluded children rules of an access model.
+
+    Rules are lowercased, weighted by their length and compiled once.
+    The result for a given set of provider identifiers is cached so evaluating
+    the same rules against every provider child is a lookup after the first call.
+    """
+
+    def __init__(self, included_children: list[str], excluded_children: list[str]):
+        self.included_rules = self._compile_rules(included_children)
+        self.excluded_rules = self._compile_rules(excluded_children)
+        self._results: dict[frozenset[str], bool] = {}
+
+    @staticmethod
+    def _compile_rules(rules: list[str]) -> list[tuple[int, str, Optional[re.Pattern]]]:
+        compiled_rules = []
+        for rule in sorted([rule.lower() for rule in rules], key=len, reverse=True):
+            pattern = None
+            if "*" in rule and rule != "*":
+                # Mirrors is_regex_match
+                try:
+                    pattern = re.compile(rule.replace(".*", "*").replace("*", ".*"))
+                except re.error:
+                    pass
+            compiled_rules.append((len(rule), rule, pattern))
+        return compiled_rules
+
+    @staticmethod
+    def _rule_matches(
+        rule: str, pattern: Optional[re.Pattern], identifiers: frozenset[str]
+    ) -> bool:
+        if rule == "*":
+            return True
+        elif pattern:
+            return any(pattern.match(identifier) for identifier in identifiers)
+        return rule in identifiers
+
+    def matches(self, identifiers: set[str]) -> bool:
+        """Returns True if the identifiers are included and not excluded by the rules"""
+        identifiers = frozenset(identifier.lower() for identifier in identifiers)
+        if (result := self._results.get(identifiers)) is not None:
+            return result
+
+        exclude_weight = 0
+        for weight, rule, pattern in self.excluded_rules:
+            if self._rule_matches(rule, pattern, identifiers):
+                exclude_weight = weight
+                break
+
+        result = False
+        for weight, rule, pattern in self.included_rules:
+            if self._rule_matches(rule, pattern, identifiers):
+                result = bool(weight > exclude_weight)
+                break
+
+        self._results[identifiers] = result
+        return result
+
+
+@lru_cache(maxsize=4096)
+def _get_access_rule_matcher(
+    included_children: tuple[str], excluded_children: tuple[str]
+) -> AccessRuleMatcher:
+    return AccessRuleMatcher(list(included_children), list(excluded_children))
+
+
+def get_access_rule_matcher(resource) -> AccessRuleMatcher:
+    """
+    Get the compiled rules of an access model.
+
+    Matchers are cached by the rules themselves,
+    so a model that is mutated will resolve to a new matcher on the next call.
+    """
+    return _get_access_rule_matcher(
+        tuple(resource.included_children), tuple(resource.excluded_children)
+    )
+
+
 def evaluate_on_provider(
     resource,
     provider_details,
@@ -474,59 +626,71 @@ def evaluate_on_provider(
     Returns:
     - A Boolean indicating whether the resource should be evaluated on the provider.
     """
+    return bool(
+        evaluate_on_providers(resource, [provider_details], exclude_import_only)
+    )
+
+
+def evaluate_on_providers(
+    resource,
+    providers: list,
+    exclude_import_only: bool = True,
+) -> list:
+    """
+    Get the providers the resource is on or should be on.
+
+    Equivalent to calling `evaluate_on_provider` for each provider
+    but the access rules of the resource are only resolved once.
+
+    Args:
+    - resource: The resource to be evaluated.
+    - providers: The provider details to evaluate the resource against.
+    - exclude_import_only (bool, optional): A flag indicating whether to exclude resources that are marked as
+        import-only. Default is True.
+
+    Returns:
+    - The providers the resource should be evaluated on, in the order they were provided.
+    """
     from iambic.core.models import AccessModelMixin
 
     if getattr(resource, "organization_account_needed", None):
-        return getattr(provider_details, "organization_account", False)
+        return [
+            provider_details
+            for provider_details in providers
+            if getattr(provider_details, "organization_account", False)
+        ]
 
     no_op_values = [IambicManaged.DISABLED]
     if exclude_import_only:
         no_op_values.append(IambicManaged.IMPORT_ONLY)
 
-    if (
-        provider_details.iambic_managed in no_op_values
-        or getattr(resource, "iambic_managed", None) in no_op_values
-    ):
-        return False
+    if getattr(resource, "iambic_managed", None) in no_op_values:
+        return []
 
+    providers = [
+        provider_details
+        for provider_details in providers
+        if provider_details.iambic_managed not in no_op_values
+    ]
     if not isinstance(resource, AccessModelMixin):
-        return True
-
-    if provider_details.parent_id:
-        if provider_details.parent_id in resource.excluded_parents:
-            return False
-        elif "*" not in resource.included_parents and not any(
-            re.match(parent_id, provider_details.parent_id)
-            for parent_id in resource.included_parents
-        ):
-            return False
-
-    if not resource.included_children:
-        return True
-
-    provider_ids = sorted(provider_details.all_identifiers, key=len, reverse=True)
-    included_children = sorted(
-        [rule.lower() for rule in resource.included_children], key=len, reverse=True
-    )
-    excluded_children = sorted(
-        [rule.lower() for rule in resource.excluded_children], key=len, reverse=True
-    )
-    exclude_weight = 0
+        return providers
 
-    for exclude_rule in excluded_children:
-        if exclude_rule == "*" or any(
-            is_regex_match(exclude_rule, provider_id) for provider_id in provider_ids
-        ):
-            exclude_weight = len(exclude_rule)
-            break
+    matcher = get_access_rule_matcher(resource) if resource.included_children else None
+    response = []
+    for provider_details in providers:
+        if provider_details.parent_id:
+            if provider_details.parent_id in resource.excluded_parents:
+                continue
+            elif "*" not in resource.included_parents and not any(
+                re.match(parent_id, provider_details.parent_id)
+                for parent_id in resource.included_parents
+            ):
+                continue
 
-    for include_rule in included_children:
-        if include_rule == "*" or any(
-            is_regex_match(include_rule, provider_id) for provider_id in provider_ids
-        ):
-            return bool(len(include_rule) > exclude_weight)
+        if not matcher or matcher.matches(provider_details.all_identifiers):
+            response.append(provider_details)
 
-    return False
+    return response
 
 
 def apply_to_provider(resource, provider_details) -> bool:
@@ -578,29 +742,8 @@ def get_provider_value(matching_values: list, identifiers: set[str]):
 
     for included_account in sorted(included_account_lists, key=len, reverse=True):
         cur_val = included_account_map[included_account]
-        included_children = sorted(
-            [rule.lower() for rule in cur_val.included_children], key=len, reverse=True
-        )
-        excluded_children = sorted(
-            [rule.lower() for rule in cur_val.excluded_children], key=len, reverse=True
-        )
-        exclude_weight = 0
-
-        for exclude_rule in excluded_children:
-            if exclude_rule == "*" or any(
-                is_regex_match(exclude_rule, provider_id) for provider_id in identifiers
-            ):
-                exclude_weight = len(exclude_rule)
-                break
-
-        for include_rule in included_children:
-            if include_rule == "*" or any(
-                is_regex_match(include_rule, provider_id) for provider_id in identifiers
-            ):
-                if len(include_rule) > exclude_weight:
-                    return cur_val
-                else:
-                    break
+        if get_access_rule_matcher(cur_val).matches(identifiers):
+            return cur_val
 
 
 class GlobalRetryController:
@@ -905,25 +1048,46 @@ def decode_with_reference_time(encoded_jwt, public_key, algorithms, reference_ti
     return payload
 
 
-def get_rendered_template_str_value(
-    template_value: str, provider_child: typing.Type[ProviderChild]
-) -> str:
+TEMPLATE_RENDER_ENVIRONMENT = ImmutableSandboxedEnvironment(loader=BaseLoader())
+JINJA_SYNTAX_MARKERS = ("{{", "{%", "{#")
+
+
+@lru_cache(maxsize=1024)
+def get_compiled_template(template_value: str) -> Template:
+    return TEMPLATE_RENDER_ENVIRONMENT.from_string(template_value)
+
+
+@lru_cache(maxsize=1024)
+def _get_sanitized_template_variables(variables: tuple[tuple[str, str]]) -> dict:
+    valid_characters_re = r"[\w_+=,.@-]"
+    return {k: sanitize_string(v, valid_characters_re) for k, v in variables}
+
+
+def get_template_variables(provider_child: typing.Type[ProviderChild]) -> dict:
     """
-    Render a template string with the variables from the provider child.
+    The sanitized variables of the provider child used to render a template.
+
+    Only computed once per distinct set of variables.
     """
-    valid_characters_re = r"[\w_+=,.@-]"
     variables = {var.key: var.value for var in getattr(provider_child, "variables", [])}
     for extra_attr in {"account_id", "account_name", "owner"}:
         if attr_val := getattr(provider_child, extra_attr, None):
             variables[extra_attr] = attr_val
 
+    return _get_sanitized_template_variables(tuple(variables.items()))
+
+
+def get_rendered_template_str_value(
+    template_value: str, provider_child: typing.Type[ProviderChild]
+) -> str:
+    """
+    Render a template string with the variables from the provider child.
+    """
+    if not any(marker in template_value for marker in JINJA_SYNTAX_MARKERS):
+        return template_value
+
+    variables = get_template_variables(provider_child)
     if not variables:
         return template_value
 
-    variables = {
-        k: sanitize_string(v, valid_characters_re) for k, v in variables.items()
-    }
-    rtemplate = ImmutableSandboxedEnvironment(loader=BaseLoader()).from_string(
-        template_value
-    )
-    return rtemplate.render(var=variables)
+    return get_compiled_template(template_value).render(var=variables)
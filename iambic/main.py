@@ -17,6 +17,7 @@ from iambic.config.utils import (
     resolve_config_template_path,
 )
 from iambic.config.wizard import ConfigurationWizard
+from iambic.core.aio_utils import run_with_loop_cleanup
 from iambic.core.context import ctx
 from iambic.core.git import clone_git_repos
 from iambic.core.iambic_enum import Command, IambicManaged
@@ -65,6 +66,28 @@ def output_proposed_changes(
             raise SystemExit(1)
 
 
+async def load_repo_config(repo_dir: str, **kwargs) -> tuple[pathlib.Path, Config]:
+    config_path = await resolve_config_template_path(repo_dir)
+    config = await load_config(config_path, **kwargs)
+    return config_path, config
+
+
+async def load_repo_config_and_templates(
+    repo_dir: str, templates: Optional[list[str]], **kwargs
+) -> tuple[Config, list[str]]:
+    """Load the config of the repo and gather its templates if none were provided.
+
+    The templates are discovered while the config and its plugins are being loaded.
+    """
+    if templates:
+        _, config = await load_repo_config(repo_dir, **kwargs)
+    else:
+        (_, config), templates = await asyncio.gather(
+            load_repo_config(repo_dir, **kwargs), gather_templates(repo_dir)
+        )
+    return config, templates
+
+
 @click.group()
 @click.version_option(package_name="iambic-core")
 def cli():
@@ -96,14 +119,13 @@ def expire(templates: list[str], repo_dir: str):
 
 
 def run_expire(templates: list[str], repo_dir: str = str(pathlib.Path.cwd())):
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    # load_config is required to populate known templates
-    config = asyncio.run(load_config(config_path))
+    run_with_loop_cleanup(_run_expire(templates, repo_dir))
 
-    if not templates:
-        templates = asyncio.run(gather_templates(repo_dir))
 
-    asyncio.run(flag_expired_resources(templates, config.template_map))
+async def _run_expire(templates: list[str], repo_dir: str):
+    # load_config is required to populate known templates
+    config, templates = await load_repo_config_and_templates(repo_dir, templates)
+    await flag_expired_resources(templates, config.template_map)
 
 
 @cli.command(short_help="Preview provider-side resource changes")
@@ -132,9 +154,12 @@ def detect(repo_dir: str, message_details_file: Optional[str] = None):
 
 
 def run_detect(repo_dir: str, message_details_file: Optional[str] = None):
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    config = asyncio.run(load_config(config_path))
-    asyncio.run(config.run_detect_changes(repo_dir, message_details_file))
+    run_with_loop_cleanup(_run_detect(repo_dir, message_details_file))
+
+
+async def _run_detect(repo_dir: str, message_details_file: Optional[str]):
+    _, config = await load_repo_config(repo_dir)
+    await config.run_detect_changes(repo_dir, message_details_file)
 
 
 @cli.command(short_help="Clone configured git repositories")
@@ -155,9 +180,12 @@ def clone_repos(repo_dir: str):
 
 
 def run_clone_repos(repo_dir: str = str(pathlib.Path.cwd())):
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    config = asyncio.run(load_config(config_path))
-    asyncio.run(clone_git_repos(config, repo_dir))
+    run_with_loop_cleanup(_run_clone_repos(repo_dir))
+
+
+async def _run_clone_repos(repo_dir: str):
+    _, config = await load_repo_config(repo_dir)
+    await clone_git_repos(config, repo_dir)
 
 
 @cli.command(short_help="Apply local changes to providers")
@@ -253,9 +281,9 @@ def apply(
             log.error("to_sha and from_sha are not supported with templates")
             return
         ctx.eval_only = not force
-        config_path = asyncio.run(resolve_config_template_path(repo_dir))
-        config = asyncio.run(load_config(config_path))
-        run_apply(config, templates, repo_dir=repo_dir, enforced_only=enforced_only)
+        run_with_loop_cleanup(
+            _run_apply(None, templates, repo_dir=repo_dir, enforced_only=enforced_only)
+        )
 
 
 def run_apply(
@@ -264,35 +292,54 @@ def run_apply(
     repo_dir: str = str(pathlib.Path.cwd()),
     enforced_only: bool = False,
     output_path: str = "proposed_changes.yaml",
+) -> list[TemplateChangeDetails]:
+    return run_with_loop_cleanup(
+        _run_apply(
+            config,
+            templates,
+            repo_dir=repo_dir,
+            enforced_only=enforced_only,
+            output_path=output_path,
+        )
+    )
+
+
+async def _run_apply(
+    config: Optional[Config],
+    templates: Optional[list[str]],
+    repo_dir: str,
+    enforced_only: bool = False,
+    output_path: str = "proposed_changes.yaml",
 ) -> list[TemplateChangeDetails]:
     template_changes = []
     exe_message = ExecutionMessage(
         execution_id=str(uuid.uuid4()), command=Command.APPLY
     )
-    if not templates:
-        if not enforced_only:
-            log.error("Please pass in specific templates to apply.")
-            return template_changes
-        templates = asyncio.run(gather_templates(repo_dir))
+    if not templates and not enforced_only:
+        log.error("Please pass in specific templates to apply.")
+        return template_changes
+
+    if config is None:
+        config, templates = await load_repo_config_and_templates(repo_dir, templates)
+    elif not templates:
+        templates = await gather_templates(repo_dir)
     templates = load_templates(templates, config.template_map)  # type: ignore
     if enforced_only:
         templates = [t for t in templates if t.iambic_managed == IambicManaged.ENFORCED]
     if not templates:
         log.info("No templates found")
         return template_changes
-    asyncio.run(
-        flag_expired_resources(
-            [template.file_path for template in templates], config.template_map
-        )
+    await flag_expired_resources(
+        [template.file_path for template in templates], config.template_map
     )
-    template_changes = asyncio.run(config.run_apply(exe_message, templates))
+    template_changes = await config.run_apply(exe_message, templates)
     output_proposed_changes(template_changes, output_path=output_path)
 
     screen_render_resource_changes(template_changes)
 
     if ctx.eval_only and template_changes and click.confirm("Proceed?"):
         ctx.eval_only = False
-        template_changes = asyncio.run(config.run_apply(exe_message, templates))
+        template_changes = await config.run_apply(exe_message, templates)
     # This was here before, but I don't think it's needed. Leaving it here for now to see if anything breaks.
     # asyncio.run(config.run_detect_changes(repo_dir))
     return template_changes
@@ -306,22 +353,27 @@ def run_git_apply(
     output_path: str = None,
 ) -> list[TemplateChangeDetails]:
     ctx.eval_only = False
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-
-    template_changes = asyncio.run(
-        apply_git_changes(
-            config_path,
-            repo_dir,
-            allow_dirty=allow_dirty,
-            from_sha=from_sha,
-            to_sha=to_sha,
-        )
+    template_changes = run_with_loop_cleanup(
+        _run_git_apply(allow_dirty, from_sha, to_sha, repo_dir=repo_dir)
     )
     output_proposed_changes(template_changes, output_path, exit_on_error=False)
     screen_render_resource_changes(template_changes)
     return template_changes
 
 
+async def _run_git_apply(
+    allow_dirty: bool, from_sha: str, to_sha: str, repo_dir: str
+) -> list[TemplateChangeDetails]:
+    config_path = await resolve_config_template_path(repo_dir)
+    return await apply_git_changes(
+        config_path,
+        repo_dir,
+        allow_dirty=allow_dirty,
+        from_sha=from_sha,
+        to_sha=to_sha,
+    )
+
+
 @cli.command(short_help="Preview local changes")
 @click.argument(
     "templates",
@@ -375,17 +427,10 @@ def run_git_plan(
     skip_flag_expired_resources_phase: bool = False,
 ) -> list[TemplateChangeDetails]:
     ctx.eval_only = True
-
-    if config_path is None:
-        config_path = asyncio.run(resolve_config_template_path(repo_dir))
-
-    if config is None:
-        config = asyncio.run(load_config(config_path))
-    check_and_update_resource_limit(config)
-    template_changes = asyncio.run(
-        plan_git_changes(
-            config_path,
+    template_changes = run_with_loop_cleanup(
+        _run_git_plan(
             repo_dir,
+            config_path=config_path,
             config=config,
             skip_flag_expired_resources_phase=skip_flag_expired_resources_phase,
         )
@@ -395,18 +440,38 @@ def run_git_plan(
     return template_changes
 
 
+async def _run_git_plan(
+    repo_dir: str,
+    config_path: pathlib.Path = None,
+    config: Config = None,
+    skip_flag_expired_resources_phase: bool = False,
+) -> list[TemplateChangeDetails]:
+    if config_path is None:
+        config_path = await resolve_config_template_path(repo_dir)
+
+    if config is None:
+        config = await load_config(config_path)
+    check_and_update_resource_limit(config)
+    return await plan_git_changes(
+        config_path,
+        repo_dir,
+        config=config,
+        skip_flag_expired_resources_phase=skip_flag_expired_resources_phase,
+    )
+
+
 def run_plan(templates: list[str], repo_dir: str = str(pathlib.Path.cwd())):
-    if not templates:
-        templates = asyncio.run(gather_templates(repo_dir))
+    run_with_loop_cleanup(_run_plan(templates, repo_dir))
+
 
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    config = asyncio.run(load_config(config_path))
+async def _run_plan(templates: list[str], repo_dir: str):
+    config, templates = await load_repo_config_and_templates(repo_dir, templates)
     exe_message = ExecutionMessage(
         execution_id=str(uuid.uuid4()), command=Command.APPLY
     )
 
     try:
-        asyncio.run(flag_expired_resources(templates, config.template_map))
+        await flag_expired_resources(templates, config.template_map)
     except IsADirectoryError:
         log.error(
             f"Invalid template path: {templates}. Templates must be files."
@@ -415,8 +480,8 @@ def run_plan(templates: list[str], repo_dir: str = str(pathlib.Path.cwd())):
         sys.exit(1)
 
     ctx.eval_only = True
-    template_changes = asyncio.run(
-        config.run_apply(exe_message, load_templates(templates, config.template_map))
+    template_changes = await config.run_apply(
+        exe_message, load_templates(templates, config.template_map)
     )
     output_proposed_changes(template_changes)
     screen_render_resource_changes(template_changes)
@@ -436,12 +501,15 @@ def config_discovery(repo_dir: str):
     """
     Pull upstream changes to AWS organization configurations, such as new accounts.
     """
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    config = asyncio.run(load_config(config_path))
+    run_with_loop_cleanup(_config_discovery(repo_dir))
+
+
+async def _config_discovery(repo_dir: str):
+    _, config = await load_repo_config(repo_dir)
     exe_message = ExecutionMessage(
         execution_id=str(uuid.uuid4()), command=Command.CONFIG_DISCOVERY
     )
-    asyncio.run(config.run_discover_upstream_config_changes(exe_message, repo_dir))
+    await config.run_discover_upstream_config_changes(exe_message, repo_dir)
 
 
 @cli.command(name="import", short_help="Pull provider-side resource changes")
@@ -454,18 +522,43 @@ def config_discovery(repo_dir: str):
     default=os.getenv("IAMBIC_REPO_DIR"),
     help="The repo directory containing the templates. Example: ~/iambic-templates",
 )
-def import_(repo_dir: str):
+@click.option(
+    "--resume",
+    "resume_execution_id",
+    required=False,
+    type=str,
+    help="The execution id of an interrupted import to resume. "
+    "Collections completed by that import are reused instead of being run again.",
+)
+@click.option(
+    "--checkpoint",
+    is_flag=True,
+    help="Checkpoint completed collections so the import can be resumed with --resume.",
+)
+def import_(repo_dir: str, resume_execution_id: str = None, checkpoint: bool = False):
     """
     Pull upstream changes from provider-side IAM resources.
     Add, update, and remove templates as needed.
     """
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    config: Config = asyncio.run(load_config(config_path))
+    run_with_loop_cleanup(_import(repo_dir, resume_execution_id, checkpoint))
+
+
+async def _import(
+    repo_dir: str, resume_execution_id: Optional[str], checkpoint: bool = False
+):
+    _, config = await load_repo_config(repo_dir)
     check_and_update_resource_limit(config)
     exe_message = ExecutionMessage(
-        execution_id=str(uuid.uuid4()), command=Command.IMPORT
+        execution_id=resume_execution_id or str(uuid.uuid4()),
+        command=Command.IMPORT,
+        # A resumed import keeps checkpointing in case it is interrupted again
+        checkpoint=checkpoint or bool(resume_execution_id),
     )
-    asyncio.run(config.run_import(exe_message, repo_dir))
+    if resume_execution_id:
+        log.info("Resuming import.", execution_id=resume_execution_id)
+    else:
+        log.info("Starting import.", execution_id=exe_message.execution_id)
+    await config.run_import(exe_message, repo_dir)
 
 
 @cli.command(short_help="Lint and format local resource templates")
@@ -491,11 +584,9 @@ def lint(templates: list[str], repo_dir: str):
     """
     ctx.command = Command.LINT
     ctx.eval_only = True
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    config = asyncio.run(load_config(config_path, configure_plugins=True))
-
-    if not templates:
-        templates = asyncio.run(gather_templates(repo_dir))
+    config, templates = run_with_loop_cleanup(
+        load_repo_config_and_templates(repo_dir, templates, configure_plugins=True)
+    )
 
     templates = load_templates(templates, config.template_map, False)
     log.info("Formatting templates.")
@@ -517,8 +608,12 @@ def init_plugins_cmd(repo_dir: str):
     """
     Download and install dependencies for configured providers.
     """
-    config_path = asyncio.run(resolve_config_template_path(repo_dir))
-    asyncio.run(init_plugins(config_path))
+    run_with_loop_cleanup(_init_plugins(repo_dir))
+
+
+async def _init_plugins(repo_dir: str):
+    config_path = await resolve_config_template_path(repo_dir)
+    await init_plugins(config_path)
 
 
 @cli.command(short_help="Run the setup wizard")
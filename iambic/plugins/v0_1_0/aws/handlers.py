@@ -4,14 +4,19 @@ import asyncio
 import base64
 import json
 import os
+import re
 import uuid
+from collections import defaultdict
+from functools import partial
 from itertools import chain
 from typing import TYPE_CHECKING, Coroutine, Optional, Union
 
 import boto3
 
 from iambic.config.dynamic_config import ExtendsConfig, ExtendsConfigKey
+from iambic.core.aio_utils import gather_dependency_graph
 from iambic.core.context import ctx
+from iambic.core.detect import coalesce_detect_messages
 from iambic.core.iambic_enum import Command, IambicManaged
 from iambic.core.logger import log
 from iambic.core.models import (
@@ -25,7 +30,7 @@ from iambic.core.template_generation import (
     get_existing_template_map,
     templatize_resource,
 )
-from iambic.core.utils import async_batch_processor, gather_templates, yaml
+from iambic.core.utils import aio_wrapper, evaluate_on_providers, gather_templates, yaml
 from iambic.plugins.v0_1_0.aws.event_bridge.models import (
     GroupMessageDetails,
     ManagedPolicyMessageDetails,
@@ -44,6 +49,7 @@ from iambic.plugins.v0_1_0.aws.iam.policy.template_generation import (
     collect_aws_managed_policies,
     generate_aws_managed_policy_templates,
 )
+from iambic.plugins.v0_1_0.aws.iam.role.models import AWS_IAM_ROLE_TEMPLATE_TYPE
 from iambic.plugins.v0_1_0.aws.iam.role.template_generation import (
     collect_aws_roles,
     generate_aws_role_templates,
@@ -53,6 +59,11 @@ from iambic.plugins.v0_1_0.aws.iam.user.template_generation import (
     collect_aws_users,
     generate_aws_user_templates,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import (
+    clear_iam_state_caches,
+    set_iam_state_caches,
+    wait_for_created_iam_resources,
+)
 from iambic.plugins.v0_1_0.aws.identity_center.permission_set.models import (
     AWS_IDENTITY_CENTER_PERMISSION_SET_TEMPLATE_TYPE,
 )
@@ -73,11 +84,24 @@ from iambic.plugins.v0_1_0.aws.organizations.scp.template_generation import (
 from iambic.plugins.v0_1_0.aws.organizations.scp.utils import (
     service_control_policy_is_enabled,
 )
-from iambic.plugins.v0_1_0.aws.utils import get_aws_account_map
+from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
+    consume_sqs_queue,
+    get_async_transport_services,
+    get_aws_account_map,
+)
 
 if TYPE_CHECKING:
     from iambic.plugins.v0_1_0.aws.iambic_plugin import AWSConfig
 
+# The template types that can reference a managed policy or group applied in the same run
+AWS_TEMPLATE_TYPES_WITH_DEPENDENCIES = {
+    AWS_IAM_GROUP_TEMPLATE_TYPE,
+    AWS_IAM_ROLE_TEMPLATE_TYPE,
+    AWS_IAM_USER_TEMPLATE_TYPE,
+    AWS_IDENTITY_CENTER_PERMISSION_SET_TEMPLATE_TYPE,
+}
+
 
 async def load(config: AWSConfig) -> AWSConfig:
     config_account_idx_map = {
@@ -135,6 +159,10 @@ async def load(config: AWSConfig) -> AWSConfig:
                 if account.account_id != hub_account.account_id:
                     account.hub_session_info = hub_session_info
 
+    async_transport_services = get_async_transport_services(config)
+    for aws_model in [*config.organizations, *config.accounts]:
+        aws_model.async_transport_services = async_transport_services
+
     # Set up the dynamic account variables
     for idx, account in enumerate(config.accounts):
         config.accounts[idx].variables.extend(
@@ -167,12 +195,7 @@ async def apply_identity_center_templates(
     :param templates: The list of templates to apply.
     :param remote_worker: The remote worker to use for applying templates.
     """
-    await config.set_identity_center_details(exe_message.provider_id)
-    return await async_batch_processor(
-        [template.apply(config) for template in templates],
-        5,
-        0.5,
-    )
+    return await _apply_aws_templates(exe_message, config, templates, [])
 
 
 async def apply_iam_templates(
@@ -189,53 +212,151 @@ async def apply_iam_templates(
     :param templates: The list of templates to apply.
     :param remote_worker: The remote worker to use for applying templates.
     """
-    if config.spoke_role_is_read_only:
+    return await _apply_aws_templates(exe_message, config, [], templates)
+
+
+def _get_template_reference_patterns(
+    config: AWSConfig, template: BaseTemplate
+) -> Optional[tuple[Optional[re.Pattern], Optional[re.Pattern]]]:
+    """The patterns other templates reference the resource of the template by.
+
+    Returns (arn_pattern, name_pattern) for managed policies and groups, None for all other templates.
+    Names are matched as they are in the template as well as rendered for each account.
+    """
+    if template.template_type == AWS_MANAGED_POLICY_TEMPLATE_TYPE:
+        # The resource of the policy ARN, e.g. policy/path/policy_name
+        arn_resources = {
+            template.apply_resource_dict(aws_account)["Arn"].split(":", 5)[-1]
+            for aws_account in evaluate_on_providers(template, config.accounts)
+        }
+        names = {arn_resource.split("/")[-1] for arn_resource in arn_resources}
+        names.add(template.properties.policy_name)
+        if isinstance(template.properties.path, str):
+            arn_resources.add(
+                f"policy{template.properties.path}{template.properties.policy_name}"
+            )
+    elif template.template_type == AWS_IAM_GROUP_TEMPLATE_TYPE:
+        arn_resources = set()
+        names = {
+            template.properties.group_name,
+            *[
+                template.apply_resource_dict(aws_account)["GroupName"]
+                for aws_account in evaluate_on_providers(template, config.accounts)
+            ],
+        }
+    else:
+        return None
+
+    arn_pattern = None
+    if arn_resources:
+        arn_pattern = re.compile(
+            rf":(?:{'|'.join(map(re.escape, arn_resources))})(?![\w+=,.@-])"
+        )
+    name_pattern = re.compile("|".join(re.escape(json.dumps(name)) for name in names))
+    return arn_pattern, name_pattern
+
+
+def get_template_dependencies(
+    config: AWSConfig, templates: list[BaseTemplate]
+) -> dict[int, set[int]]:
+    """Derive the apply order of the templates from the resources they reference.
+
+    Returns {template index: {indexes of the templates that must be applied first}}.
+    - Roles, users, groups and permission sets depend on the managed policies they attach
+      or use as a permissions boundary.
+    - Users depend on the groups they are a member of.
+
+    Managed policies never depend on another template so the graph is always acyclic.
+    """
+    policy_patterns = []
+    group_patterns = []
+    for idx, template in enumerate(templates):
+        if patterns := _get_template_reference_patterns(config, template):
+            if template.template_type == AWS_MANAGED_POLICY_TEMPLATE_TYPE:
+                policy_patterns.append((idx, *patterns))
+            else:
+                group_patterns.append((idx, *patterns))
+
+    dependencies = defaultdict(set)
+    if not policy_patterns and not group_patterns:
+        return dependencies
+
+    for idx, template in enumerate(templates):
+        if template.template_type not in AWS_TEMPLATE_TYPES_WITH_DEPENDENCIES:
+            continue
+
+        template_str = template.json()
+        for policy_idx, arn_pattern, name_pattern in policy_patterns:
+            if (arn_pattern and arn_pattern.search(template_str)) or (
+                template.template_type
+                == AWS_IDENTITY_CENTER_PERMISSION_SET_TEMPLATE_TYPE
+                and name_pattern.search(template_str)
+            ):
+                dependencies[idx].add(policy_idx)
+
+        if template.template_type == AWS_IAM_USER_TEMPLATE_TYPE:
+            for group_idx, _, name_pattern in group_patterns:
+                if name_pattern.search(template_str):
+                    dependencies[idx].add(group_idx)
+
+    return dependencies
+
+
+async def _apply_aws_templates(
+    exe_message: ExecutionMessage,
+    config: AWSConfig,
+    identity_center_templates: list[BaseTemplate],
+    iam_templates: list[BaseTemplate],
+) -> list[TemplateChangeDetails]:
+    """Apply the templates as a single dependency graph.
+
+    A template is applied as soon as the templates it depends on are applied,
+    and the resources they created are visible.
+    """
+    if iam_templates and config.spoke_role_is_read_only:
         log.critical("Unable to apply resources when spoke_role_is_read_only is True")
-        return []
+        iam_templates = []
 
-    await generate_permission_set_map(config.accounts, templates)
+    if not identity_center_templates and not iam_templates:
+        return []
 
-    template_changes: list[TemplateChangeDetails] = []
-    excluded_from_batch = [AWS_MANAGED_POLICY_TEMPLATE_TYPE]
+    if identity_center_templates:
+        await config.set_identity_center_details(exe_message.provider_id)
+    if iam_templates:
+        await generate_permission_set_map(config.accounts, iam_templates)
+        await set_iam_state_caches(config.accounts, iam_templates)
 
-    if managed_policy_tasks := [
-        template.apply(config)
-        for template in templates
-        if template.template_type == AWS_MANAGED_POLICY_TEMPLATE_TYPE
-    ]:
-        # There are other template changes that could rely on the managed policy so create these first
-        template_changes.extend(await async_batch_processor(managed_policy_tasks, 40))
-        if len(template_changes) > len(managed_policy_tasks):
-            # Give a few seconds to allow the managed policies to be created in AWS
-            await asyncio.sleep(10)
-
-    if any(
-        template.template_type == AWS_IAM_GROUP_TEMPLATE_TYPE for template in templates
-    ) and any(
-        template.template_type == AWS_IAM_USER_TEMPLATE_TYPE for template in templates
-    ):
-        # There are user templates that may rely on the group so groups must be created first
-        excluded_from_batch.append(AWS_IAM_GROUP_TEMPLATE_TYPE)
-        group_tasks = [
-            template.apply(config)
-            for template in templates
-            if template.template_type == AWS_IAM_GROUP_TEMPLATE_TYPE
-        ]
-        template_changes.extend(await async_batch_processor(group_tasks, 30))
-        # Give a few seconds to allow the group to be created in AWS
-        await asyncio.sleep(10)
+    try:
+        templates = iam_templates + identity_center_templates
+        dependencies = get_template_dependencies(config, templates)
+        dependency_idxs = set(chain.from_iterable(dependencies.values()))
+        aws_account_map = {
+            str(aws_account): aws_account for aws_account in config.accounts
+        }
+
+        async def apply_template(idx: int) -> TemplateChangeDetails:
+            template = templates[idx]
+            template_change = await template.apply(config)
+            if idx in dependency_idxs:
+                # IAM is eventually consistent so wait for the created resource to be usable
+                await wait_for_created_iam_resources(
+                    aws_account_map, template.template_type, template_change
+                )
+            return template_change
 
-    template_changes.extend(
-        await async_batch_processor(
-            [
-                template.apply(config)
-                for template in templates
-                if template.template_type not in excluded_from_batch
-            ],
-            30,
+        log.debug(
+            "Applying templates in dependency order.",
+            templates=len(templates),
+            dependencies=len(dependency_idxs),
         )
-    )
-    return template_changes
+        return await gather_dependency_graph(
+            *[partial(apply_template, idx) for idx in range(len(templates))],
+            dependencies=dependencies,
+            limit=AWS_API_CONCURRENCY,
+        )
+    finally:
+        if iam_templates:
+            clear_iam_state_caches(config.accounts)
 
 
 async def apply(
@@ -257,7 +378,6 @@ async def apply(
 
     identity_center_templates = []
     iam_templates = []
-    tasks = []
 
     for template in templates:
         if template.template_type == AWS_IDENTITY_CENTER_PERMISSION_SET_TEMPLATE_TYPE:
@@ -265,19 +385,10 @@ async def apply(
         else:
             iam_templates.append(template)
 
-    if identity_center_templates:
-        tasks.append(
-            apply_identity_center_templates(
-                exe_message, config, identity_center_templates, remote_worker
-            )
-        )
-
-    if iam_templates:
-        tasks.append(
-            apply_iam_templates(exe_message, config, iam_templates, remote_worker)
-        )
-
-    template_changes = list(chain.from_iterable(await asyncio.gather(*tasks)))
+    # Both are applied as a single graph so permission sets can wait on the managed policies they reference
+    template_changes = await _apply_aws_templates(
+        exe_message, config, identity_center_templates, iam_templates
+    )
 
     return [
         template_change
@@ -286,6 +397,35 @@ async def apply(
     ]
 
 
+async def _collect_with_checkpoint(
+    async_collector_callable,
+    exe_message: ExecutionMessage,
+    config: AWSConfig,
+    existing_template_map: dict,
+):
+    """Run a full collection for the account of the exe_message once per execution.
+
+    When checkpointing is enabled, completed collections are checkpointed
+    so a resumed import reuses the collected resources.
+    """
+    if not exe_message.checkpoint:
+        await async_collector_callable(exe_message, config, existing_template_map, None)
+        return
+
+    checkpoint_unit = async_collector_callable.__name__
+    if exe_message.is_checkpointed(checkpoint_unit):
+        log.info(
+            "Skipping collection completed by a previous run of the execution.",
+            execution_id=exe_message.execution_id,
+            account_id=exe_message.provider_id,
+            collector=checkpoint_unit,
+        )
+        return
+
+    await async_collector_callable(exe_message, config, existing_template_map, None)
+    await exe_message.set_checkpoint(checkpoint_unit)
+
+
 async def import_service_resources(
     exe_message: ExecutionMessage,
     config: AWSConfig,
@@ -318,11 +458,21 @@ async def import_service_resources(
             elif not task_message.provider_id:
                 task_message.provider_id = account.account_id
 
-            tasks.append(
-                async_collector_callable(
-                    task_message, config, existing_template_map, messages
+            if messages:
+                tasks.append(
+                    async_collector_callable(
+                        task_message, config, existing_template_map, messages
+                    )
+                )
+            else:
+                tasks.append(
+                    _collect_with_checkpoint(
+                        async_collector_callable,
+                        task_message,
+                        config,
+                        existing_template_map,
+                    )
                 )
-            )
 
         if tasks:
             if base_runner and ctx.use_remote and remote_worker and not messages:
@@ -530,11 +680,150 @@ async def detect_changes(  # noqa: C901
     scp_messages = []
     commit_message = "Out of band changes detected.\nSummary:\n"
 
-    for queue_arn in config.sqs_cloudtrail_changes_queues:
+    detect_log_details = []
+
+    def process_message(message: dict, identity_arn: str):
+        nonlocal commit_message
+
+        try:
+            message_body = json.loads(message["Body"])
+            try:
+                if "Message" in message_body:
+                    decoded_message = json.loads(message_body["Message"])["detail"]
+                else:
+                    decoded_message = message_body["detail"]
+            except Exception as err:
+                log.debug("Unable to process message", error=str(err), message=message)
+                return
+            actor = (
+                decoded_message.get("userIdentity", {})
+                .get("sessionContext", {})
+                .get("sessionIssuer", {})
+                .get("arn", "")
+            )
+            session_name = (
+                decoded_message.get("userIdentity", {})
+                .get("principalId")
+                .split(":")[-1]
+            )
+            if actor != identity_arn:
+                account_id = decoded_message.get("recipientAccountId")
+                aws_account = aws_account_map[account_id]
+                request_params = decoded_message["requestParameters"]
+                response_elements = decoded_message["responseElements"]
+                event = decoded_message["eventName"]
+                resource_id = None
+                resource_type = None
+                if role_name := request_params.get("roleName"):
+                    resource_id = role_name
+                    resource_type = "Role"
+                    role_messages.append(
+                        RoleMessageDetails(
+                            account_id=account_id,
+                            role_name=templatize_resource(aws_account, role_name),
+                            delete=bool(event == "DeleteRole"),
+                        )
+                    )
+                elif user_name := request_params.get("userName"):
+                    resource_id = user_name
+                    resource_type = "User"
+                    user_messages.append(
+                        UserMessageDetails(
+                            account_id=account_id,
+                            user_name=templatize_resource(aws_account, user_name),
+                            delete=bool(event == "DeleteUser"),
+                        )
+                    )
+                elif group_name := request_params.get("groupName"):
+                    resource_id = group_name
+                    resource_type = "Group"
+                    group_messages.append(
+                        GroupMessageDetails(
+                            account_id=account_id,
+                            group_name=templatize_resource(aws_account, group_name),
+                            delete=bool(event == "DeleteGroup"),
+                        )
+                    )
+                elif policy_arn := request_params.get("policyArn"):
+                    split_policy = policy_arn.split("/")
+                    policy_name = split_policy[-1]
+                    policy_path = (
+                        "/"
+                        if len(split_policy) == 2
+                        else f"/{'/'.join(split_policy[1:-1])}/"
+                    )
+                    resource_id = policy_name
+                    resource_type = "ManagedPolicy"
+                    managed_policy_messages.append(
+                        ManagedPolicyMessageDetails(
+                            account_id=account_id,
+                            policy_name=templatize_resource(aws_account, policy_name),
+                            policy_path=templatize_resource(aws_account, policy_path),
+                            delete=bool(decoded_message["eventName"] == "DeletePolicy"),
+                        )
+                    )
+                elif permission_set_arn := request_params.get("permissionSetArn"):
+                    resource_id = permission_set_arn
+                    resource_type = "PermissionSet"
+                    permission_set_messages.append(
+                        PermissionSetMessageDetails(
+                            account_id=account_id,
+                            instance_arn=templatize_resource(
+                                aws_account, request_params.get("instanceArn")
+                            ),
+                            permission_set_arn=templatize_resource(
+                                aws_account, permission_set_arn
+                            ),
+                        )
+                    )
+                elif scp_policy_id := SCPMessageDetails.get_policy_id(
+                    request_params,
+                    response_elements,
+                ):
+                    resource_id = scp_policy_id
+                    resource_type = "SCPPolicy"
+                    scp_messages.append(
+                        SCPMessageDetails(
+                            account_id=account_id,
+                            policy_id=scp_policy_id,
+                            delete=bool(event == "DeletePolicy"),
+                            event=event,
+                        )
+                    )
+                elif SCPMessageDetails.tag_event(
+                    event,
+                    decoded_message["eventSource"],
+                ):
+                    resource_id = request_params.get("resourceId")
+                    resource_type = "SCPPolicy"
+                    scp_messages.append(
+                        SCPMessageDetails(
+                            account_id=account_id,
+                            policy_id=resource_id,
+                            delete=False,
+                            event=event,
+                        )
+                    )
+
+                if resource_id:
+                    detect_log_details.append(
+                        {
+                            "resource_id": resource_id,
+                            **message_body,
+                        }
+                    )
+                    commit_message = (
+                        f"{commit_message}User {session_name} performed action {event} "
+                        f"on {resource_type}({resource_id}) on account {account_id}.\n"
+                    )
+        except Exception as err:
+            log.debug("Unable to process message", error=str(err), message=message)
+
+    async def process_queue(queue_arn: str):
         queue_name = queue_arn.split(":")[-1]
         region_name = queue_arn.split(":")[3]
         session = await config.get_boto_session_from_arn(queue_arn, region_name)
-        identity = session.client("sts").get_caller_identity()
+        identity = await aio_wrapper(session.client("sts").get_caller_identity)
         identity_arn_with_session_name = (
             identity["Arn"].replace(":sts:", ":iam:").replace("assumed-role", "role")
         )
@@ -544,188 +833,53 @@ async def detect_changes(  # noqa: C901
 
         identity_arn = "/".join(identity_arn_with_session_name.split("/")[0:2])
         sqs = session.client("sqs", region_name=region_name)
-        queue_url_res = sqs.get_queue_url(QueueName=queue_name)
-        queue_url = queue_url_res.get("QueueUrl")
-        messages = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10).get(
-            "Messages", []
+        queue_url_res = await aio_wrapper(sqs.get_queue_url, QueueName=queue_name)
+        await consume_sqs_queue(
+            sqs,
+            queue_url_res.get("QueueUrl"),
+            partial(process_message, identity_arn=identity_arn),
         )
 
-        detect_log_details = []
-
-        while messages:
-            processed_messages = []
-            for message in messages:
-                try:
-                    processed_messages.append(
-                        {
-                            "Id": message["MessageId"],
-                            "ReceiptHandle": message["ReceiptHandle"],
-                        }
-                    )
-                    message_body = json.loads(message["Body"])
-                    try:
-                        if "Message" in message_body:
-                            decoded_message = json.loads(message_body["Message"])[
-                                "detail"
-                            ]
-                        else:
-                            decoded_message = message_body["detail"]
-                    except Exception as err:
-                        log.debug(
-                            "Unable to process message", error=str(err), message=message
-                        )
-                        processed_messages.append(
-                            {
-                                "Id": message["MessageId"],
-                                "ReceiptHandle": message["ReceiptHandle"],
-                            }
-                        )
-                        continue
-                    actor = (
-                        decoded_message.get("userIdentity", {})
-                        .get("sessionContext", {})
-                        .get("sessionIssuer", {})
-                        .get("arn", "")
-                    )
-                    session_name = (
-                        decoded_message.get("userIdentity", {})
-                        .get("principalId")
-                        .split(":")[-1]
-                    )
-                    if actor != identity_arn:
-                        account_id = decoded_message.get("recipientAccountId")
-                        aws_account = aws_account_map[account_id]
-                        request_params = decoded_message["requestParameters"]
-                        response_elements = decoded_message["responseElements"]
-                        event = decoded_message["eventName"]
-                        resource_id = None
-                        resource_type = None
-                        if role_name := request_params.get("roleName"):
-                            resource_id = role_name
-                            resource_type = "Role"
-                            role_messages.append(
-                                RoleMessageDetails(
-                                    account_id=account_id,
-                                    role_name=templatize_resource(
-                                        aws_account, role_name
-                                    ),
-                                    delete=bool(event == "DeleteRole"),
-                                )
-                            )
-                        elif user_name := request_params.get("userName"):
-                            resource_id = user_name
-                            resource_type = "User"
-                            user_messages.append(
-                                UserMessageDetails(
-                                    account_id=account_id,
-                                    user_name=templatize_resource(
-                                        aws_account, user_name
-                                    ),
-                                    delete=bool(event == "DeleteUser"),
-                                )
-                            )
-                        elif group_name := request_params.get("groupName"):
-                            resource_id = group_name
-                            resource_type = "Group"
-                            group_messages.append(
-                                GroupMessageDetails(
-                                    account_id=account_id,
-                                    group_name=templatize_resource(
-                                        aws_account, group_name
-                                    ),
-                                    delete=bool(event == "DeleteGroup"),
-                                )
-                            )
-                        elif policy_arn := request_params.get("policyArn"):
-                            split_policy = policy_arn.split("/")
-                            policy_name = split_policy[-1]
-                            policy_path = (
-                                "/"
-                                if len(split_policy) == 2
-                                else f"/{'/'.join(split_policy[1:-1])}/"
-                            )
-                            resource_id = policy_name
-                            resource_type = "ManagedPolicy"
-                            managed_policy_messages.append(
-                                ManagedPolicyMessageDetails(
-                                    account_id=account_id,
-                                    policy_name=templatize_resource(
-                                        aws_account, policy_name
-                                    ),
-                                    policy_path=templatize_resource(
-                                        aws_account, policy_path
-                                    ),
-                                    delete=bool(
-                                        decoded_message["eventName"] == "DeletePolicy"
-                                    ),
-                                )
-                            )
-                        elif permission_set_arn := request_params.get(
-                            "permissionSetArn"
-                        ):
-                            resource_id = permission_set_arn
-                            resource_type = "PermissionSet"
-                            permission_set_messages.append(
-                                PermissionSetMessageDetails(
-                                    account_id=account_id,
-                                    instance_arn=templatize_resource(
-                                        aws_account, request_params.get("instanceArn")
-                                    ),
-                                    permission_set_arn=templatize_resource(
-                                        aws_account, permission_set_arn
-                                    ),
-                                )
-                            )
-                        elif scp_policy_id := SCPMessageDetails.get_policy_id(
-                            request_params,
-                            response_elements,
-                        ):
-                            resource_id = scp_policy_id
-                            resource_type = "SCPPolicy"
-                            scp_messages.append(
-                                SCPMessageDetails(
-                                    account_id=account_id,
-                                    policy_id=scp_policy_id,
-                                    delete=bool(event == "DeletePolicy"),
-                                    event=event,
-                                )
-                            )
-                        elif SCPMessageDetails.tag_event(
-                            event,
-                            decoded_message["eventSource"],
-                        ):
-                            resource_id = request_params.get("resourceId")
-                            resource_type = "SCPPolicy"
-                            scp_messages.append(
-                                SCPMessageDetails(
-                                    account_id=account_id,
-                                    policy_id=resource_id,
-                                    delete=False,
-                                    event=event,
-                                )
-                            )
-
-                        if resource_id:
-                            detect_log_details.append(
-                                {
-                                    "resource_id": resource_id,
-                                    **message_body,
-                                }
-                            )
-                            commit_message = (
-                                f"{commit_message}User {session_name} performed action {event} "
-                                f"on {resource_type}({resource_id}) on account {account_id}.\n"
-                            )
-                except Exception as err:
-                    log.debug(
-                        "Unable to process message", error=str(err), message=message
-                    )
-                    continue
+    await asyncio.gather(
+        *[
+            process_queue(queue_arn)
+            for queue_arn in config.sqs_cloudtrail_changes_queues
+        ]
+    )
 
-            sqs.delete_message_batch(QueueUrl=queue_url, Entries=processed_messages)
-            messages = sqs.receive_message(
-                QueueUrl=queue_url, MaxNumberOfMessages=10
-            ).get("Messages", [])
+    # Only fetch each changed resource once regardless of how many events it had
+    raw_change_counts = {}
+    unique_change_counts = {}
+    for resource_type, detect_messages, resource_id_attrs in [
+        ("Role", role_messages, ["role_name"]),
+        ("User", user_messages, ["user_name"]),
+        ("Group", group_messages, ["group_name"]),
+        ("ManagedPolicy", managed_policy_messages, ["policy_path", "policy_name"]),
+        (
+            "PermissionSet",
+            permission_set_messages,
+            ["instance_arn", "permission_set_arn"],
+        ),
+        ("SCPPolicy", scp_messages, ["policy_id"]),
+    ]:
+        if detect_messages:
+            raw_change_counts[resource_type] = len(detect_messages)
+            detect_messages[:] = coalesce_detect_messages(
+                detect_messages, *resource_id_attrs
+            )
+            unique_change_counts[resource_type] = len(detect_messages)
+
+    if raw_change_counts:
+        raw_changes = sum(raw_change_counts.values())
+        unique_changes = sum(unique_change_counts.values())
+        log.info(
+            "Coalesced detected changes.",
+            raw_changes=raw_changes,
+            unique_changes=unique_changes,
+            raw_to_unique_ratio=round(raw_changes / unique_changes, 2),
+            raw_change_counts=raw_change_counts,
+            unique_change_counts=unique_change_counts,
+        )
 
     exe_message = ExecutionMessage(
         execution_id=str(uuid.uuid4()), command=Command.IMPORT, provider_type="aws"
@@ -128,7 +128,10 @@ class AwsIamGroupTemplate(AWSTemplate, AccessModel):
 
         deleted = self.get_attribute_val_for_account(aws_account, "deleted", False)
         current_group = await get_group(
-            group_name, client, include_policies=bool(not deleted)
+            group_name,
+            client,
+            include_policies=bool(not deleted),
+            aws_account=aws_account,
         )
         if current_group:
             account_change_details.current_value = {
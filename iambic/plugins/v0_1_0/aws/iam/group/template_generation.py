@@ -6,8 +6,6 @@ import os
 from collections import defaultdict
 from typing import TYPE_CHECKING, Optional
 
-import aiofiles
-
 from iambic.core import noq_json as json
 from iambic.core.detect import generate_template_output, group_detect_messages
 from iambic.core.logger import log
@@ -19,6 +17,7 @@ from iambic.core.template_generation import (
 from iambic.core.utils import (
     NoqSemaphore,
     get_rendered_template_str_value,
+    load_resource_file,
     normalize_dict_keys,
     resource_file_upsert,
 )
@@ -32,8 +31,8 @@ from iambic.plugins.v0_1_0.aws.iam.group.utils import (
     get_group,
     get_group_inline_policies,
     get_group_managed_policies,
-    list_groups,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import get_account_iam_snapshot
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.template_generation import (
     base_group_str_attribute,
@@ -41,6 +40,7 @@ from iambic.plugins.v0_1_0.aws.template_generation import (
     group_int_or_str_attribute,
 )
 from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
     calculate_import_preference,
     get_aws_account_map,
     process_import_rules,
@@ -110,8 +110,14 @@ async def generate_account_group_resource_files(
     messages = []
 
     response = dict(account_id=aws_account.account_id, groups=[])
-    iam_client = await aws_account.get_boto3_client("iam")
-    account_groups = await list_groups(iam_client)
+    iam_snapshot = await get_account_iam_snapshot(exe_message, aws_account)
+    account_groups = [
+        {
+            **iam_snapshot.get_group(group_name),
+            **iam_snapshot.get_group_resource_attributes(group_name),
+        }
+        for group_name in iam_snapshot.groups.keys()
+    ]
 
     log.debug(
         "Retrieved AWS IAM Groups.",
@@ -237,12 +243,11 @@ async def set_group_resource_managed_policies(
 async def _account_id_to_group_map(group_refs):
     account_id_to_group_map = {}
     for group_ref in group_refs:
-        async with aiofiles.open(group_ref["path"], mode="r") as f:
-            content_dict = json.loads(await f.read())
+        content_dict = await load_resource_file(group_ref["path"])
 
-            account_id_to_group_map[group_ref["account_id"]] = normalize_dict_keys(
-                content_dict
-            )
+        account_id_to_group_map[group_ref["account_id"]] = normalize_dict_keys(
+            content_dict
+        )
     return account_id_to_group_map
 
 
@@ -391,12 +396,6 @@ async def collect_aws_groups(
             return
 
     existing_template_map = iam_template_map.get(AWS_IAM_GROUP_TEMPLATE_TYPE, {})
-    set_group_resource_inline_policies_semaphore = NoqSemaphore(
-        set_group_resource_inline_policies, 20
-    )
-    set_group_resource_managed_policies_semaphore = NoqSemaphore(
-        set_group_resource_managed_policies, 30
-    )
 
     log.info(
         "Generating AWS group templates. Beginning to retrieve AWS IAM Groups.",
@@ -405,7 +404,7 @@ async def collect_aws_groups(
 
     if detect_messages:
         generate_group_resource_file_for_all_accounts_semaphore = NoqSemaphore(
-            generate_group_resource_file_for_all_accounts, 45
+            generate_group_resource_file_for_all_accounts, AWS_API_CONCURRENCY
         )
         grouped_detect_messages = group_detect_messages("group_name", detect_messages)
         tasks = [
@@ -454,7 +453,7 @@ async def collect_aws_groups(
         ]
     else:
         generate_account_group_resource_files_semaphore = NoqSemaphore(
-            generate_account_group_resource_files, 5
+            generate_account_group_resource_files, AWS_API_CONCURRENCY
         )
         account_groups = await generate_account_group_resource_files_semaphore.process(
             [
@@ -470,29 +469,7 @@ async def collect_aws_groups(
         )
         return
 
-    messages = []
-    # Upsert groups
-    for account_group in account_groups:
-        for group in account_group["groups"]:
-            messages.append(
-                {
-                    "group_name": group["name"],
-                    "group_resource_path": group["path"],
-                    "aws_account": aws_account_map[account_group["account_id"]],
-                }
-            )
-
     if not detect_messages:
-        log.info(
-            "Setting inline policies in group templates",
-            accounts=list(aws_account_map.keys()),
-        )
-        await set_group_resource_inline_policies_semaphore.process(messages)
-        log.info(
-            "Setting managed policies in group templates",
-            accounts=list(aws_account_map.keys()),
-        )
-        await set_group_resource_managed_policies_semaphore.process(messages)
         log.info(
             "Finished retrieving group details", accounts=list(aws_account_map.keys())
         )
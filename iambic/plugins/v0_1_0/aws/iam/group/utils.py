@@ -15,6 +15,7 @@ from iambic.core.utils import (
     get_rendered_template_str_value,
     plugin_apply_wrapper,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import get_cached_iam_resource
 from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, paginated_search
 
 if TYPE_CHECKING:
@@ -80,7 +81,20 @@ async def get_group_managed_policies(
     return [{"PolicyArn": policy["PolicyArn"]} for policy in policies]
 
 
-async def get_group(group_name: str, iam_client, include_policies: bool = True) -> dict:
+async def get_group(
+    group_name: str,
+    iam_client,
+    include_policies: bool = True,
+    aws_account: AWSAccount = None,
+) -> dict:
+    if (
+        current_group := get_cached_iam_resource(aws_account, "group", group_name)
+    ) is not None:
+        if current_group and not include_policies:
+            current_group.pop("ManagedPolicies", None)
+            current_group.pop("InlinePolicies", None)
+        return current_group
+
     try:
         current_group = (
             await boto_crud_call(iam_client.get_group, GroupName=group_name)
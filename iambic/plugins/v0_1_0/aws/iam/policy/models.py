@@ -373,7 +373,9 @@ class AwsIamManagedPolicyTemplate(AWSTemplate, AccessModel):
             account=str(aws_account),
         )
         policy_arn = account_policy.pop("Arn")
-        current_policy = await get_managed_policy(client, policy_arn)
+        current_policy = await get_managed_policy(
+            client, policy_arn, aws_account=aws_account
+        )
         if current_policy:
             account_change_details.current_value = {**current_policy}
 
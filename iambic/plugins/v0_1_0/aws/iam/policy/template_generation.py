@@ -6,8 +6,6 @@ import os
 from collections import defaultdict
 from typing import TYPE_CHECKING, Optional
 
-import aiofiles
-
 from iambic.core import noq_json as json
 from iambic.core.detect import generate_template_output, group_detect_messages
 from iambic.core.logger import log
@@ -19,6 +17,7 @@ from iambic.core.template_generation import (
 from iambic.core.utils import (
     NoqSemaphore,
     get_rendered_template_str_value,
+    load_resource_file,
     normalize_dict_keys,
     resource_file_upsert,
 )
@@ -30,8 +29,9 @@ from iambic.plugins.v0_1_0.aws.iam.policy.models import (
 )
 from iambic.plugins.v0_1_0.aws.iam.policy.utils import (
     get_managed_policy,
-    list_managed_policies,
+    list_managed_policy_tags,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import get_account_iam_snapshot
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.template_generation import (
     base_group_str_attribute,
@@ -39,6 +39,7 @@ from iambic.plugins.v0_1_0.aws.template_generation import (
     group_int_or_str_attribute,
 )
 from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
     calculate_import_preference,
     get_aws_account_map,
     process_import_rules,
@@ -109,7 +110,25 @@ async def generate_account_managed_policy_resource_files(
 
     response = dict(account_id=aws_account.account_id, managed_policies=[])
     iam_client = await aws_account.get_boto3_client("iam")
-    account_managed_policies = await list_managed_policies(iam_client)
+    iam_snapshot = await get_account_iam_snapshot(exe_message, aws_account)
+    account_managed_policies = [
+        iam_snapshot.get_managed_policy(policy_arn)
+        for policy_arn in iam_snapshot.managed_policies.keys()
+    ]
+    # Tags are the only attribute not included in the account authorization details
+    list_managed_policy_tags_semaphore = NoqSemaphore(
+        list_managed_policy_tags, AWS_API_CONCURRENCY
+    )
+    account_managed_policy_tags = await list_managed_policy_tags_semaphore.process(
+        [
+            {"iam_client": iam_client, "policy_arn": managed_policy["Arn"]}
+            for managed_policy in account_managed_policies
+        ]
+    )
+    for managed_policy, tags in zip(
+        account_managed_policies, account_managed_policy_tags
+    ):
+        managed_policy["Tags"] = tags
 
     log.debug(
         "Retrieved AWS IAM Managed Policies.",
@@ -248,11 +267,10 @@ async def create_templated_managed_policy(  # noqa: C901
     import_actions = set()
     num_of_accounts = len(managed_policy_refs)
     for managed_policy_ref in managed_policy_refs:
-        async with aiofiles.open(managed_policy_ref["file_path"], mode="r") as f:
-            content_dict = json.loads(await f.read())
-            account_id_to_mp_map[
-                managed_policy_ref["account_id"]
-            ] = normalize_dict_keys(content_dict)
+        content_dict = await load_resource_file(managed_policy_ref["file_path"])
+        account_id_to_mp_map[managed_policy_ref["account_id"]] = normalize_dict_keys(
+            content_dict
+        )
 
     # calculate preference based on existing template
     prefer_templatized = calculate_import_preference(
@@ -400,7 +418,7 @@ async def collect_aws_managed_policies(
 
     if detect_messages:
         generate_mp_resource_file_for_all_accounts_semaphore = NoqSemaphore(
-            generate_managed_policy_resource_file_for_all_accounts, 50
+            generate_managed_policy_resource_file_for_all_accounts, AWS_API_CONCURRENCY
         )
         grouped_detect_messages = group_detect_messages("policy_name", detect_messages)
 
@@ -458,7 +476,7 @@ async def collect_aws_managed_policies(
         ]
     else:
         generate_account_managed_policy_resource_files_semaphore = NoqSemaphore(
-            generate_account_managed_policy_resource_files, 25
+            generate_account_managed_policy_resource_files, AWS_API_CONCURRENCY
         )
         account_managed_policies = (
             await generate_account_managed_policy_resource_files_semaphore.process(
@@ -11,8 +11,13 @@ from iambic.core.context import ctx
 from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
 from iambic.core.utils import NoqSemaphore, aio_wrapper, plugin_apply_wrapper
+from iambic.plugins.v0_1_0.aws.iam.utils import get_cached_iam_resource
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
-from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, paginated_search
+from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
+    boto_crud_call,
+    paginated_search,
+)
 
 
 async def list_managed_policy_versions(iam_client, policy_arn: str) -> list[dict]:
@@ -62,7 +67,24 @@ async def get_managed_policy_attachments(iam_client, policy_arn: str):
     )
 
 
-async def get_managed_policy(iam_client, policy_arn: str, **kwargs) -> dict:
+async def get_managed_policy(
+    iam_client, policy_arn: str, aws_account: AWSAccount = None, **kwargs
+) -> dict:
+    if (
+        aws_account
+        # Only customer managed policies are prefetched
+        and policy_arn.split(":")[4] == aws_account.account_id
+        and (
+            response := get_cached_iam_resource(
+                aws_account, "managed_policy", policy_arn
+            )
+        )
+        is not None
+    ):
+        if response:
+            response["Tags"] = await list_managed_policy_tags(iam_client, policy_arn)
+        return response
+
     try:
         response = (
             await boto_crud_call(iam_client.get_policy, PolicyArn=policy_arn)
@@ -95,7 +117,7 @@ async def list_managed_policies(
     path_prefix: str = "/",
     policy_usage_filter: str = None,
 ):
-    get_managed_policy_semaphore = NoqSemaphore(get_managed_policy, 50)
+    get_managed_policy_semaphore = NoqSemaphore(get_managed_policy, AWS_API_CONCURRENCY)
     list_policy_kwargs = dict(
         Scope=scope,
         OnlyAttached=only_attached,
@@ -236,7 +236,10 @@ class AwsIamRoleTemplate(AWSTemplate, AccessModel):
         )
         deleted = self.get_attribute_val_for_account(aws_account, "deleted", False)
         current_role = await get_role(
-            role_name, client, include_policies=bool(not deleted)
+            role_name,
+            client,
+            include_policies=bool(not deleted),
+            aws_account=aws_account,
         )
         if current_role:
             account_change_details.current_value = {**current_role}  # Create a new dict
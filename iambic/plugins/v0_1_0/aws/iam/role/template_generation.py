@@ -6,8 +6,6 @@ import os
 from collections import defaultdict
 from typing import TYPE_CHECKING, Optional
 
-import aiofiles
-
 from iambic.core import noq_json as json
 from iambic.core.detect import generate_template_output, group_detect_messages
 from iambic.core.logger import log
@@ -19,6 +17,7 @@ from iambic.core.template_generation import (
 from iambic.core.utils import (
     NoqSemaphore,
     get_rendered_template_str_value,
+    load_resource_file,
     normalize_dict_keys,
     resource_file_upsert,
 )
@@ -36,6 +35,7 @@ from iambic.plugins.v0_1_0.aws.iam.role.utils import (
     list_role_tags,
     list_roles,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import get_account_iam_snapshot
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.template_generation import (
     base_group_str_attribute,
@@ -43,6 +43,7 @@ from iambic.plugins.v0_1_0.aws.template_generation import (
     group_int_or_str_attribute,
 )
 from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
     calculate_import_preference,
     get_aws_account_map,
     process_import_rules,
@@ -113,7 +114,10 @@ async def generate_account_role_resource_files(
 
     response = dict(account_id=aws_account.account_id, roles=[])
     iam_client = await aws_account.get_boto3_client("iam")
-    account_roles = await list_roles(iam_client)
+    iam_snapshot = await get_account_iam_snapshot(exe_message, aws_account)
+    account_roles = await list_roles(iam_client, list(iam_snapshot.roles.values()))
+    # Roles created after the snapshot was taken are retrieved individually
+    missing_role_messages = []
 
     log.debug(
         "Retrieved AWS IAM Roles.",
@@ -126,6 +130,18 @@ async def generate_account_role_resource_files(
         role_path = os.path.join(
             account_resource_dir, f'{account_role["RoleName"]}.json'
         )
+        if role_attributes := iam_snapshot.get_role_resource_attributes(
+            account_role["RoleName"]
+        ):
+            account_role.update(role_attributes)
+        else:
+            missing_role_messages.append(
+                {
+                    "role_name": account_role["RoleName"],
+                    "role_resource_path": role_path,
+                    "aws_account": aws_account,
+                }
+            )
         response["roles"].append(
             {
                 "path": role_path,
@@ -138,6 +154,19 @@ async def generate_account_role_resource_files(
         )
 
     await role_resource_file_upsert_semaphore.process(messages)
+    if missing_role_messages:
+        await asyncio.gather(
+            *[
+                NoqSemaphore(set_role_resource_fnc, AWS_API_CONCURRENCY).process(
+                    missing_role_messages
+                )
+                for set_role_resource_fnc in [
+                    set_role_resource_inline_policies,
+                    set_role_resource_managed_policies,
+                    set_role_resource_tags,
+                ]
+            ]
+        )
     log.debug(
         "Finished caching AWS IAM Roles.",
         account_id=aws_account.account_id,
@@ -252,26 +281,23 @@ async def set_role_resource_managed_policies(
 async def _account_id_to_role_map(role_refs):
     account_id_to_role_map = {}
     for role_ref in role_refs:
-        async with aiofiles.open(role_ref["path"], mode="r") as f:
-            content_dict = json.loads(await f.read())
+        content_dict = await load_resource_file(role_ref["path"])
 
-            # handle strange unstable response with deleted principals
-            assume_role_policy_document = content_dict.get(
-                "AssumeRolePolicyDocument", None
+        # handle strange unstable response with deleted principals
+        assume_role_policy_document = content_dict.get("AssumeRolePolicyDocument", None)
+        if assume_role_policy_document:
+            policy_document = AssumeRolePolicyDocument.parse_obj(
+                normalize_dict_keys(assume_role_policy_document)
             )
-            if assume_role_policy_document:
-                policy_document = AssumeRolePolicyDocument.parse_obj(
-                    normalize_dict_keys(assume_role_policy_document)
+            content_dict["AssumeRolePolicyDocument"] = json.loads(
+                policy_document.json(
+                    exclude_unset=True, exclude_defaults=True, exclude_none=True
                 )
-                content_dict["AssumeRolePolicyDocument"] = json.loads(
-                    policy_document.json(
-                        exclude_unset=True, exclude_defaults=True, exclude_none=True
-                    )
-                )
-
-            account_id_to_role_map[role_ref["account_id"]] = normalize_dict_keys(
-                content_dict
             )
+
+        account_id_to_role_map[role_ref["account_id"]] = normalize_dict_keys(
+            content_dict
+        )
     return account_id_to_role_map
 
 
@@ -503,13 +529,6 @@ async def collect_aws_roles(
         }
 
     existing_template_map = iam_template_map.get(AWS_IAM_ROLE_TEMPLATE_TYPE, {})
-    set_role_resource_inline_policies_semaphore = NoqSemaphore(
-        set_role_resource_inline_policies, 20
-    )
-    set_role_resource_managed_policies_semaphore = NoqSemaphore(
-        set_role_resource_managed_policies, 30
-    )
-    set_role_resource_tags_semaphore = NoqSemaphore(set_role_resource_tags, 45)
 
     log.info(
         "Generating AWS role templates. Beginning to retrieve AWS IAM Roles.",
@@ -518,7 +537,7 @@ async def collect_aws_roles(
 
     if detect_messages:
         generate_role_resource_file_for_all_accounts_semaphore = NoqSemaphore(
-            generate_role_resource_file_for_all_accounts, 45
+            generate_role_resource_file_for_all_accounts, AWS_API_CONCURRENCY
         )
         grouped_detect_messages = group_detect_messages("role_name", detect_messages)
         tasks = [
@@ -567,7 +586,7 @@ async def collect_aws_roles(
         ]
     else:
         generate_account_role_resource_files_semaphore = NoqSemaphore(
-            generate_account_role_resource_files, 5
+            generate_account_role_resource_files, AWS_API_CONCURRENCY
         )
         account_roles = await generate_account_role_resource_files_semaphore.process(
             [
@@ -576,33 +595,7 @@ async def collect_aws_roles(
             ]
         )
 
-    messages = []
-    # Upsert roles
-    for account_role in account_roles:
-        for role in account_role["roles"]:
-            messages.append(
-                {
-                    "role_name": role["name"],
-                    "role_resource_path": role["path"],
-                    "aws_account": aws_account_map[account_role["account_id"]],
-                }
-            )
-
     if not detect_messages:
-        log.info(
-            "Setting inline policies in role templates",
-            accounts=list(aws_account_map.keys()),
-        )
-        await set_role_resource_inline_policies_semaphore.process(messages)
-        log.info(
-            "Setting managed policies in role templates",
-            accounts=list(aws_account_map.keys()),
-        )
-        await set_role_resource_managed_policies_semaphore.process(messages)
-        log.info(
-            "Setting tags in role templates", accounts=list(aws_account_map.keys())
-        )
-        await set_role_resource_tags_semaphore.process(messages)
         log.info(
             "Finished retrieving role details", accounts=list(aws_account_map.keys())
         )
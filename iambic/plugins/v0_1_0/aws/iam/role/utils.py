@@ -15,6 +15,7 @@ from iambic.core.utils import (
     get_rendered_template_str_value,
     plugin_apply_wrapper,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import get_cached_iam_resource
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, paginated_search
 
@@ -33,11 +34,14 @@ async def get_role_instance_profiles(role_name: str, iam_client):
     )
 
 
-async def list_roles(iam_client):
+async def list_roles(iam_client, role_details_list: list[dict] = None):
     # role_details_list is missing MaxSessionDuration, see https://docs.aws.amazon.com/IAM/latest/APIReference/API_RoleDetail.html
-    role_details_list = await paginated_search(
-        iam_client.get_account_authorization_details, "RoleDetailList", Filter=["Role"]
-    )
+    if role_details_list is None:
+        role_details_list = await paginated_search(
+            iam_client.get_account_authorization_details,
+            "RoleDetailList",
+            Filter=["Role"],
+        )
     role_name_to_role_details = {
         role_details["RoleName"]: role_details for role_details in role_details_list
     }
@@ -106,7 +110,20 @@ async def get_role_managed_policies(role_name: str, iam_client) -> list[dict[str
     return [{"PolicyArn": policy["PolicyArn"]} for policy in policies]
 
 
-async def get_role(role_name: str, iam_client, include_policies: bool = True) -> dict:
+async def get_role(
+    role_name: str,
+    iam_client,
+    include_policies: bool = True,
+    aws_account: AWSAccount = None,
+) -> dict:
+    if (
+        current_role := get_cached_iam_resource(aws_account, "role", role_name)
+    ) is not None:
+        if current_role and not include_policies:
+            current_role.pop("ManagedPolicies", None)
+            current_role.pop("InlinePolicies", None)
+        return current_role
+
     try:
         current_role = (await boto_crud_call(iam_client.get_role, RoleName=role_name))[
             "Role"
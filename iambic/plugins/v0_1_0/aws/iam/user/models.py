@@ -182,7 +182,10 @@ class AwsIamUserTemplate(AWSTemplate, AccessModel):
         )
         deleted = self.get_attribute_val_for_account(aws_account, "deleted", False)
         current_user = await get_user(
-            user_name, client, include_policies=bool(not deleted)
+            user_name,
+            client,
+            include_policies=bool(not deleted),
+            aws_account=aws_account,
         )
         if current_user:
             account_change_details.current_value = {**current_user}  # Create a new dict
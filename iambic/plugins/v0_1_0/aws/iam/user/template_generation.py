@@ -6,8 +6,6 @@ import os
 from collections import defaultdict
 from typing import TYPE_CHECKING, Optional
 
-import aiofiles
-
 from iambic.core import noq_json as json
 from iambic.core.detect import generate_template_output, group_detect_messages
 from iambic.core.logger import log
@@ -16,7 +14,12 @@ from iambic.core.template_generation import (
     create_or_update_template,
     delete_orphaned_templates,
 )
-from iambic.core.utils import NoqSemaphore, normalize_dict_keys, resource_file_upsert
+from iambic.core.utils import (
+    NoqSemaphore,
+    load_resource_file,
+    normalize_dict_keys,
+    resource_file_upsert,
+)
 from iambic.plugins.v0_1_0.aws.event_bridge.models import UserMessageDetails
 from iambic.plugins.v0_1_0.aws.iam.user.models import (
     AWS_IAM_USER_TEMPLATE_TYPE,
@@ -29,8 +32,8 @@ from iambic.plugins.v0_1_0.aws.iam.user.utils import (
     get_user_inline_policies,
     get_user_managed_policies,
     list_user_tags,
-    list_users,
 )
+from iambic.plugins.v0_1_0.aws.iam.utils import get_account_iam_snapshot
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.template_generation import (
     base_group_str_attribute,
@@ -38,6 +41,7 @@ from iambic.plugins.v0_1_0.aws.template_generation import (
     group_int_or_str_attribute,
 )
 from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
     calculate_import_preference,
     get_aws_account_map,
     process_import_rules,
@@ -107,8 +111,9 @@ async def generate_account_user_resource_files(
     messages = []
 
     response = dict(account_id=aws_account.account_id, users=[])
-    iam_client = await aws_account.get_boto3_client("iam")
-    account_users = await list_users(iam_client)
+    iam_snapshot = await get_account_iam_snapshot(exe_message, aws_account)
+    account_users = list(iam_snapshot.users.values())
+    missing_user_messages = []
 
     log.debug(
         "Retrieved AWS IAM Users.",
@@ -121,6 +126,18 @@ async def generate_account_user_resource_files(
         user_path = os.path.join(
             account_resource_dir, f'{account_user["UserName"]}.json'
         )
+        if user_attributes := iam_snapshot.get_user_resource_attributes(
+            account_user["UserName"]
+        ):
+            account_user = {**account_user, **user_attributes}
+        else:
+            missing_user_messages.append(
+                {
+                    "user_name": account_user["UserName"],
+                    "user_resource_path": user_path,
+                    "aws_account": aws_account,
+                }
+            )
         response["users"].append(
             {
                 "path": user_path,
@@ -133,6 +150,20 @@ async def generate_account_user_resource_files(
         )
 
     await user_resource_file_upsert_semaphore.process(messages)
+    if missing_user_messages:
+        await asyncio.gather(
+            *[
+                NoqSemaphore(set_user_resource_fnc, AWS_API_CONCURRENCY).process(
+                    missing_user_messages
+                )
+                for set_user_resource_fnc in [
+                    set_user_resource_inline_policies,
+                    set_user_resource_managed_policies,
+                    set_user_resource_groups,
+                    set_user_resource_tags,
+                ]
+            ]
+        )
     log.debug(
         "Finished caching AWS IAM Users.",
         account_id=aws_account.account_id,
@@ -249,11 +280,10 @@ async def set_user_resource_groups(
 async def _account_id_to_user_map(user_refs):
     account_id_to_user_map = {}
     for user_ref in user_refs:
-        async with aiofiles.open(user_ref["path"], mode="r") as f:
-            content_dict = json.loads(await f.read())
-            account_id_to_user_map[user_ref["account_id"]] = normalize_dict_keys(
-                content_dict
-            )
+        content_dict = await load_resource_file(user_ref["path"])
+        account_id_to_user_map[user_ref["account_id"]] = normalize_dict_keys(
+            content_dict
+        )
     return account_id_to_user_map
 
 
@@ -461,15 +491,6 @@ async def collect_aws_users(
         }
 
     existing_template_map = iam_template_map.get(AWS_IAM_USER_TEMPLATE_TYPE, {})
-    set_user_resource_inline_policies_semaphore = NoqSemaphore(
-        set_user_resource_inline_policies, 20
-    )
-    set_user_resource_managed_policies_semaphore = NoqSemaphore(
-        set_user_resource_managed_policies, 30
-    )
-
-    set_user_resource_groups_semaphore = NoqSemaphore(set_user_resource_groups, 25)
-    set_user_resource_tags_semaphore = NoqSemaphore(set_user_resource_tags, 30)
 
     log.info(
         "Generating AWS user templates. Beginning to retrieve AWS IAM Users.",
@@ -478,7 +499,7 @@ async def collect_aws_users(
 
     if detect_messages:
         generate_user_resource_file_for_all_accounts_semaphore = NoqSemaphore(
-            generate_user_resource_file_for_all_accounts, 50
+            generate_user_resource_file_for_all_accounts, AWS_API_CONCURRENCY
         )
         grouped_detect_messages = group_detect_messages("user_name", detect_messages)
         tasks = [
@@ -527,7 +548,7 @@ async def collect_aws_users(
         ]
     else:
         generate_account_user_resource_files_semaphore = NoqSemaphore(
-            generate_account_user_resource_files, 5
+            generate_account_user_resource_files, AWS_API_CONCURRENCY
         )
         account_users = await generate_account_user_resource_files_semaphore.process(
             [
@@ -536,37 +557,7 @@ async def collect_aws_users(
             ]
         )
 
-    messages = []
-    # Upsert users
-    for account_user in account_users:
-        for user in account_user["users"]:
-            messages.append(
-                {
-                    "user_name": user["name"],
-                    "user_resource_path": user["path"],
-                    "aws_account": aws_account_map[account_user["account_id"]],
-                }
-            )
-
     if not detect_messages:
-        log.info(
-            "Setting inline policies in user templates",
-            accounts=list(aws_account_map.keys()),
-        )
-        await set_user_resource_inline_policies_semaphore.process(messages)
-        log.info(
-            "Setting managed policies in user templates",
-            accounts=list(aws_account_map.keys()),
-        )
-        await set_user_resource_managed_policies_semaphore.process(messages)
-        log.info(
-            "Setting groups in user templates", accounts=list(aws_account_map.keys())
-        )
-        await set_user_resource_groups_semaphore.process(messages)
-        log.info(
-            "Setting tags in user templates", accounts=list(aws_account_map.keys())
-        )
-        await set_user_resource_tags_semaphore.process(messages)
         log.info(
             "Finished retrieving user details", accounts=list(aws_account_map.keys())
         )
@@ -11,6 +11,7 @@ from iambic.core.context import ctx
 from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
 from iambic.core.utils import aio_wrapper, plugin_apply_wrapper
+from iambic.plugins.v0_1_0.aws.iam.utils import get_cached_iam_resource
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, paginated_search
 
@@ -88,7 +89,21 @@ async def get_user_managed_policies(user_name: str, iam_client) -> list[dict[str
     return [{"PolicyArn": policy["PolicyArn"]} for policy in policies]
 
 
-async def get_user(user_name: str, iam_client, include_policies: bool = True) -> dict:
+async def get_user(
+    user_name: str,
+    iam_client,
+    include_policies: bool = True,
+    aws_account: AWSAccount = None,
+) -> dict:
+    if (
+        current_user := get_cached_iam_resource(aws_account, "user", user_name)
+    ) is not None:
+        if current_user and not include_policies:
+            current_user.pop("ManagedPolicies", None)
+            current_user.pop("InlinePolicies", None)
+            current_user.pop("Groups", None)
+        return current_user
+
     try:
         current_user = (await boto_crud_call(iam_client.get_user, UserName=user_name))[
             "User"
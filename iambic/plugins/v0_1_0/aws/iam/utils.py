@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, Optional
+
+import aiofiles
+from botocore.exceptions import ClientError
+
+from iambic.core import noq_json as json
+from iambic.core.context import ctx
+from iambic.core.logger import log
+from iambic.core.models import AccountChangeDetails, ProposedChangeType
+from iambic.core.utils import NoqSemaphore, evaluate_on_provider
+from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
+    boto_crud_call,
+    paginated_search,
+)
+
+if TYPE_CHECKING:
+    from iambic.core.models import BaseTemplate, ExecutionMessage, TemplateChangeDetails
+    from iambic.plugins.v0_1_0.aws.models import AWSAccount
+
+ACCOUNT_AUTHORIZATION_DETAILS_FILTER = ["Role", "User", "Group", "LocalManagedPolicy"]
+ACCOUNT_AUTHORIZATION_DETAILS_KEYS = [
+    "RoleDetailList",
+    "UserDetailList",
+    "GroupDetailList",
+    "Policies",
+]
+ACCOUNT_AUTHORIZATION_DETAILS_FILE = "authorization_details.json"
+# The number of templates that must be applied to an account
+# before its IAM state is prefetched instead of retrieved per resource.
+IAM_STATE_CACHE_MIN_TEMPLATES = int(
+    os.environ.get("IAMBIC_IAM_STATE_CACHE_MIN_TEMPLATES", 25)
+)
+# The number of seconds to wait for a created resource to be visible
+IAM_READINESS_MAX_WAIT = float(os.environ.get("IAMBIC_IAM_READINESS_MAX_WAIT", 30))
+
+
+async def get_account_authorization_details(iam_client) -> dict[str, list]:
+    return await paginated_search(
+        iam_client.get_account_authorization_details,
+        response_keys=ACCOUNT_AUTHORIZATION_DETAILS_KEYS,
+        retain_key=True,
+        Filter=ACCOUNT_AUTHORIZATION_DETAILS_FILTER,
+    )
+
+
+def _inline_policies(policy_list: list[dict]) -> list[dict]:
+    # Same shape as set_*_resource_inline_policies
+    return [
+        {**policy["PolicyDocument"], "policy_name": policy["PolicyName"]}
+        for policy in policy_list
+    ]
+
+
+def _managed_policies(attached_policies: list[dict]) -> list[dict]:
+    return [{"PolicyArn": policy["PolicyArn"]} for policy in attached_policies]
+
+
+class IAMAccountSnapshot:
+    """
+    The roles, users, groups and customer managed policies of an account
+    as returned by a single paginated GetAccountAuthorizationDetails call.
+
+    The get_*_resource_attributes methods return the attributes that were previously
+    retrieved by calling IAM once (or more) per resource,
+    in the same shape they are written to the resource file.
+    """
+
+    def __init__(self, authorization_details: dict[str, list]):
+        self.roles = {
+            role["RoleName"]: role
+            for role in authorization_details.get("RoleDetailList", [])
+        }
+        self.users = {
+            user["UserName"]: user
+            for user in authorization_details.get("UserDetailList", [])
+        }
+        self.groups = {
+            group["GroupName"]: group
+            for group in authorization_details.get("GroupDetailList", [])
+        }
+        self.managed_policies = {
+            policy["Arn"]: policy
+            for policy in authorization_details.get("Policies", [])
+        }
+
+    def get_role_resource_attributes(self, role_name: str) -> Optional[dict]:
+        if not (role := self.roles.get(role_name)):
+            return None
+
+        return {
+            "Tags": role.get("Tags", []),
+            "InlinePolicies": _inline_policies(role.get("RolePolicyList", [])),
+            "ManagedPolicies": _managed_policies(
+                role.get("AttachedManagedPolicies", [])
+            ),
+        }
+
+    def get_user_resource_attributes(self, user_name: str) -> Optional[dict]:
+        if not (user := self.users.get(user_name)):
+            return None
+
+        # GroupList only contains the group names, so use the group details
+        # to match the response of list_groups_for_user
+        user_groups = {}
+        for group_name in user.get("GroupList", []):
+            if group_name not in self.groups:
+                return None
+            user_groups[group_name] = self.get_group(group_name)
+
+        return {
+            "Tags": user.get("Tags", []),
+            "InlinePolicies": _inline_policies(user.get("UserPolicyList", [])),
+            "ManagedPolicies": _managed_policies(
+                user.get("AttachedManagedPolicies", [])
+            ),
+            "Groups": user_groups,
+        }
+
+    def get_group(self, group_name: str) -> dict:
+        """The group in the same shape as list_groups"""
+        return {
+            k: v
+            for k, v in self.groups[group_name].items()
+            if k not in ["GroupPolicyList", "AttachedManagedPolicies"]
+        }
+
+    def get_group_resource_attributes(self, group_name: str) -> Optional[dict]:
+        if not (group := self.groups.get(group_name)):
+            return None
+
+        return {
+            "InlinePolicies": _inline_policies(group.get("GroupPolicyList", [])),
+            "ManagedPolicies": _managed_policies(
+                group.get("AttachedManagedPolicies", [])
+            ),
+        }
+
+    def get_managed_policy(self, policy_arn: str) -> Optional[dict]:
+        """The policy in the same shape as get_managed_policy, excluding Tags.
+
+        Tags are not included in the GetAccountAuthorizationDetails response.
+        """
+        if not (policy := self.managed_policies.get(policy_arn)):
+            return None
+
+        policy = {k: v for k, v in policy.items() if k != "PolicyVersionList"}
+        default_version_id = policy.pop("DefaultVersionId", None)
+        policy["PolicyDocument"] = next(
+            (
+                version.get("Document", {})
+                for version in self.managed_policies[policy_arn].get(
+                    "PolicyVersionList", []
+                )
+                if version.get("IsDefaultVersion")
+                or version.get("VersionId") == default_version_id
+            ),
+            {},
+        )
+        return policy
+
+
+def get_snapshot_dir(exe_message: ExecutionMessage, aws_account: AWSAccount) -> str:
+    if exe_message.provider_id:
+        return exe_message.get_directory("iam")
+    else:
+        return exe_message.get_directory(aws_account.account_id, "iam")
+
+
+async def get_account_iam_snapshot(
+    exe_message: ExecutionMessage, aws_account: AWSAccount
+) -> IAMAccountSnapshot:
+    """Returns the IAMAccountSnapshot for the account.
+
+    The authorization details are cached in the execution directory
+    so the role, user, group and managed policy collectors of an import
+    share a single GetAccountAuthorizationDetails pass per account.
+    """
+    snapshot_path = os.path.join(
+        get_snapshot_dir(exe_message, aws_account), ACCOUNT_AUTHORIZATION_DETAILS_FILE
+    )
+    if os.path.exists(snapshot_path):
+        async with aiofiles.open(snapshot_path, mode="r") as f:
+            return IAMAccountSnapshot(json.loads(await f.read()))
+
+    iam_client = await aws_account.get_boto3_client("iam")
+    authorization_details = await get_account_authorization_details(iam_client)
+    log.debug(
+        "Retrieved AWS IAM account authorization details.",
+        account_id=aws_account.account_id,
+        account_name=aws_account.account_name,
+        **{
+            f"{key}_count": len(authorization_details[key])
+            for key in ACCOUNT_AUTHORIZATION_DETAILS_KEYS
+        },
+    )
+
+    async with aiofiles.open(snapshot_path, mode="w") as f:
+        await f.write(json.dumps(authorization_details))
+
+    return IAMAccountSnapshot(authorization_details)
+
+
+class IAMStateCache:
+    """
+    The prefetched state of an account's IAM resources used during plan/apply.
+
+    Resources are stored in the same shape returned by get_role, get_user, get_group
+    and get_managed_policy (excluding Tags for managed policies).
+
+    Each resource can only be retrieved from the cache once.
+    Any subsequent lookup must go to AWS because the resource may have been changed
+    by the apply that performed the first lookup.
+
+    IAM names are case-insensitive so resources are keyed by their lowercased identifier.
+    """
+
+    def __init__(self, resources: dict[str, dict[str, dict]]):
+        self._resources = {
+            resource_type: {
+                resource_id.lower(): resource
+                for resource_id, resource in resource_map.items()
+            }
+            for resource_type, resource_map in resources.items()
+        }
+        self._retrieved: set[tuple[str, str]] = set()
+
+    def get(self, resource_type: str, resource_id: str) -> Optional[dict]:
+        """Return the prefetched state of a resource.
+
+        An empty dict is returned if the resource did not exist when the state was prefetched.
+        None is returned if the resource must be retrieved from AWS.
+        """
+        resource_id = resource_id.lower()
+        if resource_type not in self._resources:
+            return None
+        elif (resource_type, resource_id) in self._retrieved:
+            return None
+
+        self._retrieved.add((resource_type, resource_id))
+        return self._resources[resource_type].pop(resource_id, {})
+
+
+def get_cached_iam_resource(
+    aws_account: Optional[AWSAccount], resource_type: str, resource_id: str
+) -> Optional[dict]:
+    if aws_account and (iam_state_cache := aws_account.iam_state_cache):
+        return iam_state_cache.get(resource_type, resource_id)
+
+
+def _policy_details(policy_list: list[dict]) -> list[dict]:
+    # Same shape as get_*_inline_policies(as_dict=False)
+    return [
+        {"PolicyName": policy["PolicyName"], **policy["PolicyDocument"]}
+        for policy in policy_list
+    ]
+
+
+async def set_account_iam_state_cache(aws_account: AWSAccount):
+    iam_client = await aws_account.get_boto3_client("iam")
+    snapshot = IAMAccountSnapshot(await get_account_authorization_details(iam_client))
+    # The role details are missing Description and MaxSessionDuration
+    role_list = await paginated_search(iam_client.list_roles, "Roles")
+
+    roles = {}
+    for role in role_list:
+        if not (role_details := snapshot.roles.get(role["RoleName"])):
+            # The role was created after the snapshot was taken
+            continue
+
+        role = {
+            **role,
+            "Tags": role_details.get("Tags", []),
+            "ManagedPolicies": _managed_policies(
+                role_details.get("AttachedManagedPolicies", [])
+            ),
+            "InlinePolicies": _policy_details(role_details.get("RolePolicyList", [])),
+            "RoleLastUsed": role_details.get("RoleLastUsed", {}),
+        }
+        if permissions_boundary := role_details.get("PermissionsBoundary"):
+            role["PermissionsBoundary"] = {
+                k: v
+                for k, v in permissions_boundary.items()
+                if k != "PermissionsBoundaryType"
+            }
+        roles[role["RoleName"]] = role
+
+    users = {}
+    for user_name, user_details in snapshot.users.items():
+        users[user_name] = {
+            **{
+                k: v
+                for k, v in user_details.items()
+                if k not in ["UserPolicyList", "GroupList", "AttachedManagedPolicies"]
+            },
+            "ManagedPolicies": _managed_policies(
+                user_details.get("AttachedManagedPolicies", [])
+            ),
+            "InlinePolicies": _policy_details(user_details.get("UserPolicyList", [])),
+            "Groups": [
+                {"GroupName": group_name}
+                for group_name in user_details.get("GroupList", [])
+            ],
+        }
+
+    groups = {}
+    for group_name, group_details in snapshot.groups.items():
+        groups[group_name] = {
+            **snapshot.get_group(group_name),
+            "ManagedPolicies": _managed_policies(
+                group_details.get("AttachedManagedPolicies", [])
+            ),
+            "InlinePolicies": _policy_details(group_details.get("GroupPolicyList", [])),
+        }
+
+    aws_account.iam_state_cache = IAMStateCache(
+        {
+            "role": roles,
+            "user": users,
+            "group": groups,
+            "managed_policy": {
+                policy_arn: snapshot.get_managed_policy(policy_arn)
+                for policy_arn in snapshot.managed_policies.keys()
+            },
+        }
+    )
+    log.debug(
+        "Prefetched AWS IAM state.",
+        account_id=aws_account.account_id,
+        account_name=aws_account.account_name,
+        role_count=len(roles),
+        user_count=len(users),
+        group_count=len(groups),
+        managed_policy_count=len(snapshot.managed_policies),
+    )
+
+
+async def set_iam_state_caches(
+    aws_accounts: list[AWSAccount], templates: list[BaseTemplate]
+):
+    """Prefetch the IAM state of every account that enough of the templates will be applied to.
+
+    For a small number of templates, retrieving each resource is cheaper
+    than paginating through every resource in the account.
+    """
+    if len(templates) < IAM_STATE_CACHE_MIN_TEMPLATES:
+        return
+
+    prefetch_accounts = []
+    for aws_account in aws_accounts:
+        template_count = 0
+        for template in templates:
+            if evaluate_on_provider(template, aws_account):
+                template_count += 1
+                if template_count >= IAM_STATE_CACHE_MIN_TEMPLATES:
+                    prefetch_accounts.append(aws_account)
+                    break
+
+    if not prefetch_accounts:
+        return
+
+    log.info(
+        "Prefetching AWS IAM state.",
+        accounts=[str(aws_account) for aws_account in prefetch_accounts],
+    )
+    set_account_iam_state_cache_semaphore = NoqSemaphore(
+        set_account_iam_state_cache, AWS_API_CONCURRENCY
+    )
+    results = await set_account_iam_state_cache_semaphore.process(
+        [{"aws_account": aws_account} for aws_account in prefetch_accounts],
+        return_exceptions=True,
+    )
+    for aws_account, result in zip(prefetch_accounts, results):
+        if isinstance(result, Exception):
+            # Not fatal, the resources will be retrieved individually
+            log.warning(
+                "Unable to prefetch AWS IAM state.",
+                account=str(aws_account),
+                error=repr(result),
+            )
+
+
+def clear_iam_state_caches(aws_accounts: list[AWSAccount]):
+    for aws_account in aws_accounts:
+        aws_account.iam_state_cache = None
+
+
+def get_created_account_changes(
+    template_change: TemplateChangeDetails,
+) -> list[AccountChangeDetails]:
+    """The account changes of a template that created the resource in the account."""
+    if not ctx.execute:
+        return []
+
+    return [
+        account_change
+        for account_change in template_change.proposed_changes
+        if isinstance(account_change, AccountChangeDetails)
+        and any(
+            proposed_change.change_type == ProposedChangeType.CREATE
+            for proposed_change in account_change.proposed_changes
+        )
+    ]
+
+
+async def wait_for_iam_resource(
+    boto_fnc, max_wait: float = IAM_READINESS_MAX_WAIT, **kwargs
+) -> bool:
+    """Poll the IAM get call with exponential backoff until the resource is visible.
+
+    IAM is eventually consistent so a resource may not be usable right after it is created.
+    Returns False if the resource is still not visible after max_wait seconds.
+    """
+    delay = 0.25
+    start = time.monotonic()
+    while True:
+        try:
+            await boto_crud_call(boto_fnc, **kwargs)
+            return True
+        except ClientError as err:
+            if err.response["Error"]["Code"] != "NoSuchEntity":
+                raise
+
+        if time.monotonic() - start + delay > max_wait:
+            return False
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 5)
+
+
+async def wait_for_created_iam_resources(
+    aws_account_map: dict[str, AWSAccount],
+    template_type: str,
+    template_change: TemplateChangeDetails,
+):
+    """Wait for the managed policies or groups created by a template to be visible."""
+    from iambic.plugins.v0_1_0.aws.iam.group.models import AWS_IAM_GROUP_TEMPLATE_TYPE
+    from iambic.plugins.v0_1_0.aws.iam.policy.models import (
+        AWS_MANAGED_POLICY_TEMPLATE_TYPE,
+    )
+
+    async def wait_for_account_resource(account_change: AccountChangeDetails):
+        aws_account = aws_account_map[account_change.account]
+        iam_client = await aws_account.get_boto3_client("iam")
+        if template_type == AWS_MANAGED_POLICY_TEMPLATE_TYPE:
+            is_visible = await wait_for_iam_resource(
+                iam_client.get_policy, PolicyArn=account_change.new_value["Arn"]
+            )
+        elif template_type == AWS_IAM_GROUP_TEMPLATE_TYPE:
+            is_visible = await wait_for_iam_resource(
+                iam_client.get_group, GroupName=account_change.resource_id
+            )
+        else:
+            raise TypeError(f"Unsupported template type: {template_type}")
+
+        if not is_visible:
+            log.warning(
+                "Created resource is not visible yet. Continuing.",
+                resource_type=template_change.resource_type,
+                resource_id=account_change.resource_id,
+                account=account_change.account,
+            )
+
+    created_account_changes = get_created_account_changes(template_change)
+    results = await asyncio.gather(
+        *[
+            wait_for_account_resource(account_change)
+            for account_change in created_account_changes
+        ],
+        return_exceptions=True,
+    )
+    for account_change, result in zip(created_account_changes, results):
+        if isinstance(result, Exception):
+            # Not fatal, the dependent template will report the error if there is one
+            log.warning(
+                "Unable to check if the created resource is visible.",
+                resource_type=template_change.resource_type,
+                resource_id=account_change.resource_id,
+                account=account_change.account,
+                error=repr(result),
+            )
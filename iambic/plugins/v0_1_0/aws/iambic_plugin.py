@@ -18,6 +18,7 @@ from iambic.plugins.v0_1_0.aws.handlers import (
     load,
 )
 from iambic.plugins.v0_1_0.aws.models import AWSAccount, AWSOrganization
+from iambic.plugins.v0_1_0.aws.utils import ASYNC_TRANSPORT_SUPPORTED_SERVICES
 
 
 def get_aws_templates():
@@ -95,6 +96,15 @@ class AWSConfig(ConfigMixin, BaseModel):
         [],
         description=("A list of rules to determine which resources to import from AWS"),
     )
+    async_transport_services: list[str] = Field(
+        [],
+        description=(
+            "The AWS services to call with the aiobotocore async transport "
+            "instead of running each call in a thread. "
+            f"Supported services: {', '.join(sorted(ASYNC_TRANSPORT_SUPPORTED_SERVICES))}. "
+            "Requires the aiobotocore extra."
+        ),
+    )
 
     @validator("organizations", allow_reuse=True)
     def validate_organizations(cls, organizations):
@@ -102,6 +112,16 @@ class AWSConfig(ConfigMixin, BaseModel):
             raise ValueError("Only one AWS Organization is supported at this time.")
         return organizations
 
+    @validator("async_transport_services", allow_reuse=True)
+    def validate_async_transport_services(cls, async_transport_services):
+        if unsupported_services := set(async_transport_services).difference(
+            ASYNC_TRANSPORT_SUPPORTED_SERVICES
+        ):
+            raise ValueError(
+                f"The async transport is not supported for: {', '.join(sorted(unsupported_services))}"
+            )
+        return async_transport_services
+
     @validator("accounts", allow_reuse=True)
     def validate_unique_accounts(cls, accounts):
         account_ids = set()
@@ -18,7 +18,7 @@ from iambic.core.models import (
     ProposedChangeType,
     TemplateChangeDetails,
 )
-from iambic.core.utils import aio_wrapper, evaluate_on_provider, plugin_apply_wrapper
+from iambic.core.utils import aio_wrapper, evaluate_on_providers, plugin_apply_wrapper
 from iambic.plugins.v0_1_0.aws.iam.policy.models import PolicyStatement
 from iambic.plugins.v0_1_0.aws.identity_center.permission_set.utils import (
     WrapIdentityCenterStoreClient,
@@ -801,15 +801,12 @@ class AwsIdentityCenterPermissionSetTemplate(
         log_params = dict(
             resource_type=self.resource_type, resource_id=self.resource_id
         )
-        relevant_accounts = []
-
-        for account in config.accounts:
-            if not account.identity_center_details:
-                continue
-
-            if evaluate_on_provider(self, account):
-                relevant_accounts.append(account)
-                tasks.append(self._apply_to_account(account))
+        relevant_accounts = evaluate_on_providers(
+            self,
+            [account for account in config.accounts if account.identity_center_details],
+        )
+        for account in relevant_accounts:
+            tasks.append(self._apply_to_account(account))
 
         if not relevant_accounts:
             if ctx.execute:
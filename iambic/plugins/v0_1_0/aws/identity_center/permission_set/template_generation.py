@@ -6,8 +6,6 @@ import os
 from collections import defaultdict
 from typing import TYPE_CHECKING, Union
 
-import aiofiles
-
 from iambic.core import noq_json as json
 from iambic.core.logger import log
 from iambic.core.models import ExecutionMessage
@@ -15,7 +13,12 @@ from iambic.core.template_generation import (
     create_or_update_template,
     delete_orphaned_templates,
 )
-from iambic.core.utils import NoqSemaphore, normalize_dict_keys, resource_file_upsert
+from iambic.core.utils import (
+    NoqSemaphore,
+    load_resource_file,
+    normalize_dict_keys,
+    resource_file_upsert,
+)
 from iambic.plugins.v0_1_0.aws.event_bridge.models import PermissionSetMessageDetails
 from iambic.plugins.v0_1_0.aws.identity_center.permission_set.models import (
     AWS_IDENTITY_CENTER_PERMISSION_SET_TEMPLATE_TYPE,
@@ -35,6 +38,7 @@ from iambic.plugins.v0_1_0.aws.template_generation import (
     group_int_or_str_attribute,
 )
 from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
     calculate_import_preference,
     get_aws_account_map,
     process_import_rules,
@@ -159,11 +163,10 @@ async def create_templated_permission_set(  # noqa: C901
     account_id_to_permissionn_set_map = {}
     num_of_accounts = len(permission_set_refs)
     for permission_set_ref in permission_set_refs:
-        async with aiofiles.open(permission_set_ref["file_path"], mode="r") as f:
-            content_dict = json.loads(await f.read())
-            account_id_to_permissionn_set_map[
-                permission_set_ref["account_id"]
-            ] = normalize_dict_keys(content_dict)
+        content_dict = await load_resource_file(permission_set_ref["file_path"])
+        account_id_to_permissionn_set_map[
+            permission_set_ref["account_id"]
+        ] = normalize_dict_keys(content_dict)
 
     # calculate preference based on existing template
     prefer_templatized = calculate_import_preference(
@@ -518,7 +521,7 @@ async def collect_aws_permission_sets(
         permission_set_count=len(messages),
     )
     generate_permission_set_resource_file_semaphore = NoqSemaphore(
-        generate_permission_set_resource_file, 30
+        generate_permission_set_resource_file, AWS_API_CONCURRENCY
     )
     all_permission_sets = await generate_permission_set_resource_file_semaphore.process(
         messages
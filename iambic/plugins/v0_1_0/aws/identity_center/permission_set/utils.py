@@ -14,7 +14,11 @@ from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
 from iambic.core.utils import aio_wrapper, async_batch_processor, plugin_apply_wrapper
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
-from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, legacy_paginated_search
+from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
+    boto_crud_call,
+    legacy_paginated_search,
+)
 
 # This is used to signal a fallback value is used
 # during PrincipalID resolution. Some AD setup with
@@ -166,8 +170,7 @@ async def get_permission_set_users_and_groups(
             )
             for account_id in instance_accounts
         ],
-        15,
-        1,
+        AWS_API_CONCURRENCY,
         return_exceptions=True,
     )
 
@@ -705,7 +708,9 @@ async def apply_account_assignments(
             log.info(log_str, details=assignment, **log_params)
 
     if tasks:
-        results: list[list[ProposedChange]] = await async_batch_processor(tasks, 10, 1)
+        results: list[list[ProposedChange]] = await async_batch_processor(
+            tasks, AWS_API_CONCURRENCY
+        )
         return list(chain.from_iterable(results))
     else:
         return response
@@ -1061,7 +1066,7 @@ async def delete_permission_set(
         permission_set_arn=permission_set_arn,
         **log_params,
     )
-    await async_batch_processor(tasks, 10, 1)
+    await async_batch_processor(tasks, AWS_API_CONCURRENCY)
 
     retry_count = 0
     while True:
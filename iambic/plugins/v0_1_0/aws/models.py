@@ -12,6 +12,7 @@ from pydantic import BaseModel as PydanticBaseModel
 from pydantic import Extra, Field, constr, validator
 from ruamel.yaml import YAML, yaml_object
 
+from iambic.core.aio_utils import register_loop_cleanup
 from iambic.core.context import ctx
 from iambic.core.iambic_enum import IambicManaged
 from iambic.core.logger import log
@@ -29,7 +30,7 @@ from iambic.core.models import (
 )
 from iambic.core.utils import (
     NoqSemaphore,
-    evaluate_on_provider,
+    evaluate_on_providers,
     get_provider_value,
     sort_dict,
 )
@@ -38,10 +39,14 @@ from iambic.plugins.v0_1_0.aws.identity_center.permission_set.active_directory_u
     alternate_list_users,
 )
 from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
     RegionName,
+    aws_rate_limiters,
     boto_crud_call,
+    create_aio_client,
     create_assume_role_session,
     get_current_role_arn,
+    is_async_transport_available,
     legacy_paginated_search,
     set_org_account_variables,
 )
@@ -187,9 +192,14 @@ class BaseAWSAccountAndOrgModel(PydanticBaseModel):
         description="The external id to use for assuming into a role when making calls to the account",
     )
     boto3_session_map: Optional[dict] = None
+    # Set from the AWS config when it is loaded
+    async_transport_services: Optional[list[str]] = None
 
     class Config:
-        fields = {"boto3_session_map": {"exclude": True}}
+        fields = {
+            "boto3_session_map": {"exclude": True},
+            "async_transport_services": {"exclude": True},
+        }
         extra = Extra.ignore
 
     @property
@@ -233,12 +243,28 @@ class BaseAWSAccountAndOrgModel(PydanticBaseModel):
         self.boto3_session_map[region_name] = session
         return self.boto3_session_map[region_name]
 
-    async def get_boto3_client(self, service: str, region_name: Optional[str] = None):
+    async def get_boto3_client(
+        self,
+        service: str,
+        region_name: Optional[str] = None,
+        async_transport: Optional[bool] = None,
+    ):
+        """Returns the client for the service in the region.
+
+        :param async_transport: If true and aiobotocore is installed, an async client is returned.
+            Its methods are awaited directly by boto_crud_call instead of being run in a thread.
+            Defaults to whether the service is in async_transport_services.
+        """
         region_name = region_name or self.region_name
+        if async_transport is None:
+            async_transport = service in (self.async_transport_services or [])
 
         if self.boto3_session_map is None:
             self.boto3_session_map = {}
 
+        if async_transport and is_async_transport_available():
+            return await self._get_aio_client(service, region_name)
+
         if (
             client := self.boto3_session_map.get("client", {})
             .get(service, {})
@@ -252,11 +278,48 @@ class BaseAWSAccountAndOrgModel(PydanticBaseModel):
                 max_pool_connections=50, region_name=region_name
             ),
         )
+        aws_rate_limiters.register_client(client, self._rate_limiter_account_id)
         self.boto3_session_map.setdefault("client", {}).setdefault(service, {})[
             region_name
         ] = client
         return client
 
+    @property
+    def _rate_limiter_account_id(self) -> Optional[str]:
+        return getattr(self, "account_id", None) or getattr(
+            self, "org_account_id", None
+        )
+
+    async def _get_aio_client(self, service: str, region_name: str):
+        # aiobotocore clients are bound to the event loop they were created in
+        loop = asyncio.get_running_loop()
+        aio_clients = self.boto3_session_map.setdefault("aio_client", {})
+        aio_client = aio_clients.get((service, region_name))
+        if aio_client and aio_client[0] is loop:
+            return aio_client[1]
+
+        if not any(client_loop is loop for client_loop, _ in aio_clients.values()):
+            # Close the clients of the account once the event loop completes
+            register_loop_cleanup(self.close_aio_clients)
+
+        client = await create_aio_client(
+            await self.get_boto3_session(region_name), service, region_name
+        )
+        aws_rate_limiters.register_client(client, self._rate_limiter_account_id)
+        aio_clients[(service, region_name)] = (loop, client)
+        return client
+
+    async def close_aio_clients(self):
+        if not self.boto3_session_map:
+            return
+
+        loop = asyncio.get_running_loop()
+        for client_loop, client in self.boto3_session_map.pop(
+            "aio_client", {}
+        ).values():
+            if client_loop is loop:
+                await client.close()
+
     async def get_active_regions(self) -> list[str]:
         client = await self.get_boto3_client("ec2")
         res = await boto_crud_call(client.describe_regions)
@@ -315,6 +378,12 @@ class AWSAccount(ProviderChild, BaseAWSAccountAndOrgModel):
     organization: Optional[AWSOrganization if TYPE_CHECKING else Any] = Field(
         None, description="The AWS Organization this account belongs to"
     )  # workaround for generate_docs
+    iam_state_cache: Optional[Any] = Field(
+        None,
+        description="(Auto-populated) The IAM state prefetched for plan/apply",
+        exclude=True,
+        hidden_from_schema=True,
+    )
 
     class Config:
         fields = {"hub_session_info": {"exclude": True}}
@@ -372,7 +441,9 @@ class AWSAccount(ProviderChild, BaseAWSAccountAndOrgModel):
         return session
 
     async def set_identity_center_details(
-        self, set_identity_center_map: bool = True, batch_size: int = 35
+        self,
+        set_identity_center_map: bool = True,
+        batch_size: int = AWS_API_CONCURRENCY,
     ) -> None:
         if self.identity_center_details:
             region = self.identity_center_details.region_name
@@ -540,6 +611,7 @@ class AWSAccount(ProviderChild, BaseAWSAccountAndOrgModel):
         required_exclude = {
             "boto3_session_map",
             "hub_session_info",
+            "iam_state_cache",
             "identity_center_details",
             "organization_account",
             "organization",
@@ -872,12 +944,9 @@ class AWSTemplate(BaseTemplate, ExpiryModel):
         log_params = dict(
             resource_type=self.resource_type, resource_id=self.resource_id
         )
-        relevant_accounts = []
-
-        for account in config.accounts:
-            if evaluate_on_provider(self, account):
-                relevant_accounts.append(account)
-                tasks.append(self._apply_to_account(account, aws_config=config))
+        relevant_accounts = evaluate_on_providers(self, config.accounts)
+        for account in relevant_accounts:
+            tasks.append(self._apply_to_account(account, aws_config=config))
 
         if not relevant_accounts:
             if ctx.execute:
@@ -5,8 +5,6 @@ import os
 from itertools import groupby
 from typing import TYPE_CHECKING, Any, Optional, Union
 
-import aiofiles
-
 from iambic.core import noq_json as json
 from iambic.core.logger import log
 from iambic.core.models import ExecutionMessage
@@ -14,7 +12,7 @@ from iambic.core.template_generation import (
     create_or_update_template,
     delete_orphaned_templates,
 )
-from iambic.core.utils import NoqSemaphore, resource_file_upsert
+from iambic.core.utils import NoqSemaphore, load_resource_file, resource_file_upsert
 from iambic.plugins.v0_1_0.aws.event_bridge.models import (
     SCPMessageDetails as SCPPolicyMessageDetails,
 )
@@ -31,7 +29,11 @@ from iambic.plugins.v0_1_0.aws.organizations.scp.models import (
     ServiceControlPolicyResourceFiles,
 )
 from iambic.plugins.v0_1_0.aws.organizations.scp.utils import get_policy, list_policies
-from iambic.plugins.v0_1_0.aws.utils import get_aws_account_map, process_import_rules
+from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
+    get_aws_account_map,
+    process_import_rules,
+)
 
 if TYPE_CHECKING:
     from iambic.plugins.v0_1_0.aws.iambic_plugin import AWSConfig
@@ -153,7 +155,7 @@ async def collect_aws_scp_policies(
                     existing_template.delete()
 
         generate_scp_resource_files_semaphore = NoqSemaphore(
-            generate_scp_resource_files, 25
+            generate_scp_resource_files, AWS_API_CONCURRENCY
         )
 
         scp_policies: list[
@@ -176,7 +178,7 @@ async def collect_aws_scp_policies(
 
     else:
         generate_scp_resource_files_semaphore = NoqSemaphore(
-            generate_scp_resource_files, 25
+            generate_scp_resource_files, AWS_API_CONCURRENCY
         )
 
         scp_policies: list[
@@ -296,12 +298,9 @@ async def upsert_templated_scp_policies(
 ):
     import_actions = set()
 
-    async with aiofiles.open(policy.get("file_path"), mode="r") as f:
-        content_dict = json.loads(await f.read())
-        # policy = normalize_dict_keys(content_dict)  # type: ignore
-        policy: ServiceControlPolicyItem = ServiceControlPolicyItem.parse_obj(
-            content_dict
-        )
+    content_dict = await load_resource_file(policy.get("file_path"))
+    # policy = normalize_dict_keys(content_dict)  # type: ignore
+    policy: ServiceControlPolicyItem = ServiceControlPolicyItem.parse_obj(content_dict)
 
     file_path = get_template_file_path(
         resource_dir,
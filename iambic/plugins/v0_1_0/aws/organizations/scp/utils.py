@@ -13,7 +13,11 @@ from iambic.core.context import ctx
 from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
 from iambic.core.utils import NoqSemaphore, aio_wrapper, plugin_apply_wrapper
-from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, legacy_paginated_search
+from iambic.plugins.v0_1_0.aws.utils import (
+    AWS_API_CONCURRENCY,
+    boto_crud_call,
+    legacy_paginated_search,
+)
 
 if TYPE_CHECKING:
     from iambic.plugins.v0_1_0.aws.iambic_plugin import AWSConfig
@@ -41,9 +45,13 @@ async def list_policies(
 
     scp_policies = [p for p in scp_policies if p["AwsManaged"] is False]
 
-    list_targets_for_policy_semaphore = NoqSemaphore(list_targets_for_policy, 10)
-    describe_policy_semaphore = NoqSemaphore(get_policy_statements, 10)
-    list_tags_by_policy_semaphore = NoqSemaphore(list_tags_by_policy, 10)
+    list_targets_for_policy_semaphore = NoqSemaphore(
+        list_targets_for_policy, AWS_API_CONCURRENCY
+    )
+    describe_policy_semaphore = NoqSemaphore(get_policy_statements, AWS_API_CONCURRENCY)
+    list_tags_by_policy_semaphore = NoqSemaphore(
+        list_tags_by_policy, AWS_API_CONCURRENCY
+    )
 
     targets = await list_targets_for_policy_semaphore.process(
         [{"client": client, "policyId": policy["Id"]} for policy in scp_policies]
@@ -142,8 +150,12 @@ async def get_policy(client, policyId: str) -> ServiceControlPolicyItem:
 
     policy = await describe_policy(client, policyId)
 
-    list_tags_by_policy_semaphore = NoqSemaphore(list_tags_by_policy, 10)
-    list_targets_for_policy_semaphore = NoqSemaphore(list_targets_for_policy, 10)
+    list_tags_by_policy_semaphore = NoqSemaphore(
+        list_tags_by_policy, AWS_API_CONCURRENCY
+    )
+    list_targets_for_policy_semaphore = NoqSemaphore(
+        list_targets_for_policy, AWS_API_CONCURRENCY
+    )
 
     tags = await list_tags_by_policy_semaphore.process(
         [{"client": client, "policyId": policyId}]
@@ -188,7 +200,9 @@ async def delete_policy(client, policyId: str, *args, **kwargs):
     Before you perform this operation, you must first detach
     the policy from all organizational units (OUs), roots, and accounts.
     """
-    list_targets_for_policy_semaphore = NoqSemaphore(list_targets_for_policy, 10)
+    list_targets_for_policy_semaphore = NoqSemaphore(
+        list_targets_for_policy, AWS_API_CONCURRENCY
+    )
 
     targets = chain.from_iterable(
         await list_targets_for_policy_semaphore.process(
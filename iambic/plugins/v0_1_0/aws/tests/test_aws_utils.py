@@ -1,20 +1,35 @@
 from __future__ import annotations
 
-from unittest import IsolatedAsyncioTestCase, mock
+import asyncio
+import itertools
+from datetime import datetime, timedelta, timezone
+from unittest import IsolatedAsyncioTestCase, mock, skipUnless
 from unittest.mock import MagicMock
 
 import boto3
+import botocore.session
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError
 from botocore.stub import Stubber
-from moto import mock_s3
+from moto import mock_s3, mock_sqs
 
+from iambic.core.aio_utils import run_loop_cleanups
 from iambic.core.iambic_enum import IambicManaged
 from iambic.plugins.v0_1_0.aws.iambic_plugin import AWSConfig
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.utils import (
+    AssumeRoleSessionCache,
+    AWSRateLimiter,
+    AWSRateLimiters,
     boto3_retry,
+    boto_crud_call,
+    consume_sqs_queue,
+    create_aio_client,
     create_assume_role_session,
+    get_async_transport_services,
     get_aws_account_map,
+    is_async_transport_available,
+    paginated_search,
 )
 
 
@@ -102,6 +117,241 @@ class TestAWSUtils(IsolatedAsyncioTestCase):
                         await mock_boto3_function("test-bucket")
 
 
+class TestAsyncTransport(IsolatedAsyncioTestCase):
+    async def test_boto_crud_call_awaits_async_client_methods(self):
+        responses = [
+            ClientError({"Error": {"Code": "Throttling"}}, "list_roles"),
+            {"Roles": [{"RoleName": "role_1"}], "IsTruncated": True, "Marker": "1"},
+            {"Roles": [{"RoleName": "role_2"}], "IsTruncated": False},
+        ]
+        calls = []
+
+        async def list_roles(**kwargs):
+            calls.append(kwargs)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        with mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.is_async_client_method", return_value=True
+        ), mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.aio_wrapper", side_effect=AssertionError
+        ), mock.patch(
+            "asyncio.sleep", new=async_noop
+        ):
+            roles = await paginated_search(list_roles, "Roles", PathPrefix="/")
+
+        self.assertEqual(roles, [{"RoleName": "role_1"}, {"RoleName": "role_2"}])
+        self.assertEqual(
+            calls,
+            [
+                {"PathPrefix": "/"},
+                {"PathPrefix": "/"},
+                {"PathPrefix": "/", "Marker": "1"},
+            ],
+        )
+
+    async def test_get_boto3_client_without_aiobotocore(self):
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="test_account",
+            boto3_session_map={"us-east-1": boto3.Session(region_name="us-east-1")},
+        )
+        with mock.patch(
+            "iambic.plugins.v0_1_0.aws.models.is_async_transport_available",
+            return_value=False,
+        ):
+            client = await aws_account.get_boto3_client("iam", async_transport=True)
+
+        # Falls back to the boto3 client
+        self.assertIs(client, await aws_account.get_boto3_client("iam"))
+
+    async def test_get_boto3_client_async_transport_services(self):
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="test_account",
+            boto3_session_map={"us-east-1": boto3.Session(region_name="us-east-1")},
+            async_transport_services=["iam"],
+        )
+        with mock.patch.object(
+            AWSAccount, "_get_aio_client", return_value="aio_client"
+        ) as get_aio_client, mock.patch(
+            "iambic.plugins.v0_1_0.aws.models.is_async_transport_available",
+            return_value=True,
+        ):
+            self.assertEqual(await aws_account.get_boto3_client("iam"), "aio_client")
+            sso_client = await aws_account.get_boto3_client("sso-admin")
+
+        get_aio_client.assert_awaited_once()
+        self.assertNotEqual(sso_client, "aio_client")
+
+    def test_get_async_transport_services(self):
+        config = AWSConfig(async_transport_services=["iam"])
+        with mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.AWS_ASYNC_TRANSPORT_SERVICES",
+            ["sso-admin", "s3"],
+        ), mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.is_async_transport_available",
+            return_value=True,
+        ):
+            self.assertEqual(get_async_transport_services(config), ["iam", "sso-admin"])
+
+    def test_get_async_transport_services_without_aiobotocore(self):
+        config = AWSConfig(async_transport_services=["iam"])
+        with mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.is_async_transport_available",
+            return_value=False,
+        ):
+            self.assertEqual(get_async_transport_services(config), [])
+
+    def test_aws_config_unsupported_async_transport_service(self):
+        with self.assertRaises(ValueError):
+            AWSConfig(async_transport_services=["s3"])
+
+
+@skipUnless(is_async_transport_available(), "Requires the aiobotocore extra")
+class TestAioClient(IsolatedAsyncioTestCase):
+    async def test_aio_client_crud_call(self):
+        from aiobotocore.client import AioBaseClient
+
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="test_account",
+            boto3_session_map={
+                "us-east-1": boto3.Session(
+                    aws_access_key_id="testing",
+                    aws_secret_access_key="testing",
+                    region_name="us-east-1",
+                )
+            },
+            async_transport_services=["iam"],
+        )
+        iam_client = await aws_account.get_boto3_client("iam")
+        self.assertIsInstance(iam_client, AioBaseClient)
+        # The client is reused within the event loop
+        self.assertIs(iam_client, await aws_account.get_boto3_client("iam"))
+
+        async def make_api_call(operation_name, api_params):
+            return {"Role": {"RoleName": api_params["RoleName"]}}
+
+        with mock.patch.object(
+            iam_client, "_make_api_call", side_effect=make_api_call
+        ), mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.aio_wrapper", side_effect=AssertionError
+        ):
+            response = await boto_crud_call(iam_client.get_role, RoleName="example")
+        self.assertEqual(response, {"Role": {"RoleName": "example"}})
+
+        with mock.patch.object(
+            iam_client, "close", wraps=iam_client.close
+        ) as close_client:
+            await run_loop_cleanups()
+        close_client.assert_awaited_once()
+        self.assertNotIn("aio_client", aws_account.boto3_session_map)
+
+    async def test_aio_client_refreshable_credentials(self):
+        from aiobotocore.credentials import AioRefreshableCredentials
+
+        expiry_time = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata={
+                "access_key": "access_key",
+                "secret_key": "secret_key",
+                "token": "token",
+                "expiry_time": expiry_time.isoformat(),
+            },
+            refresh_using=MagicMock(),
+            method="sts-assume-role",
+        )
+        boto3_session = boto3.Session(region_name="us-east-1")
+        boto3_session._session._credentials = credentials
+
+        iam_client = await create_aio_client(boto3_session, "iam", "us-east-1")
+        try:
+            aio_credentials = iam_client._request_signer._credentials
+            frozen_credentials = await aio_credentials.get_frozen_credentials()
+        finally:
+            await iam_client.close()
+
+        # The credentials are refreshed through the boto3 session credentials
+        self.assertIsInstance(aio_credentials, AioRefreshableCredentials)
+        self.assertEqual(frozen_credentials.access_key, "access_key")
+        self.assertEqual(frozen_credentials.token, "token")
+
+
+class TestAWSRateLimiter(IsolatedAsyncioTestCase):
+    async def test_rate_limiter_aimd(self):
+        rate_limiter = AWSRateLimiter(rate=10, min_rate=1, max_rate=10.5)
+        for _ in range(10):
+            rate_limiter.on_success()
+        self.assertEqual(rate_limiter.rate, 10.5)
+
+        rate_limiter.on_throttle()
+        self.assertEqual(rate_limiter.rate, 5.25)
+        # Throttles from calls made before the decrease are ignored
+        rate_limiter.on_throttle()
+        self.assertEqual(rate_limiter.rate, 5.25)
+
+    async def test_rate_limiter_queues_calls(self):
+        rate_limiter = AWSRateLimiter(rate=2)
+        # The burst is available immediately, subsequent calls wait for a token
+        self.assertEqual(rate_limiter._reserve(), 0)
+        self.assertEqual(rate_limiter._reserve(), 0)
+        self.assertAlmostEqual(rate_limiter._reserve(), 0.5, places=2)
+        self.assertAlmostEqual(rate_limiter._reserve(), 1, places=2)
+
+    async def test_boto_crud_call_uses_account_rate_limiter(self):
+        rate_limiters = AWSRateLimiters()
+        iam_client = boto3.client("iam", region_name="us-east-1")
+        rate_limiters.register_client(iam_client, "123456789012")
+        other_iam_client = boto3.client("iam", region_name="us-east-1")
+        rate_limiters.register_client(other_iam_client, "123456789013")
+
+        rate_limiter = rate_limiters.get(iam_client.get_role)
+        self.assertIs(rate_limiter, rate_limiters.get(iam_client.list_roles))
+        self.assertIsNot(rate_limiter, rate_limiters.get(iam_client.create_role))
+        self.assertIsNot(rate_limiter, rate_limiters.get(other_iam_client.get_role))
+        self.assertIsNone(rate_limiters.get(MagicMock()))
+
+        with Stubber(iam_client) as stubber, mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.aws_rate_limiters", rate_limiters
+        ):
+            stubber.add_client_error("list_roles", service_error_code="Throttling")
+            stubber.add_response("list_roles", {"Roles": []})
+            self.assertEqual(await paginated_search(iam_client.list_roles, "Roles"), [])
+
+        self.assertEqual(rate_limiter.rate, AWSRateLimiter().rate / 2 + 0.1)
+
+
+class TestConsumeSQSQueue(IsolatedAsyncioTestCase):
+    async def test_consume_sqs_queue(self):
+        with mock_sqs():
+            sqs_client = boto3.client("sqs", region_name="us-east-1")
+            queue_url = sqs_client.create_queue(QueueName="test-queue")["QueueUrl"]
+            for elem in range(35):
+                sqs_client.send_message(QueueUrl=queue_url, MessageBody=str(elem))
+
+            processed_messages = []
+
+            def process_message(message: dict):
+                processed_messages.append(message["Body"])
+                if message["Body"] == "0":
+                    raise ValueError("Unprocessable messages are still deleted")
+
+            processed_count = await consume_sqs_queue(
+                sqs_client, queue_url, process_message, 3, wait_time_seconds=0
+            )
+            self.assertEqual(processed_count, 35)
+            self.assertEqual(
+                sorted(processed_messages, key=int), [str(elem) for elem in range(35)]
+            )
+            self.assertNotIn(
+                "Messages",
+                sqs_client.receive_message(QueueUrl=queue_url, WaitTimeSeconds=0),
+            )
+
+
 class TestCreateAssumeRoleSession(IsolatedAsyncioTestCase):
     async def test_create_assume_role_session(self):
         # Set up parameters
@@ -122,7 +372,7 @@ class TestCreateAssumeRoleSession(IsolatedAsyncioTestCase):
             "AccessKeyId": "ACCESS_KEY_ID_123456",
             "SecretAccessKey": "SECRET_KEY",
             "SessionToken": "SESSION_TOKEN",
-            "Expiration": "2022-01-01T00:00:00Z",
+            "Expiration": datetime.now(timezone.utc) + timedelta(hours=1),
         }
         sts_response = {
             "AssumedRoleUser": {
@@ -208,6 +458,118 @@ class TestCreateAssumeRoleSession(IsolatedAsyncioTestCase):
                     session_name,
                 )
 
+    async def test_assume_role_session_cache(self):
+        assume_role_arn = "arn:aws:iam::123456789012:role/TestRole"
+        region_name = "us-east-1"
+        boto3_session = MagicMock()
+        sts_client = boto3.client("sts", region_name=region_name)
+        boto3_session.client.return_value = sts_client
+
+        def sts_response(access_key_id: str, expiration: datetime) -> dict:
+            return {
+                "Credentials": {
+                    "AccessKeyId": access_key_id,
+                    "SecretAccessKey": "SECRET_KEY",
+                    "SessionToken": "SESSION_TOKEN",
+                    "Expiration": expiration,
+                },
+            }
+
+        session_cache = AssumeRoleSessionCache()
+        with Stubber(sts_client) as stubber:
+            # Expires within the refresh window so the first use triggers a refresh
+            stubber.add_response(
+                "assume_role",
+                sts_response(
+                    "ACCESS_KEY_ID_0001",
+                    datetime.now(timezone.utc) + timedelta(minutes=5),
+                ),
+            )
+            stubber.add_response(
+                "assume_role",
+                sts_response(
+                    "ACCESS_KEY_ID_0002",
+                    datetime.now(timezone.utc) + timedelta(hours=1),
+                ),
+            )
+
+            # Concurrent requests share a single assume role call
+            sessions = await asyncio.gather(
+                *[
+                    session_cache.get_session(
+                        boto3_session, assume_role_arn, region_name
+                    )
+                    for _ in range(5)
+                ]
+            )
+            self.assertTrue(all(session is sessions[0] for session in sessions))
+            self.assertIs(
+                await session_cache.get_session(
+                    boto3_session, assume_role_arn, region_name
+                ),
+                sessions[0],
+            )
+            self.assertEqual(session_cache.stats, dict(hits=5, misses=1, refreshes=0))
+
+            credentials = sessions[0].get_credentials().get_frozen_credentials()
+            self.assertEqual(credentials.access_key, "ACCESS_KEY_ID_0002")
+            self.assertEqual(session_cache.refreshes, 1)
+            stubber.assert_no_pending_responses()
+
+    async def test_assume_role_session_cache_source_refresh(self):
+        region_name = "us-east-1"
+        source_access_keys = (f"SOURCE_KEY_{i:04}" for i in itertools.count(2))
+
+        def refresh_source_credentials() -> dict:
+            return {
+                "access_key": next(source_access_keys),
+                "secret_key": "SECRET_KEY",
+                "token": "SESSION_TOKEN",
+                "expiry_time": (
+                    datetime.now(timezone.utc) + timedelta(minutes=5)
+                ).isoformat(),
+            }
+
+        botocore_session = botocore.session.get_session()
+        botocore_session._credentials = RefreshableCredentials.create_from_metadata(
+            metadata={**refresh_source_credentials(), "access_key": "SOURCE_KEY_0001"},
+            refresh_using=refresh_source_credentials,
+            method="sts-assume-role",
+        )
+        source_session = boto3.Session(
+            botocore_session=botocore_session, region_name=region_name
+        )
+        session_cache = AssumeRoleSessionCache()
+        with mock.patch.object(
+            session_cache, "_create_session", side_effect=lambda *args: MagicMock()
+        ) as create_session:
+            hub_session = await session_cache.get_session(
+                source_session, "arn:aws:iam::123456789012:role/Hub", region_name
+            )
+            spoke_session = await session_cache.get_session(
+                hub_session, "arn:aws:iam::123456789012:role/Spoke", region_name
+            )
+            # Refresh the source credentials
+            self.assertNotEqual(
+                source_session.get_credentials().access_key, "SOURCE_KEY_0001"
+            )
+
+            self.assertIs(
+                await session_cache.get_session(
+                    source_session, "arn:aws:iam::123456789012:role/Hub", region_name
+                ),
+                hub_session,
+            )
+            self.assertIs(
+                await session_cache.get_session(
+                    hub_session, "arn:aws:iam::123456789012:role/Spoke", region_name
+                ),
+                spoke_session,
+            )
+
+        self.assertEqual(create_session.call_count, 2)
+        self.assertEqual(len(session_cache._sessions), 2)
+
 
 class TestGetAWSAccountMap(IsolatedAsyncioTestCase):
     async def test_get_aws_account_map(self):
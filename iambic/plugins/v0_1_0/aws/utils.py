@@ -1,20 +1,60 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import re
+import threading
+import time
+import weakref
+from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import boto3
+import botocore.model
+import botocore.session
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError, NoCredentialsError
 
 from iambic.core.iambic_enum import IambicManaged
 from iambic.core.logger import log
 from iambic.core.utils import aio_wrapper, is_regex_match
 
+try:
+    from aiobotocore.client import AioBaseClient
+    from aiobotocore.config import AioConfig
+    from aiobotocore.credentials import AioCredentials, AioRefreshableCredentials
+    from aiobotocore.session import get_session as get_aio_session
+except ImportError:
+    # The async transport is optional, boto3 calls are run in a thread without it
+    get_aio_session = None
+
 if TYPE_CHECKING:
     from iambic.plugins.v0_1_0.aws.iambic_plugin import AWSConfig, ImportAction
 
+# The maximum number of AWS calls to fan out at once.
+# The rate of the calls is controlled by the AWSRateLimiter of the account and service.
+AWS_API_CONCURRENCY = int(os.environ.get("IAMBIC_AWS_API_CONCURRENCY", 50))
+AWS_RATE_LIMIT_INITIAL_RATE = float(
+    os.environ.get("IAMBIC_AWS_RATE_LIMIT_INITIAL_RATE", 10)
+)
+AWS_RATE_LIMIT_MIN_RATE = float(os.environ.get("IAMBIC_AWS_RATE_LIMIT_MIN_RATE", 0.5))
+AWS_RATE_LIMIT_MAX_RATE = float(os.environ.get("IAMBIC_AWS_RATE_LIMIT_MAX_RATE", 100))
+READ_API_PREFIXES = ("describe_", "get_", "head_", "list_", "search_")
+# The number of concurrent long-polling receivers used to drain an SQS queue
+SQS_POLLERS_PER_QUEUE = int(os.environ.get("IAMBIC_SQS_POLLERS_PER_QUEUE", 8))
+SQS_WAIT_TIME_SECONDS = int(os.environ.get("IAMBIC_SQS_WAIT_TIME_SECONDS", 5))
+# The services whose call sites only use their clients through
+# boto_crud_call, paginated_search and legacy_paginated_search.
+ASYNC_TRANSPORT_SUPPORTED_SERVICES = frozenset({"iam", "sso-admin"})
+# A comma separated list of services to call with the async transport.
+# Added to the async_transport_services of the AWS config.
+AWS_ASYNC_TRANSPORT_SERVICES = [
+    service.strip()
+    for service in os.environ.get("IAMBIC_AWS_ASYNC_TRANSPORT_SERVICES", "").split(",")
+    if service.strip()
+]
+
 
 async def process_import_rules(
     config: AWSConfig,
@@ -88,10 +128,120 @@ def calculate_import_preference(existing_template):
     return prefer_templatized
 
 
+class AWSRateLimiter:
+    """
+    A token bucket that paces the calls to an AWS API family.
+
+    The rate is adjusted using additive increase/multiplicative decrease.
+    Every successful call increases the rate by `increase` calls per second
+    and a throttled call halves it.
+    Throttles received within a second of the last decrease are ignored
+    as they are likely from calls that were made before the rate was decreased.
+    """
+
+    def __init__(
+        self,
+        rate: float = AWS_RATE_LIMIT_INITIAL_RATE,
+        min_rate: float = AWS_RATE_LIMIT_MIN_RATE,
+        max_rate: float = AWS_RATE_LIMIT_MAX_RATE,
+        increase: float = 0.1,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._tokens = max(rate, 1)
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning the number of seconds until it is available.
+
+        Tokens can be borrowed from the future so concurrent callers are queued in order
+        without holding a lock across the event loop.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                max(self.rate, 1),
+                self._tokens + (now - self._last_refill) * self.rate,
+            )
+            self._last_refill = now
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        if delay := self._reserve():
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < 1:
+                return
+
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate / 2)
+
+
+class AWSRateLimiters:
+    """
+    The AWSRateLimiter for each account, service and API family.
+
+    AWS throttles each account separately,
+    so the account of a client is registered when it is created.
+    """
+
+    def __init__(self):
+        self._limiters: dict[tuple[str, str, str], AWSRateLimiter] = {}
+        self._client_account_ids = weakref.WeakKeyDictionary()
+
+    def register_client(self, client, account_id: str):
+        self._client_account_ids[client] = account_id
+
+    def get(self, boto_fnc) -> Optional[AWSRateLimiter]:
+        """Return the limiter for the boto3 client method.
+
+        None is returned if boto_fnc is not a method of a boto3 client.
+        """
+        client = getattr(boto_fnc, "__self__", None)
+        operation_name = getattr(boto_fnc, "__name__", None)
+        if not operation_name or not isinstance(
+            getattr(getattr(client, "meta", None), "service_model", None),
+            botocore.model.ServiceModel,
+        ):
+            return None
+
+        api_family = "read" if operation_name.startswith(READ_API_PREFIXES) else "write"
+        key = (
+            self._client_account_ids.get(client),
+            client.meta.service_model.service_name,
+            api_family,
+        )
+        if not (limiter := self._limiters.get(key)):
+            limiter = self._limiters[key] = AWSRateLimiter()
+        return limiter
+
+    def clear(self):
+        self._limiters = {}
+
+
+aws_rate_limiters = AWSRateLimiters()
+
+
 async def boto_crud_call(
     boto_fnc, retryable_errors: list = None, **kwargs
 ) -> Union[list, dict]:
     """Responsible for calls to boto. Adds async support and error handling
+
+    boto_fnc may be a boto3 client method, which is run in a thread,
+    or an async client method (see create_aio_client) which is awaited directly.
+
     :param boto_fnc:
     :param retryable_errors: A list of error codes that should be retried
     :param kwargs: The params to pass to the boto fnc
@@ -105,11 +255,29 @@ async def boto_crud_call(
     else:
         retryable_errors = always_retryable_errors
 
+    is_async_fnc = is_async_client_method(boto_fnc)
+    rate_limiter = aws_rate_limiters.get(boto_fnc)
+
     while True:
         try:
-            return await aio_wrapper(boto_fnc, **kwargs)
+            if rate_limiter:
+                await rate_limiter.acquire()
+            if is_async_fnc:
+                response = await boto_fnc(**kwargs)
+            else:
+                response = await aio_wrapper(boto_fnc, **kwargs)
+            if rate_limiter:
+                rate_limiter.on_success()
+            return response
         except ClientError as err:
             error_code = err.response["Error"]["Code"]
+            is_throttled = rate_limiter and any(
+                throttling_err in error_code
+                for throttling_err in always_retryable_errors
+            )
+            if is_throttled:
+                rate_limiter.on_throttle()
+
             if any(retryable_err in error_code for retryable_err in retryable_errors):
                 if retry_count >= max_attempts:
                     raise
@@ -120,7 +288,9 @@ async def boto_crud_call(
                     api_call=boto_fnc.__name__,
                     remaining_retries=max_attempts - retry_count,
                 )
-                await asyncio.sleep(min(retry_count / 4, 3))
+                if not is_throttled:
+                    # Throttled calls are paced by the rate limiter
+                    await asyncio.sleep(min(retry_count / 4, 3))
                 continue
             elif "AccessDenied" in err.response["Error"]["Code"]:
                 raise
@@ -256,6 +426,86 @@ async def legacy_paginated_search(
             search_kwargs["NextToken"] = response["NextToken"]
 
 
+async def consume_sqs_queue(
+    sqs_client,
+    queue_url: str,
+    process_message: Callable[[dict], Any],
+    pollers: int = None,
+    wait_time_seconds: int = None,
+) -> int:
+    """Drain an SQS queue with concurrent long-polling receivers.
+
+    The blocking SQS calls are run off of the event loop.
+    A received batch is deleted in the background while the next batch is received and processed.
+    Each receiver stops once a long poll returns no messages.
+
+    :param sqs_client: The boto3 SQS client
+    :param queue_url: The url of the queue to drain
+    :param process_message: Called with every received message.
+        Messages are deleted once processed, even if processing raised.
+    :param pollers: The number of concurrent receivers, defaults to SQS_POLLERS_PER_QUEUE
+    :param wait_time_seconds: How long a receive waits for messages to arrive,
+        defaults to SQS_WAIT_TIME_SECONDS
+    :return: The number of messages processed
+    """
+    pollers = pollers or SQS_POLLERS_PER_QUEUE
+    if wait_time_seconds is None:
+        wait_time_seconds = SQS_WAIT_TIME_SECONDS
+
+    processed_message_ids = set()
+
+    async def _poll() -> int:
+        delete_tasks = []
+        processed_count = 0
+
+        while True:
+            response = await aio_wrapper(
+                sqs_client.receive_message,
+                QueueUrl=queue_url,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=wait_time_seconds,
+            )
+            if not (messages := response.get("Messages", [])):
+                break
+
+            delete_entries = {}
+            for message in messages:
+                delete_entries[message["MessageId"]] = {
+                    "Id": message["MessageId"],
+                    "ReceiptHandle": message["ReceiptHandle"],
+                }
+                if message["MessageId"] in processed_message_ids:
+                    # Standard queues deliver at least once, only delete the duplicate
+                    continue
+
+                processed_message_ids.add(message["MessageId"])
+                processed_count += 1
+                try:
+                    process_message(message)
+                except Exception as err:
+                    log.error(
+                        "Unable to process SQS message",
+                        error=str(err),
+                        queue_url=queue_url,
+                        message_id=message["MessageId"],
+                    )
+
+            delete_tasks.append(
+                asyncio.create_task(
+                    aio_wrapper(
+                        sqs_client.delete_message_batch,
+                        QueueUrl=queue_url,
+                        Entries=list(delete_entries.values()),
+                    )
+                )
+            )
+
+        await asyncio.gather(*delete_tasks)
+        return processed_count
+
+    return sum(await asyncio.gather(*[_poll() for _ in range(pollers)]))
+
+
 class RegionName(Enum):
     af_south_1 = "af-south-1"
     ap_east_1 = "ap-east-1"
@@ -332,6 +582,165 @@ async def get_aws_account_map(config: AWSConfig) -> dict:
     return aws_account_map
 
 
+def _get_credential_metadata(credentials: dict) -> dict:
+    expiration = credentials["Expiration"]
+    return dict(
+        access_key=credentials["AccessKeyId"],
+        secret_key=credentials["SecretAccessKey"],
+        token=credentials["SessionToken"],
+        expiry_time=expiration.isoformat()
+        if isinstance(expiration, datetime)
+        else expiration,
+    )
+
+
+class AssumeRoleSessionCache:
+    """
+    Caches the sessions created by assuming into a role.
+
+    Sessions are keyed by the identity of the source session and the assume role params
+    so every hub and spoke role is assumed once per region for the life of the process.
+    The identity is stable across refreshes of the source credentials,
+    see _get_source_identity.
+    Concurrent requests for the same session wait on the in-flight assume role call.
+
+    The credentials of a cached session are refreshed by botocore before they expire
+    using the same params that were used to create the session.
+    """
+
+    def __init__(self):
+        self._sessions: dict[tuple, boto3.Session] = {}
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        # The key of each cached session, used as the identity of sessions assumed from it
+        self._session_keys: weakref.WeakKeyDictionary[
+            boto3.Session, tuple
+        ] = weakref.WeakKeyDictionary()
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _increment(self, counter: str):
+        # Refreshes are performed by botocore in the threads making the boto3 calls
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(hits=self.hits, misses=self.misses, refreshes=self.refreshes)
+
+    def clear(self):
+        self._sessions = {}
+        self._in_flight = {}
+        self._session_keys = weakref.WeakKeyDictionary()
+
+    def _get_source_identity(self, boto3_session) -> tuple:
+        """Identify the source session without the access key of refreshable credentials.
+
+        The access key of refreshable credentials rotates on every refresh
+        which would otherwise assume the role again and orphan the cached session.
+        """
+        if source_key := self._session_keys.get(boto3_session):
+            # e.g. the hub role session
+            return source_key
+
+        source_credentials = boto3_session.get_credentials()
+        if isinstance(source_credentials, RefreshableCredentials):
+            return (
+                getattr(boto3_session, "profile_name", None),
+                source_credentials.method,
+            )
+
+        return (getattr(source_credentials, "access_key", None),)
+
+    def _create_session(
+        self,
+        boto3_session,
+        assume_role_arn: str,
+        region_name: str,
+        external_id: Optional[str],
+        session_name: str,
+    ) -> boto3.Session:
+        sts = boto3_session.client(
+            "sts",
+            endpoint_url=f"https://sts.{region_name}.amazonaws.com",
+            region_name=region_name,
+        )
+        role_params = dict(RoleArn=assume_role_arn, RoleSessionName=session_name)
+        if external_id:
+            role_params["ExternalId"] = external_id
+
+        def refresh_credentials() -> dict:
+            self._increment("refreshes")
+            log.debug("Refreshing assumed role credentials", role_arn=assume_role_arn)
+            return _get_credential_metadata(
+                sts.assume_role(**role_params)["Credentials"]
+            )
+
+        role = sts.assume_role(**role_params)
+        botocore_session = botocore.session.get_session()
+        botocore_session._credentials = RefreshableCredentials.create_from_metadata(
+            metadata=_get_credential_metadata(role["Credentials"]),
+            refresh_using=refresh_credentials,
+            method="sts-assume-role",
+        )
+        return boto3.Session(botocore_session=botocore_session, region_name=region_name)
+
+    async def get_session(
+        self,
+        boto3_session,
+        assume_role_arn: str,
+        region_name: str,
+        external_id: Optional[str] = None,
+        session_name: str = "iambic",
+    ) -> boto3.Session:
+        key = (
+            self._get_source_identity(boto3_session),
+            assume_role_arn,
+            region_name,
+            external_id,
+            session_name,
+        )
+        if session := self._sessions.get(key):
+            self._increment("hits")
+            return session
+
+        loop = asyncio.get_running_loop()
+        if (future := self._in_flight.get(key)) and future.get_loop() is loop:
+            self._increment("hits")
+            # Shielded so a cancelled waiter doesn't cancel the assume role call
+            return await asyncio.shield(future)
+
+        self._increment("misses")
+        future = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            session = await aio_wrapper(
+                self._create_session,
+                boto3_session,
+                assume_role_arn,
+                region_name,
+                external_id,
+                session_name,
+            )
+        except Exception as err:
+            future.set_exception(err)
+            # Mark the exception as retrieved in case there are no waiters
+            future.exception()
+            raise
+        else:
+            self._sessions[key] = session
+            self._session_keys[session] = key
+            future.set_result(session)
+            return session
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+
+assume_role_session_cache = AssumeRoleSessionCache()
+
+
 async def create_assume_role_session(
     boto3_session,
     assume_role_arn: str,
@@ -342,26 +751,108 @@ async def create_assume_role_session(
     if session_name is None:
         session_name = "iambic"
     try:
-        sts = boto3_session.client(
-            "sts",
-            endpoint_url=f"https://sts.{region_name}.amazonaws.com",
-            region_name=region_name,
-        )
-        role_params = dict(RoleArn=assume_role_arn, RoleSessionName=session_name)
-        if external_id:
-            role_params["ExternalId"] = external_id
-        role = await aio_wrapper(sts.assume_role, **role_params)
-        return boto3.Session(
-            region_name=region_name,
-            aws_access_key_id=role["Credentials"]["AccessKeyId"],
-            aws_secret_access_key=role["Credentials"]["SecretAccessKey"],
-            aws_session_token=role["Credentials"]["SessionToken"],
+        return await assume_role_session_cache.get_session(
+            boto3_session,
+            assume_role_arn,
+            region_name,
+            external_id=external_id,
+            session_name=session_name,
         )
     except Exception as err:
         log.error("Failed to assume role", assume_role_arn=assume_role_arn, error=err)
         raise
 
 
+def is_async_transport_available() -> bool:
+    return get_aio_session is not None
+
+
+def get_async_transport_services(config: AWSConfig) -> list[str]:
+    """The services of the config to call with the async transport, see AWSConfig.async_transport_services"""
+    services = set(config.async_transport_services)
+    for service in AWS_ASYNC_TRANSPORT_SERVICES:
+        if service in ASYNC_TRANSPORT_SUPPORTED_SERVICES:
+            services.add(service)
+        else:
+            log.warning(
+                "The async transport is not supported for the service.",
+                service=service,
+                supported_services=sorted(ASYNC_TRANSPORT_SUPPORTED_SERVICES),
+            )
+
+    if services and not is_async_transport_available():
+        log.warning(
+            "The async AWS transport requires aiobotocore. "
+            "Install it with `pip install iambic-core[aiobotocore]`. "
+            "Calls will be run in a thread instead.",
+        )
+        return []
+
+    return sorted(services)
+
+
+def is_async_client_method(boto_fnc) -> bool:
+    return is_async_transport_available() and isinstance(
+        getattr(boto_fnc, "__self__", None), AioBaseClient
+    )
+
+
+async def _get_aio_credentials(credentials):
+    if not isinstance(credentials, RefreshableCredentials):
+        frozen_credentials = credentials.get_frozen_credentials()
+        return AioCredentials(
+            frozen_credentials.access_key,
+            frozen_credentials.secret_key,
+            frozen_credentials.token,
+        )
+
+    async def refresh_credentials() -> dict:
+        # Defer to the boto3 session credentials so there is a single refresh per role
+        frozen_credentials = await aio_wrapper(credentials.get_frozen_credentials)
+        return dict(
+            access_key=frozen_credentials.access_key,
+            secret_key=frozen_credentials.secret_key,
+            token=frozen_credentials.token,
+            expiry_time=credentials._expiry_time.isoformat(),
+        )
+
+    return AioRefreshableCredentials.create_from_metadata(
+        metadata=await refresh_credentials(),
+        refresh_using=refresh_credentials,
+        method=credentials.method,
+    )
+
+
+async def create_aio_client(
+    boto3_session: boto3.Session,
+    service: str,
+    region_name: str,
+    max_pool_connections: int = 50,
+):
+    """Create an aiobotocore client that uses the credentials of the boto3 session.
+
+    The methods of the client can be passed to boto_crud_call, paginated_search
+    and legacy_paginated_search in place of the boto3 client methods.
+    The client is bound to the running event loop and must be closed with client.close().
+    """
+    if not is_async_transport_available():
+        raise RuntimeError(
+            "The async AWS transport requires aiobotocore, install it with `pip install iambic-core[aiobotocore]`"
+        )
+
+    aio_session = get_aio_session()
+    if credentials := boto3_session.get_credentials():
+        aio_session._credentials = await _get_aio_credentials(credentials)
+    client_context = aio_session.create_client(
+        service,
+        region_name=region_name,
+        config=AioConfig(
+            max_pool_connections=max_pool_connections, region_name=region_name
+        ),
+    )
+    return await client_context.__aenter__()
+
+
 def boto3_retry(f):
     async def wrapper(*args, **kwargs):
         max_retries = kwargs.pop("max_retries", 10)
@@ -135,7 +135,7 @@ def format_github_url(repository_url: str, github_token: str) -> str:
 
 
 def prepare_local_repo_for_new_commits(
-    repo_url: str, repo_path: str, purpose: str
+    repo_url: str, repo_path: str, purpose: str, default_branch: str = None
 ) -> Repo:
     if len(os.listdir(repo_path)) > 0:
         raise Exception(f"{repo_path} already exists. This is unexpected.")
@@ -146,21 +146,22 @@ def prepare_local_repo_for_new_commits(
     repo_config_writer.set_value("user", "email", COMMIT_MESSAGE_USER_EMAIL)
     repo_config_writer.release()
 
-    default_branch = get_remote_default_branch(cloned_repo)
+    default_branch = get_remote_default_branch(
+        cloned_repo, default_branch=default_branch
+    )
     cloned_repo.git.checkout("-b", f"attempt/{purpose}", default_branch)
 
     return cloned_repo
 
 
 def is_last_commit_relative_to_absolute_change(
-    repo_url: str, pull_request_branch_name: str
-) -> Repo:
-    repo_path = tempfile.mkdtemp(prefix="github")
-
-    if len(os.listdir(repo_path)) > 0:
-        raise Exception(f"{repo_path} already exists. This is unexpected.")
-    cloned_repo = clone_git_repo(repo_url, repo_path, pull_request_branch_name)
-    return cloned_repo.head.commit.message == COMMIT_MESSAGE_FOR_GIT_APPLY_ABSOLUTE_TIME
+    templates_repo: Repository, pull_request_branch_name: str
+) -> bool:
+    # Only the commit metadata is needed so it is read from the GitHub API instead of a clone
+    last_commit = templates_repo.get_branch(pull_request_branch_name).commit
+    return (
+        last_commit.commit.message.strip() == COMMIT_MESSAGE_FOR_GIT_APPLY_ABSOLUTE_TIME
+    )
 
 
 def prepare_local_repo(
@@ -850,7 +851,7 @@ def handle_detect_changes_from_eventbridge(
 
     repo_name = context["repository"]
     templates_repo = github_client.get_repo(repo_name)
-    default_branch = get_remote_default_branch(templates_repo)
+    default_branch = templates_repo.default_branch
 
     _handle_detect_changes_from_eventbridge(
         repo_url,
@@ -928,7 +929,7 @@ def _handle_detect_changes_from_eventbridge(
 ) -> list[TemplateChangeDetails]:
     try:
         repo = prepare_local_repo_for_new_commits(
-            repo_url, get_lambda_repo_path(), "detect"
+            repo_url, get_lambda_repo_path(), "detect", default_branch=default_branch
         )
 
         config = __get_config()
@@ -979,7 +980,7 @@ def handle_import(github_client: github.Github, context: dict[str, Any]) -> None
     repo_url = format_github_url(repository_url, github_token)
     repo_name = context["repository"]
     templates_repo = github_client.get_repo(repo_name)
-    default_branch = get_remote_default_branch(templates_repo)
+    default_branch = templates_repo.default_branch
     _handle_import(repo_url, default_branch)
 
 
@@ -994,7 +995,9 @@ def _handle_import(
             command=Command.IMPORT,
         )  # type: ignore
         repo_dir = get_lambda_repo_path()
-        repo = prepare_local_repo_for_new_commits(repo_url, repo_dir, "import")
+        repo = prepare_local_repo_for_new_commits(
+            repo_url, repo_dir, "import", default_branch=default_branch
+        )
         config = __get_config()
         asyncio.run(config.run_import(exe_message, repo_dir))
         repo.git.add(".")
@@ -1017,7 +1020,9 @@ def _handle_enforce(
 ) -> list[TemplateChangeDetails]:
     try:
         local_repo_path = get_lambda_repo_path()
-        _ = prepare_local_repo_for_new_commits(repo_url, local_repo_path, "enforce")
+        _ = prepare_local_repo_for_new_commits(
+            repo_url, local_repo_path, "enforce", default_branch=default_branch
+        )
         config = __get_config()
         # we are not restoring teh original ctx because we expect
         # this is called in a completely separate process
@@ -1046,7 +1051,7 @@ def handle_expire(github_client: github.Github, context: dict[str, Any]) -> None
     repo_url = format_github_url(repository_url, github_token)
     repo_name = context["repository"]
     templates_repo = github_client.get_repo(repo_name)
-    default_branch = get_remote_default_branch(templates_repo)
+    default_branch = templates_repo.default_branch
     _handle_expire(repo_url, default_branch)
 
 
@@ -1057,7 +1062,7 @@ def _handle_expire(
 ) -> list[TemplateChangeDetails]:
     try:
         repo = prepare_local_repo_for_new_commits(
-            repo_url, get_lambda_repo_path(), "expire"
+            repo_url, get_lambda_repo_path(), "expire", default_branch=default_branch
         )
 
         run_expire(None, get_lambda_repo_path())
@@ -1078,7 +1083,9 @@ def _handle_expire(
             log_params = {"proposed_changes": lines}
             log.info("handle_expire ran", **log_params)
 
-            default_branch = get_remote_default_branch(repo)
+            default_branch = get_remote_default_branch(
+                repo, default_branch=default_branch
+            )
             repo.remotes.origin.push(
                 refspec=f"HEAD:{default_branch}"
             ).raise_if_error()  # FIXME
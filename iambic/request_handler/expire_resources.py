@@ -1,31 +1,44 @@
 from __future__ import annotations
 
-import asyncio
-from typing import Type
+from typing import Optional, Type
 
 from iambic.core.logger import log
 from iambic.core.models import BaseTemplate
-from iambic.core.parser import load_templates
+from iambic.core.parser import TemplateLoadError, iter_templates
 from iambic.core.utils import remove_expired_resources
 
 
 async def flag_expired_resources(
     template_paths: list[str],
     template_map: dict[str, Type[BaseTemplate]],
-):
+    return_template_paths: Optional[set[str]] = None,
+) -> list[BaseTemplate]:
+    """Remove the expired resources of the templates and write them back to disk.
+
+    :param return_template_paths: The paths of the templates to return as they were written.
+        Every other template is released once it is written.
+    """
     # Warning: The dynamic config must be loaded before this is called.
     #   This is done using iambic.config.dynamic_config.load_config(config_path)
     log.info("Scanning for expired resources")
-    templates = await asyncio.gather(
-        *[
-            remove_expired_resources(
-                template, template.resource_type, template.resource_id
-            )
-            for template in load_templates(template_paths, template_map)
-        ]
-    )
-
-    for template in templates:
+    errors: list[TemplateLoadError] = []
+    written_templates: list[BaseTemplate] = []
+    # Templates are handled as they are parsed so a bad template doesn't block the rest
+    # and only the templates currently being processed are held in memory.
+    for template in iter_templates(template_paths, template_map, ordered=False):
+        if isinstance(template, TemplateLoadError):
+            errors.append(template)
+            continue
+
+        template = await remove_expired_resources(
+            template, template.resource_type, template.resource_id
+        )
         template.write(exclude_none=True, exclude_unset=True, exclude_defaults=True)
+        if return_template_paths and str(template.file_path) in return_template_paths:
+            written_templates.append(template)
+
+    if errors:
+        raise ValueError("\n".join(error.message for error in errors))
 
     log.info("Expired resource scan complete.")
+    return written_templates
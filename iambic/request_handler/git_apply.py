@@ -76,14 +76,22 @@ async def apply_git_changes(
         config.template_map,
     )
 
+    # note modified_templates_exist_in_repo has different entries from create_templates_for_modified_files because
+    # create_templates_for_modified_files actually has two template instance per a single modified file
+    modified_templates_exist_in_repo = load_templates(
+        [git_diff.path for git_diff in file_changes["modified_files"]],
+        config.template_map,
+    )
     modified_templates_doubles = create_templates_for_modified_files(
         config,
         file_changes["modified_files"],
+        modified_templates_exist_in_repo,
     )
 
     # You can only flag expired resources on new/modified-templates
     if not skip_flag_expired_resources_phase:
-        await flag_expired_resources(
+        # Flagging rewrites the modified files so use the versions that were written
+        modified_templates_exist_in_repo = await flag_expired_resources(
             [
                 template.file_path
                 for template in itertools.chain(
@@ -92,6 +100,9 @@ async def apply_git_changes(
                 if os.path.exists(template.file_path)
             ],
             config.template_map,
+            return_template_paths={
+                str(template.file_path) for template in modified_templates_exist_in_repo
+            },
         )
 
     template_changes = await config.run_apply(
@@ -99,12 +110,6 @@ async def apply_git_changes(
         itertools.chain(new_templates, deleted_templates, modified_templates_doubles),
     )
 
-    # note modified_templates_exist_in_repo has different entries from create_templates_for_modified_files because
-    # create_templates_for_modified_files actually has two template instance per a single modified file
-    modified_templates_exist_in_repo = load_templates(
-        [git_diff.path for git_diff in file_changes["modified_files"]],
-        config.template_map,
-    )
     commit_deleted_templates(
         repo_dir, modified_templates_exist_in_repo, template_changes
     )
@@ -4,7 +4,11 @@ import pytest
 import yaml
 
 from iambic.core.context import ctx
-from iambic.core.utils import evaluate_on_provider
+from iambic.core.utils import (
+    evaluate_on_provider,
+    evaluate_on_providers,
+    get_access_rule_matcher,
+)
 from iambic.plugins.v0_1_0.aws.iam.role.models import AwsIamRoleTemplate
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 
@@ -67,3 +71,30 @@ def eval_only_context():
 def test_evaluate_on_account(eval_only_context, resource, aws_account, expected_value):
     value = evaluate_on_provider(resource, aws_account)
     assert value == expected_value
+
+
+def test_evaluate_on_providers(eval_only_context):
+    resource = template_cls(file_path="/dev/null", **template_dict)
+    resource.excluded_accounts = ["regex-excluded*"]
+    aws_accounts = [
+        AWSAccount(account_id=f"12345678901{elem}", account_name=account_name)
+        for elem, account_name in enumerate(
+            ["something", "dev", "regex1", "Regex-Excluded-1", "DEV"]
+        )
+    ]
+
+    relevant_accounts = evaluate_on_providers(resource, aws_accounts)
+    assert [account.account_name for account in relevant_accounts] == [
+        "dev",
+        "regex1",
+        "DEV",
+    ]
+    assert relevant_accounts == [
+        account for account in aws_accounts if evaluate_on_provider(resource, account)
+    ]
+    # The compiled rules are shared across evaluations
+    assert get_access_rule_matcher(resource) is get_access_rule_matcher(resource)
+
+    # Mutating the rules resolves to a new matcher
+    resource.included_accounts.append("something")
+    assert evaluate_on_provider(resource, aws_accounts[0])
@@ -4,7 +4,12 @@ import asyncio
 
 import pytest
 
-from iambic.core.aio_utils import gather_limit
+from iambic.core.aio_utils import (
+    gather_dependency_graph,
+    gather_limit,
+    register_loop_cleanup,
+    run_with_loop_cleanup,
+)
 
 
 @pytest.mark.asyncio
@@ -26,3 +31,66 @@ async def test_gather_limit_cancelled():
         await asyncio.sleep(0.2)
         task.cancel()
         await task
+
+
+@pytest.mark.asyncio
+async def test_gather_dependency_graph():
+    events = []
+    slow_node_done = asyncio.Event()
+
+    def node(name: str, delay: float = 0):
+        async def _node():
+            events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            events.append(f"end {name}")
+            if name == "slow":
+                slow_node_done.set()
+            return name
+
+        return _node
+
+    results = await gather_dependency_graph(
+        node("dependent"),
+        node("policy"),
+        node("slow", 0.2),
+        node("group"),
+        dependencies={0: {1, 3}, 3: {1}},
+        limit=2,
+    )
+    assert results == ["dependent", "policy", "slow", "group"]
+    assert events.index("end policy") < events.index("start group")
+    assert events.index("end group") < events.index("start dependent")
+    # Nodes don't wait on unrelated work
+    assert events.index("end dependent") < events.index("end slow")
+    assert slow_node_done.is_set()
+
+    with pytest.raises(ValueError):
+        await gather_dependency_graph(
+            node("a"), node("b"), dependencies={0: {1}, 1: {0}}
+        )
+
+
+def test_run_with_loop_cleanup():
+    events = []
+
+    async def cleanup():
+        events.append(("cleanup", asyncio.get_running_loop()))
+
+    async def failing_cleanup():
+        raise RuntimeError("cleanup failed")
+
+    async def main():
+        register_loop_cleanup(failing_cleanup)
+        register_loop_cleanup(cleanup)
+        events.append(("main", asyncio.get_running_loop()))
+        return "done"
+
+    assert run_with_loop_cleanup(main()) == "done"
+    assert [event for event, _ in events] == ["main", "cleanup"]
+    # The cleanups run in the loop of the pipeline
+    assert events[0][1] is events[1][1]
+
+    # Cleanups are only run once
+    events.clear()
+    run_with_loop_cleanup(asyncio.sleep(0))
+    assert events == []
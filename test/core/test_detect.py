@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from iambic.core.detect import coalesce_detect_messages
+from iambic.plugins.v0_1_0.aws.event_bridge.models import (
+    ManagedPolicyMessageDetails,
+    RoleMessageDetails,
+)
+
+
+def test_coalesce_detect_messages():
+    messages = [
+        RoleMessageDetails(account_id="111111111111", role_name="role", delete=False),
+        RoleMessageDetails(account_id="111111111111", role_name="other", delete=False),
+        RoleMessageDetails(account_id="222222222222", role_name="role", delete=False),
+        RoleMessageDetails(account_id="111111111111", role_name="role", delete=True),
+        RoleMessageDetails(account_id="111111111111", role_name="role", delete=False),
+        RoleMessageDetails(account_id="111111111111", role_name="other", delete=False),
+    ]
+
+    assert coalesce_detect_messages(messages, "role_name") == [
+        # A delete within the cycle always wins
+        RoleMessageDetails(account_id="111111111111", role_name="role", delete=True),
+        RoleMessageDetails(account_id="111111111111", role_name="other", delete=False),
+        RoleMessageDetails(account_id="222222222222", role_name="role", delete=False),
+    ]
+
+
+def test_coalesce_detect_messages_with_composite_resource_id():
+    messages = [
+        ManagedPolicyMessageDetails(
+            account_id="111111111111",
+            policy_path=path,
+            policy_name="policy",
+            delete=False,
+        )
+        for path in ["/", "/engineering/", "/"]
+    ]
+
+    assert [
+        message.policy_path
+        for message in coalesce_detect_messages(messages, "policy_path", "policy_name")
+    ] == ["/", "/engineering/"]
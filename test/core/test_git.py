@@ -18,13 +18,17 @@ import iambic.plugins.v0_1_0.example
 from iambic.config.dynamic_config import load_config
 from iambic.core.git import (
     GitDiff,
+    clone_git_repo,
     clone_git_repos,
     create_templates_for_deleted_files,
     create_templates_for_modified_files,
+    get_git_repo_mirror_path,
     get_origin_head,
     get_remote_default_branch,
+    retrieve_git_changes,
 )
 from iambic.core.models import BaseTemplate, ConfigMixin
+from iambic.core.parser import load_templates
 from iambic.plugins.v0_1_0.example.local_file.models import (
     ExampleLocalFileMultiAccountTemplate,
     ExampleLocalFileMultiAccountTemplateProperties,
@@ -140,6 +144,64 @@ def test_get_remote_default_branch(repo_with_single_commit: Repo):
     assert remote_branch_name == TEST_TRACKING_BRANCH
 
 
+def test_get_remote_default_branch_without_remote_show(repo_with_single_commit: Repo):
+    repo = repo_with_single_commit
+    with patch.object(git.cmd.Git, "remote", side_effect=AssertionError, create=True):
+        # The default branch provided by the caller is used without contacting the remote
+        assert (
+            get_remote_default_branch(repo, default_branch=TEST_TRACKING_BRANCH)
+            == TEST_TRACKING_BRANCH
+        )
+
+    clone_dir = tempfile.mkdtemp(prefix="iambic_test_temp_templates_directory")
+    try:
+        # Clones know the remote HEAD locally
+        cloned_repo = Repo.clone_from(repo.remotes.origin.url, clone_dir)
+        with patch.object(
+            git.cmd.Git, "remote", side_effect=AssertionError, create=True
+        ):
+            assert get_remote_default_branch(cloned_repo) == TEST_TRACKING_BRANCH
+            # The resolved branch is memoized per repo
+            with patch.object(
+                git.cmd.Git, "symbolic_ref", side_effect=AssertionError, create=True
+            ):
+                assert get_remote_default_branch(cloned_repo) == TEST_TRACKING_BRANCH
+    finally:
+        shutil.rmtree(clone_dir)
+
+
+def test_clone_git_repo_from_cache(repo_with_single_commit: Repo, monkeypatch):
+    remote_url = repo_with_single_commit.remotes.origin.url
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = os.path.join(temp_dir, "cache")
+        monkeypatch.setenv("IAMBIC_GIT_REPO_CACHE_DIR", cache_dir)
+
+        first_clone = clone_git_repo(remote_url, os.path.join(temp_dir, "first"), None)
+        mirror_path = get_git_repo_mirror_path(remote_url, cache_dir)
+        assert os.path.exists(mirror_path)
+        assert first_clone.remotes.origin.url == remote_url
+        assert first_clone.active_branch.name == TEST_TRACKING_BRANCH
+        # The clone borrows its objects from the mirror
+        assert os.path.exists(
+            os.path.join(first_clone.git_dir, "objects", "info", "alternates")
+        )
+
+        # New commits are fetched into the existing mirror
+        with open(f"{repo_with_single_commit.working_dir}/README.md", "w") as f:
+            f.write("update")
+        repo_with_single_commit.git.commit("-am", "Update README.md")
+        repo_with_single_commit.remotes.origin.push()
+        second_clone = clone_git_repo(
+            remote_url, os.path.join(temp_dir, "second"), TEST_TRACKING_BRANCH
+        )
+        assert (
+            second_clone.head.commit.hexsha
+            == repo_with_single_commit.head.commit.hexsha
+        )
+        assert second_clone.remotes.origin.url == remote_url
+        assert os.listdir(cache_dir) == [os.path.basename(mirror_path)]
+
+
 @pytest.fixture(scope="function")
 def git_diff_parameterized(request):
     def fin():
@@ -410,7 +472,7 @@ def test_create_templates_for_deleted_files():
 
         # Mock the yaml.load function
         with patch(
-            "iambic.core.git.yaml.load",
+            "iambic.core.parser.yaml.load",
             side_effect=lambda x: yaml.load(x, Loader=yaml.SafeLoader),
         ):
             # Mock the log.info function
@@ -457,3 +519,66 @@ def test_get_template_map_return_template():
         assert _get_template_map(template_map, template_dict)  # type: ignore
 
         mocked_error.assert_not_called()
+
+
+def test_create_templates_for_modified_files_reuses_loaded_templates(
+    git_diff_parameterized: list[Any],
+    template_mixin_fake,
+):
+    config = template_mixin_fake
+    git_diffs = git_diff_parameterized(TEST_TEMPLATE_MULTI_ACCOUNT_YAML)
+    modified_templates = load_templates(
+        [git_diff.path for git_diff in git_diffs], config.template_map
+    )
+    modified_template = modified_templates[0]
+    included_accounts = list(modified_template.included_accounts)
+
+    with patch("iambic.core.git.load_templates", side_effect=AssertionError):
+        templates: list[BaseTemplate] = create_templates_for_modified_files(
+            config, git_diffs, modified_templates
+        )
+
+    assert templates[0].properties.name == "after"
+    # The templates of the caller are left as they were loaded
+    assert templates[0] is not modified_template
+    assert modified_template.included_accounts == included_accounts
+
+
+@pytest.mark.asyncio
+async def test_retrieve_git_changes(repo_with_single_commit: Repo, template_mixin_fake):
+    repo = repo_with_single_commit
+    repo_dir = repo.working_tree_dir
+    os.makedirs(f"{repo_dir}/{TEST_TEMPLATE_DIR}")
+    template_path = f"{repo_dir}/{TEST_TEMPLATE_PATH}"
+    with open(template_path, "w") as f:
+        f.write(TEST_TEMPLATE_YAML.format(name="before"))
+    repo.git.add(A=True)
+    repo.git.commit(m="Add template")
+    repo.remotes.origin.push()
+    repo.git.remote("set-head", "origin", "-a")
+
+    # Only renamed, which the diff reports as a rename rather than a modification
+    repo.index.move(
+        [template_path, template_path.replace("test_template", "renamed_template")]
+    )
+    # The template_type is past the header
+    with open(f"{repo_dir}/{TEST_TEMPLATE_DIR}/commented_template.yaml", "w") as f:
+        f.write("# comment\n" * 1000 + TEST_TEMPLATE_YAML.format(name="commented"))
+    with open(f"{repo_dir}/{TEST_TEMPLATE_DIR}/not_a_template.yaml", "w") as f:
+        f.write("name: not_a_template\n")
+    repo.git.add(A=True)
+    repo.git.commit(m="Update templates")
+
+    # The remote ref that was last fetched is used
+    with patch.object(
+        type(repo.remotes.origin), "fetch", side_effect=AssertionError
+    ), patch("iambic.core.git.get_remote_default_branch", side_effect=AssertionError):
+        file_changes = await retrieve_git_changes(
+            repo_dir, template_mixin_fake.template_map, fetch=False
+        )
+
+    assert [git_diff.path for git_diff in file_changes["new_files"]] == [
+        f"{repo_dir}/{TEST_TEMPLATE_DIR}commented_template.yaml"
+    ]
+    assert not file_changes["modified_files"]
+    assert not file_changes["deleted_files"]
@@ -5,6 +5,7 @@ import os
 import shutil
 import tempfile
 from datetime import date, datetime, timezone
+from unittest.mock import patch
 
 import git
 import pytest
@@ -13,10 +14,11 @@ from git.diff import Diff
 
 import iambic.plugins.v0_1_0.example
 from iambic.config.dynamic_config import load_config
-from iambic.core.iambic_enum import IambicManaged
-from iambic.core.models import BaseTemplate, ExpiryModel
+from iambic.core.iambic_enum import Command, IambicManaged
+from iambic.core.models import BaseTemplate, ExecutionMessage, ExpiryModel
 from iambic.core.parser import load_templates
 from iambic.core.template_generation import merge_model
+from iambic.core.utils import load_resource_file, resource_staging_store
 
 
 def test_merge_model():
@@ -249,3 +251,32 @@ async def test_get_body(templates_repo: tuple[str, str]):
     assert template_lines[0] == "# comment line 1"
     assert template_lines[1] == "template_type: NOQ::Example::LocalFile"
     assert template_lines[2] == "template_schema_url: test_url"
+
+
+@pytest.mark.asyncio
+async def test_execution_message_checkpoint(tmp_path):
+    with patch("iambic.core.utils.__WRITABLE_DIRECTORY__", str(tmp_path)):
+        exe_message = ExecutionMessage(
+            execution_id="execution_id",
+            command=Command.IMPORT,
+            provider_type="aws",
+            provider_id="123456789012",
+            metadata={"service": "iam"},
+        )
+        resource_path = exe_message.get_file_path(
+            "roles", file_name_and_extension="role.json"
+        )
+        await resource_staging_store.upsert(resource_path, {"RoleName": "role"})
+        assert not exe_message.is_checkpointed("collect_aws_roles")
+
+        await exe_message.set_checkpoint("collect_aws_roles")
+        assert exe_message.is_checkpointed("collect_aws_roles")
+        # Checkpoints are scoped to the provider
+        assert not exe_message.copy(
+            update={"provider_id": "210987654321"}
+        ).is_checkpointed("collect_aws_roles")
+
+        # The staged resources of a checkpointed unit outlive the process
+        resource_staging_store.clear("execution_id")
+        assert os.path.exists(resource_path)
+        assert await load_resource_file(resource_path) == {"RoleName": "role"}
@@ -5,7 +5,9 @@ import os
 import shutil
 import sys
 import tempfile
+import time
 import traceback
+from unittest import mock
 
 import pytest
 
@@ -186,3 +188,122 @@ def test_malformed_yaml(example_test_filesystem):
     assert (
         "ScannerError" in captured_traceback
     )  # checking the underlying raumel info is captured
+
+
+def test_load_template_cache(example_test_filesystem):
+    _, repo_dir = example_test_filesystem
+    cache_dir = f"{repo_dir}/cache"
+    template_path = f"{repo_dir}/{TEST_TEMPLATE_PATH}"
+
+    template_dict = load_template(template_path, cache_dir=cache_dir)
+    assert template_dict["properties"]["name"] == "before"
+    assert os.listdir(cache_dir)
+
+    # Unchanged templates are served from the cache without parsing the yaml
+    with mock.patch("iambic.core.parser.yaml.load", side_effect=AssertionError):
+        cached_template_dict = load_template(template_path, cache_dir=cache_dir)
+    assert cached_template_dict == template_dict
+    assert cached_template_dict.lc.data == template_dict.lc.data
+
+    # A change to the file contents invalidates the cached entry
+    with open(template_path, "w") as f:
+        f.write(TEST_TEMPLATE_YAML.format(name="after"))
+    template_dict = load_template(template_path, cache_dir=cache_dir)
+    assert template_dict["properties"]["name"] == "after"
+
+
+def test_prune_template_cache(example_test_filesystem):
+    from iambic.core.parser import prune_template_cache
+
+    _, repo_dir = example_test_filesystem
+    cache_dir = f"{repo_dir}/cache"
+    template_path = f"{repo_dir}/{TEST_TEMPLATE_PATH}"
+    load_template(template_path, cache_dir=cache_dir)
+    with open(template_path, "w") as f:
+        f.write(TEST_TEMPLATE_YAML.format(name="after"))
+    load_template(template_path, cache_dir=cache_dir)
+
+    cache_paths = [
+        os.path.join(root, file_name)
+        for root, _, file_names in os.walk(cache_dir)
+        for file_name in file_names
+    ]
+    assert len(cache_paths) == 2
+    old_mtime = time.time() - (40 * 24 * 60 * 60)
+    for cache_path in cache_paths:
+        os.utime(cache_path, (old_mtime, old_mtime))
+
+    # A cache hit keeps the entry of the current version
+    load_template(template_path, cache_dir=cache_dir)
+    assert prune_template_cache(cache_dir, max_age_days=30) == 1
+    with mock.patch("iambic.core.parser.yaml.load", side_effect=AssertionError):
+        assert (
+            load_template(template_path, cache_dir=cache_dir)["properties"]["name"]
+            == "after"
+        )
+    assert prune_template_cache(f"{repo_dir}/missing_cache") == 0
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+@pytest.mark.parametrize("use_lambda_pool", [False, True])
+def test_template_parse_executor(monkeypatch, use_lambda_pool):
+    from iambic.core import parser
+    from iambic.vendor.lambda_multiprocessing import Pool as LambdaPool
+
+    if use_lambda_pool:
+        monkeypatch.setattr(parser, "Pool", LambdaPool)
+
+    executor = parser.TemplateParseExecutor(max_workers=2)
+    try:
+        assert executor.submit(_square, 3).result() == 9
+        pool = executor._pool
+        # Results are returned in order regardless of how the work was chunked
+        assert list(executor.map(_square, range(10), chunksize=3)) == [
+            value * value for value in range(10)
+        ]
+        assert list(executor.map(_square, range(10))) == [
+            value * value for value in range(10)
+        ]
+        # The workers are reused across calls
+        assert executor._pool is pool
+        with pytest.raises(TypeError):
+            executor.submit(_square, None).result()
+    finally:
+        executor.shutdown()
+    assert executor._pool is None
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_iter_templates_isolates_errors(example_test_filesystem, ordered):
+    from iambic.core.parser import TemplateLoadError, iter_templates
+
+    config_path, repo_dir = example_test_filesystem
+    config = asyncio.run(load_config(config_path))
+    template_paths = [
+        f"{repo_dir}/{MALFORMED_YAML_PATH}",
+        f"{repo_dir}/{MISSING_REQUIRED_FIELDS_TEMPLATE_PATH}",
+        f"{repo_dir}/{TEST_TEMPLATE_PATH}",
+        # Deleted between gathering and parsing
+        f"{repo_dir}/deleted_template.yaml",
+    ]
+
+    results = list(iter_templates(template_paths, config.template_map, ordered))
+    errors = {
+        result.file_path: result
+        for result in results
+        if isinstance(result, TemplateLoadError)
+    }
+    templates = [
+        result for result in results if not isinstance(result, TemplateLoadError)
+    ]
+
+    assert len(templates) == 1
+    assert templates[0].file_path == f"{repo_dir}/{TEST_TEMPLATE_PATH}"
+    assert set(errors) == {*template_paths[:2], template_paths[3]}
+    assert "ScannerError" in errors[template_paths[0]].message
+    assert "FileNotFoundError" in errors[template_paths[3]].message
+    assert errors[template_paths[1]].hints
+    assert errors[template_paths[1]].template_type == "NOQ::Example::LocalDatabase"
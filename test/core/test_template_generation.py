@@ -2,16 +2,22 @@ from __future__ import annotations
 
 import itertools
 from typing import Optional, Union
+from unittest import mock
 
 import pytest
 from pydantic import Extra
 
-from iambic.core.models import AccessModelMixin, BaseModel
+from iambic.core.models import AccessModelMixin, BaseModel, Variable
 from iambic.core.template_generation import (
+    base_group_dict_attribute,
     base_group_str_attribute,
+    create_or_update_template,
     group_dict_attribute,
     merge_model,
+    templatize_resource,
 )
+from iambic.plugins.v0_1_0.aws.iam.role.models import AwsIamRoleTemplate
+from iambic.plugins.v0_1_0.aws.models import AWSAccount
 
 
 class SampleGroup(BaseModel, AccessModelMixin):
@@ -306,3 +312,186 @@ async def test_base_group_str_attribute_incoming_permutations(aws_accounts: list
         assert account_0_resources[0] in grouped_role_map["prefix-{{var.account_id}}"]
         assert account_2_resources[0] in grouped_role_map["prefix-{{var.account_id}}"]
         assert account_1_resources[0] in grouped_role_map[repeated_literal]
+
+
+def _synthetic_account_resources(
+    account_count: int, resource_type: type
+) -> tuple[dict[str, AWSAccount], list[dict]]:
+    aws_account_map = {}
+    account_resources = []
+    for elem in range(account_count):
+        account_id = str(100000000000 + elem)
+        aws_account_map[account_id] = AWSAccount(
+            account_id=account_id, account_name=f"account_{elem}"
+        )
+        resource_vals = [f"shared_{i}" for i in range(5)] + [
+            f"unique_{elem}_{i}" for i in range(20)
+        ]
+        account_resources.append(
+            {
+                "account_id": account_id,
+                "resources": [
+                    {"resource_val": {"value": resource_val}}
+                    if resource_type == dict
+                    else {"resource_val": resource_val}
+                    for resource_val in resource_vals
+                ],
+            }
+        )
+    return aws_account_map, account_resources
+
+
+class _LookupCountingList(list):
+    """Counts the look-ups of a provider child's resources by position"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookup_count = 0
+
+    def __getitem__(self, item):
+        self.lookup_count += 1
+        return super().__getitem__(item)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource_type", [str, dict])
+async def test_base_group_attribute_scales_linearly(resource_type: type):
+    account_lookups = {}
+    for account_count in [100, 500, 1000]:
+        aws_account_map, account_resources = _synthetic_account_resources(
+            account_count, resource_type
+        )
+        account_resources = _LookupCountingList(account_resources)
+        # Only measure the grouping
+        with mock.patch(
+            "iambic.core.template_generation.templatize_resource",
+            new=lambda provider_child, resource: resource,
+        ):
+            if resource_type == dict:
+                grouped_attributes = await base_group_dict_attribute(
+                    aws_account_map,
+                    account_resources,
+                    "account_id",
+                    "included_accounts",
+                )
+            else:
+                grouped_attributes = await base_group_str_attribute(
+                    aws_account_map, account_resources, "account_id"
+                )
+
+        # Every shared value and every unique value
+        assert len(grouped_attributes) == 5 + (20 * account_count)
+        account_lookups[account_count] = account_resources.lookup_count / account_count
+
+    # Each account is compared with every later account if grouping is quadratic,
+    # so the look-ups per account would grow with the number of accounts (10x at 1000 accounts).
+    assert account_lookups[500] < account_lookups[100] * 1.1
+    assert account_lookups[1000] < account_lookups[100] * 1.1
+
+
+def test_templatize_resource():
+    aws_account = AWSAccount(
+        account_id="123456789012",
+        account_name="Prod Account",
+        variables=[
+            Variable(key="account_id", value="123456789012"),
+            Variable(key="account_name", value="Prod Account"),
+            Variable(key="env", value="account"),
+        ],
+    )
+    resource = {
+        "arn:aws:iam::123456789012:root": [
+            "ProdAccount-role",
+            {"Tags": [{"Key": "env", "Value": "account"}]},
+            12,
+        ],
+    }
+
+    templatized = templatize_resource(aws_account, resource)
+    assert templatized == {
+        "arn:aws:iam::{{var.account_id}}:root": [
+            "{{var.account_name}}-role",
+            {"Tags": [{"Key": "env", "Value": "{{var.env}}"}]},
+            12,
+        ],
+    }
+    # A value is never substituted inside the reference of another variable
+    assert templatize_resource(aws_account, "123456789012") == "{{var.account_id}}"
+    assert resource["arn:aws:iam::123456789012:root"][0] == "ProdAccount-role"
+    # The variables of the account are not sanitized in place
+    assert aws_account.variables[1].value == "Prod Account"
+
+    # The sanitized values are only computed once and reused across resources
+    templatizer = aws_account.variable_templatizers[r"[\w_+=,.@-]"]
+    with mock.patch(
+        "iambic.core.template_generation.sanitize_string", side_effect=AssertionError
+    ):
+        assert templatize_resource(aws_account, ["ProdAccount"]) == [
+            "{{var.account_name}}"
+        ]
+    assert aws_account.variable_templatizers[r"[\w_+=,.@-]"] is templatizer
+
+    # Changing the variables invalidates the cached templatizer
+    aws_account.variables.append(Variable(key="region", value="us-west-2"))
+    assert templatize_resource(aws_account, "us-west-2") == "{{var.region}}"
+    assert "variable_templatizers" not in aws_account.dict()
+
+
+def test_create_or_update_template_skips_unchanged_resources(tmp_path):
+    from iambic.core import template_fingerprint
+
+    repo_dir = tmp_path / "templates"
+    file_path = str(repo_dir / "role.yaml")
+    aws_accounts = [AWSAccount(account_id="123456789012", account_name="example")]
+
+    def _create_or_update_template(description: str, existing_template_map: dict):
+        return create_or_update_template(
+            file_path,
+            existing_template_map,
+            "example_role",
+            AwsIamRoleTemplate,
+            {"identifier": "example_role"},
+            {"role_name": "example_role", "description": description},
+            aws_accounts,
+        )
+
+    with mock.patch(
+        "iambic.core.utils.__WRITABLE_DIRECTORY__", str(tmp_path)
+    ), mock.patch.dict(
+        template_fingerprint._TEMPLATE_FINGERPRINT_STORE_CACHE, clear=True
+    ):
+        fingerprint_store = template_fingerprint.load_template_fingerprint_store(
+            repo_dir
+        )
+        _create_or_update_template("example", {})
+        existing_template_map = {"example_role": AwsIamRoleTemplate.load(file_path)}
+
+        with mock.patch(
+            "iambic.core.template_generation.merge_model", side_effect=AssertionError
+        ):
+            assert (
+                _create_or_update_template("example", existing_template_map)
+                is existing_template_map["example_role"]
+            )
+
+        # A change to the provider resource is merged into the template
+        template = _create_or_update_template("updated", existing_template_map)
+        assert template.properties.description == "updated"
+
+        # So is a template that was edited since the last import
+        with open(file_path, "a") as f:
+            f.write("expires_at: 2099-01-01\n")
+        existing_template_map = {"example_role": AwsIamRoleTemplate.load(file_path)}
+        with mock.patch(
+            "iambic.core.template_generation.merge_model",
+            wraps=merge_model,
+        ) as merge_model_spy:
+            _create_or_update_template("updated", existing_template_map)
+        assert merge_model_spy.called
+
+        # The fingerprints are persisted across imports
+        fingerprint_store.save()
+        reloaded_store = template_fingerprint.TemplateFingerprintStore(repo_dir)
+        reloaded_store.load()
+        assert reloaded_store.entries == fingerprint_store.entries
+        assert list(reloaded_store.entries) == ["role.yaml"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import iambic.core.utils
+from iambic.core import template_index
+from iambic.core.template_index import TemplateIndex, get_template_index
+
+
+@pytest.fixture
+def templates_dir(tmpdir, monkeypatch):
+    monkeypatch.setattr(
+        iambic.core.utils, "__WRITABLE_DIRECTORY__", Path(tmpdir.mkdir("writable"))
+    )
+    monkeypatch.setattr(template_index, "_TEMPLATE_INDEX_CACHE", {})
+    templates_dir = tmpdir.mkdir("templates")
+    templates_dir.join("role.yaml").write(
+        "template_type: NOQ::AWS::IAM::Role\nidentifier: role\n"
+    )
+    templates_dir.mkdir("sub_dir").join("group.yml").write(
+        "template_type: NOQ::Okta::Group\nidentifier: group\n"
+    )
+    templates_dir.join("not_a_template.yaml").write("key: value\n")
+    return templates_dir
+
+
+@pytest.mark.asyncio
+async def test_template_index_filters_by_template_type(templates_dir):
+    index = await get_template_index(str(templates_dir))
+
+    assert set(index.get_template_paths()) == {
+        Path(templates_dir.join("role.yaml")),
+        Path(templates_dir.join("sub_dir", "group.yml")),
+    }
+    assert index.get_template_paths("AWS.*") == [Path(templates_dir.join("role.yaml"))]
+    assert index.entries["role.yaml"]["template_type"] == "NOQ::AWS::IAM::Role"
+    assert index.entries["not_a_template.yaml"]["headers"] == []
+
+
+@pytest.mark.asyncio
+async def test_template_index_only_reads_changed_files(templates_dir):
+    await get_template_index(str(templates_dir))
+
+    # A fresh index loaded from disk should not open any unchanged file
+    template_index._TEMPLATE_INDEX_CACHE.clear()
+    with mock.patch.object(
+        TemplateIndex, "_index_file", side_effect=AssertionError
+    ) as index_file:
+        index = await get_template_index(str(templates_dir))
+        assert len(index.get_template_paths()) == 2
+        index_file.assert_not_called()
+
+    role_path = templates_dir.join("role.yaml")
+    role_path.write("template_type: NOQ::AWS::IAM::Group\nidentifier: group2\n")
+    os.utime(role_path, ns=(0, 0))
+    templates_dir.join("sub_dir", "group.yml").remove()
+
+    index = await get_template_index(str(templates_dir))
+    assert index.get_template_paths() == [Path(role_path)]
+    assert index.entries["role.yaml"]["template_type"] == "NOQ::AWS::IAM::Group"
+
+
+@pytest.mark.asyncio
+async def test_template_index_set_resource_ids(templates_dir):
+    index = await get_template_index(str(templates_dir))
+    template = mock.Mock(
+        file_path=str(templates_dir.join("role.yaml")), resource_id="role"
+    )
+    index.set_resource_ids([template])
+    index.save()
+
+    reloaded_index = TemplateIndex(str(templates_dir))
+    reloaded_index.load()
+    assert reloaded_index.entries["role.yaml"]["resource_id"] == "role"
+
+
+@pytest.mark.asyncio
+async def test_template_index_scans_off_the_event_loop(templates_dir):
+    scan_threads = []
+    scan = TemplateIndex._scan
+
+    def _scan(self):
+        scan_threads.append(threading.get_ident())
+        return scan(self)
+
+    with mock.patch.object(TemplateIndex, "_scan", _scan):
+        index = await get_template_index(str(templates_dir))
+
+    assert len(index.get_template_paths()) == 2
+    assert scan_threads and threading.get_ident() not in scan_threads
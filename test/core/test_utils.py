@@ -9,12 +9,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from stringcase import pascalcase, snakecase
 
-from iambic.core.models import BaseModel
+from iambic.core.models import BaseModel, Variable
 from iambic.core.utils import (
     GlobalRetryController,
+    ResourceStagingStore,
     convert_between_json_and_yaml,
     create_commented_map,
     evaluate_on_provider,
+    get_compiled_template,
+    get_rendered_template_str_value,
     normalize_dict_keys,
     simplify_dt,
     sort_dict,
@@ -420,3 +423,69 @@ def test_evaluate_on_provider_organization_account():
     provider_details.organization_account = True
 
     assert evaluate_on_provider(resource, provider_details)
+
+
+def test_get_rendered_template_str_value():
+    from iambic.plugins.v0_1_0.aws.models import AWSAccount
+
+    aws_account = AWSAccount(
+        account_id="123456789012",
+        account_name="Prod Account",
+        variables=[Variable(key="env", value="prod env")],
+    )
+    template_value = (
+        '{"RoleName": "{{var.account_name}}-{{var.env}}", '
+        '"Arn": "arn:aws:iam::{{var.account_id}}:root"}'
+    )
+
+    get_compiled_template.cache_clear()
+    assert get_rendered_template_str_value(template_value, aws_account) == (
+        '{"RoleName": "ProdAccount-prodenv", "Arn": "arn:aws:iam::123456789012:root"}'
+    )
+    assert get_rendered_template_str_value(
+        template_value, aws_account.copy(update={"account_name": "dev"})
+    ) == ('{"RoleName": "dev-prodenv", "Arn": "arn:aws:iam::123456789012:root"}')
+    # The template is only compiled once across provider children
+    assert get_compiled_template.cache_info().misses == 1
+
+    # Strings without any jinja syntax are returned without rendering
+    with patch(
+        "iambic.core.utils.get_compiled_template", side_effect=AssertionError
+    ), patch("iambic.core.utils.sanitize_string", side_effect=AssertionError):
+        assert (
+            get_rendered_template_str_value('{"RoleName": "static"}', aws_account)
+            == '{"RoleName": "static"}'
+        )
+
+
+@pytest.mark.asyncio
+async def test_resource_staging_store(tmp_path):
+    from iambic.core.context import ctx
+
+    staging_store = ResourceStagingStore()
+    with patch("iambic.core.utils.__WRITABLE_DIRECTORY__", str(tmp_path)):
+        resource_path = tmp_path / ".iambic" / "execution_id" / "role.json"
+        await staging_store.upsert(resource_path, {"RoleName": "role"}, True)
+        await staging_store.upsert(resource_path, {"Tags": []})
+        # Collected resources never touch the disk unless a remote worker needs them
+        assert not resource_path.exists()
+        assert await staging_store.load(resource_path) == {
+            "RoleName": "role",
+            "Tags": [],
+        }
+
+        remote_resource_path = tmp_path / ".iambic" / "remote_id" / "role.json"
+        remote_resource_path.parent.mkdir(parents=True)
+        with patch.object(ctx, "use_remote", True):
+            await staging_store.upsert(
+                remote_resource_path, {"CreateDate": datetime(2023, 1, 1)}, True
+            )
+        assert remote_resource_path.exists()
+
+        staging_store.clear("execution_id")
+        with pytest.raises(FileNotFoundError):
+            await staging_store.load(resource_path)
+        # Resources of other executions are kept
+        assert await staging_store.load(remote_resource_path) == {
+            "CreateDate": "2023-01-01 00:00:00 "
+        }
@@ -22,6 +22,7 @@ from iambic.core.template_generation import (
     get_existing_template_map,
     merge_access_model_list,
 )
+from iambic.core.utils import load_resource_file
 from iambic.plugins.v0_1_0.aws.iam.policy.models import AssumeRolePolicyDocument
 from iambic.plugins.v0_1_0.aws.iam.role.models import AwsIamRoleTemplate, RoleProperties
 from iambic.plugins.v0_1_0.aws.iam.role.template_generation import (
@@ -219,11 +220,9 @@ async def test_set_role_resource_tags(
         EXAMPLE_ROLE_NAME, role_resource_path, mock_aws_account
     )
 
-    with open(role_resource_path, "r") as f:
-        contents = json.load(f)
-        assert contents == {
-            "Tags": [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
-        }
+    assert await load_resource_file(role_resource_path) == {
+        "Tags": [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
+    }
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from unittest import mock
+
+import boto3
+import pytest
+from moto import mock_iam, mock_sts
+
+import iambic.core.utils
+from iambic.core.iambic_enum import Command
+from iambic.core.models import ExecutionMessage
+from iambic.plugins.v0_1_0.aws.iam.group.utils import (
+    get_group,
+    get_group_inline_policies,
+    get_group_managed_policies,
+)
+from iambic.plugins.v0_1_0.aws.iam.policy.utils import get_managed_policy
+from iambic.plugins.v0_1_0.aws.iam.role.utils import (
+    get_role,
+    get_role_inline_policies,
+    get_role_managed_policies,
+    list_role_tags,
+)
+from iambic.plugins.v0_1_0.aws.iam.user.utils import (
+    get_user,
+    get_user_groups,
+    get_user_inline_policies,
+    get_user_managed_policies,
+    list_user_tags,
+)
+from iambic.plugins.v0_1_0.aws.iam.utils import (
+    IAMAccountSnapshot,
+    IAMStateCache,
+    clear_iam_state_caches,
+    get_account_authorization_details,
+    get_account_iam_snapshot,
+    set_account_iam_state_cache,
+)
+from iambic.plugins.v0_1_0.aws.models import AWSAccount
+
+EXAMPLE_NAME = "example_name"
+EXAMPLE_POLICY_DOCUMENT = json.dumps(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {"Effect": "Allow", "Action": "acm:ListCertificates", "Resource": "*"}
+        ],
+    }
+)
+EXAMPLE_ASSUME_ROLE_DOCUMENT = json.dumps(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "ec2.amazonaws.com"},
+                "Action": "sts:AssumeRole",
+            }
+        ],
+    }
+)
+EXAMPLE_TAGS = [{"Key": "test_key", "Value": "test_value"}]
+
+
+@pytest.fixture
+def mock_iam_client():
+    with mock_iam():
+        iam_client = boto3.client("iam")
+        policy_arn = iam_client.create_policy(
+            PolicyName=EXAMPLE_NAME,
+            PolicyDocument=EXAMPLE_POLICY_DOCUMENT,
+            Tags=EXAMPLE_TAGS,
+        )["Policy"]["Arn"]
+        iam_client.create_role(
+            RoleName=EXAMPLE_NAME,
+            AssumeRolePolicyDocument=EXAMPLE_ASSUME_ROLE_DOCUMENT,
+            Tags=EXAMPLE_TAGS,
+        )
+        iam_client.put_role_policy(
+            RoleName=EXAMPLE_NAME,
+            PolicyName=EXAMPLE_NAME,
+            PolicyDocument=EXAMPLE_POLICY_DOCUMENT,
+        )
+        iam_client.attach_role_policy(RoleName=EXAMPLE_NAME, PolicyArn=policy_arn)
+        iam_client.create_group(GroupName=EXAMPLE_NAME)
+        iam_client.put_group_policy(
+            GroupName=EXAMPLE_NAME,
+            PolicyName=EXAMPLE_NAME,
+            PolicyDocument=EXAMPLE_POLICY_DOCUMENT,
+        )
+        iam_client.attach_group_policy(GroupName=EXAMPLE_NAME, PolicyArn=policy_arn)
+        iam_client.create_user(UserName=EXAMPLE_NAME, Tags=EXAMPLE_TAGS)
+        iam_client.put_user_policy(
+            UserName=EXAMPLE_NAME,
+            PolicyName=EXAMPLE_NAME,
+            PolicyDocument=EXAMPLE_POLICY_DOCUMENT,
+        )
+        iam_client.attach_user_policy(UserName=EXAMPLE_NAME, PolicyArn=policy_arn)
+        iam_client.add_user_to_group(GroupName=EXAMPLE_NAME, UserName=EXAMPLE_NAME)
+        yield iam_client
+
+
+def _inline_policies(policies: dict) -> list[dict]:
+    # The shape written by set_*_resource_inline_policies
+    for policy_name, policy in policies.items():
+        policy["policy_name"] = policy_name
+    return list(policies.values())
+
+
+@pytest.mark.asyncio
+async def test_iam_account_snapshot_matches_per_resource_calls(mock_iam_client):
+    snapshot = IAMAccountSnapshot(
+        await get_account_authorization_details(mock_iam_client)
+    )
+
+    assert snapshot.get_role_resource_attributes(EXAMPLE_NAME) == {
+        "Tags": await list_role_tags(EXAMPLE_NAME, mock_iam_client),
+        "InlinePolicies": _inline_policies(
+            await get_role_inline_policies(EXAMPLE_NAME, mock_iam_client)
+        ),
+        "ManagedPolicies": await get_role_managed_policies(
+            EXAMPLE_NAME, mock_iam_client
+        ),
+    }
+    assert snapshot.get_user_resource_attributes(EXAMPLE_NAME) == {
+        "Tags": await list_user_tags(EXAMPLE_NAME, mock_iam_client),
+        "InlinePolicies": _inline_policies(
+            await get_user_inline_policies(EXAMPLE_NAME, mock_iam_client)
+        ),
+        "ManagedPolicies": await get_user_managed_policies(
+            EXAMPLE_NAME, mock_iam_client
+        ),
+        "Groups": await get_user_groups(EXAMPLE_NAME, mock_iam_client),
+    }
+    assert snapshot.get_group_resource_attributes(EXAMPLE_NAME) == {
+        "InlinePolicies": _inline_policies(
+            await get_group_inline_policies(EXAMPLE_NAME, mock_iam_client)
+        ),
+        "ManagedPolicies": await get_group_managed_policies(
+            EXAMPLE_NAME, mock_iam_client
+        ),
+    }
+
+    policy_arn = list(snapshot.managed_policies.keys())[0]
+    managed_policy = await get_managed_policy(mock_iam_client, policy_arn)
+    snapshot_managed_policy = snapshot.get_managed_policy(policy_arn)
+    assert "Tags" not in snapshot_managed_policy
+    for key in ["PolicyName", "Arn", "Path", "PolicyDocument"]:
+        assert snapshot_managed_policy[key] == managed_policy[key]
+
+    assert snapshot.get_role_resource_attributes("missing_role") is None
+
+
+@pytest.mark.asyncio
+async def test_get_account_iam_snapshot_is_shared_across_collectors(
+    mock_iam_client,
+):
+    with mock_sts(), tempfile.TemporaryDirectory() as writable_dir, mock.patch.object(
+        iambic.core.utils, "__WRITABLE_DIRECTORY__", writable_dir
+    ):
+        exe_message = ExecutionMessage(
+            execution_id="fake_execution_id", command=Command.IMPORT
+        )
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="example_account",
+            hub_role_arn="arn:aws:iam::123456789012:role/example-hub-role",
+            spoke_role_arn="arn:aws:iam::123456789012:role/example-spoke-role",
+        )
+
+        snapshot = await get_account_iam_snapshot(exe_message, aws_account)
+        assert list(snapshot.roles.keys()) == [EXAMPLE_NAME]
+        assert os.path.exists(
+            os.path.join(
+                exe_message.get_directory(aws_account.account_id, "iam"),
+                "authorization_details.json",
+            )
+        )
+
+        # Subsequent collectors in the same execution read the snapshot from disk
+        with mock.patch(
+            "iambic.plugins.v0_1_0.aws.iam.utils.get_account_authorization_details",
+            side_effect=AssertionError,
+        ):
+            cached_snapshot = await get_account_iam_snapshot(exe_message, aws_account)
+        assert list(cached_snapshot.users.keys()) == [EXAMPLE_NAME]
+        assert cached_snapshot.get_group_resource_attributes(
+            EXAMPLE_NAME
+        ) == snapshot.get_group_resource_attributes(EXAMPLE_NAME)
+
+
+@pytest.mark.asyncio
+async def test_iam_state_cache_matches_per_resource_calls(mock_iam_client):
+    with mock_sts():
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="example_account",
+            hub_role_arn="arn:aws:iam::123456789012:role/example-hub-role",
+            spoke_role_arn="arn:aws:iam::123456789012:role/example-spoke-role",
+        )
+        await set_account_iam_state_cache(aws_account)
+        policy_arn = f"arn:aws:iam::{aws_account.account_id}:policy/{EXAMPLE_NAME}"
+
+        with mock.patch.object(
+            mock_iam_client, "get_role", side_effect=AssertionError
+        ), mock.patch.object(
+            mock_iam_client, "get_user", side_effect=AssertionError
+        ), mock.patch.object(
+            mock_iam_client, "get_group", side_effect=AssertionError
+        ), mock.patch.object(
+            mock_iam_client, "get_policy", side_effect=AssertionError
+        ):
+            cached_role = await get_role(
+                EXAMPLE_NAME, mock_iam_client, aws_account=aws_account
+            )
+            cached_user = await get_user(
+                EXAMPLE_NAME, mock_iam_client, aws_account=aws_account
+            )
+            cached_group = await get_group(
+                EXAMPLE_NAME, mock_iam_client, aws_account=aws_account
+            )
+            cached_policy = await get_managed_policy(
+                mock_iam_client, policy_arn, aws_account=aws_account
+            )
+            # Resources missing from the prefetched state don't exist
+            assert (
+                await get_role("missing_role", mock_iam_client, aws_account=aws_account)
+                == {}
+            )
+
+        # The cache is read once, subsequent lookups go to AWS
+        assert cached_role == await get_role(
+            EXAMPLE_NAME, mock_iam_client, aws_account=aws_account
+        )
+        assert cached_user == await get_user(
+            EXAMPLE_NAME, mock_iam_client, aws_account=aws_account
+        )
+        assert cached_group == await get_group(
+            EXAMPLE_NAME, mock_iam_client, aws_account=aws_account
+        )
+        policy = await get_managed_policy(
+            mock_iam_client, policy_arn, aws_account=aws_account
+        )
+        for key in ["PolicyName", "Arn", "Path", "PolicyDocument", "Tags"]:
+            assert cached_policy[key] == policy[key]
+
+        clear_iam_state_caches([aws_account])
+        assert aws_account.iam_state_cache is None
+
+
+def test_iam_state_cache_is_case_insensitive():
+    role = {"RoleName": "ExampleRole"}
+    iam_state_cache = IAMStateCache({"role": {"ExampleRole": role}})
+
+    assert iam_state_cache.get("role", "examplerole") == role
+    # The resource was already retrieved under a different casing
+    assert iam_state_cache.get("role", "EXAMPLEROLE") is None
+    assert iam_state_cache.get("role", "ExampleRole") is None
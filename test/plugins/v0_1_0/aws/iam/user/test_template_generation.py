@@ -19,6 +19,7 @@ import iambic
 from iambic.core.iambic_enum import Command
 from iambic.core.models import ExecutionMessage
 from iambic.core.template_generation import get_existing_template_map
+from iambic.core.utils import load_resource_file
 from iambic.plugins.v0_1_0.aws.iam.user.template_generation import (
     collect_aws_users,
     generate_account_user_resource_files,
@@ -141,11 +142,9 @@ async def test_set_user_resource_tags(
     )
     await set_user_resource_tags(EXAMPLE_USERNAME, user_resource_path, mock_aws_account)
 
-    with open(user_resource_path, "r") as f:
-        contents = json.load(f)
-        assert contents == {
-            "Tags": [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
-        }
+    assert await load_resource_file(user_resource_path) == {
+        "Tags": [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
+    }
 
 
 @pytest.mark.asyncio
@@ -4,7 +4,6 @@ import json
 import os
 import shutil
 import tempfile
-from contextlib import asynccontextmanager
 from test.plugins.v0_1_0.aws.iam.policy.test_utils import (
     EXAMPLE_TAG_KEY,
     EXAMPLE_TAG_VALUE,
@@ -279,32 +278,20 @@ def test_get_template_permission_set_file_path():
     )
 
 
-class MockAioFilesOpen:
-    def __init__(self, content):
-        self.content = content
+def mock_load_resource_file(content):
+    async def _load_resource_file(file_path):
+        return json.loads(json.dumps(content))
 
-    async def read(self):
-        return json.dumps(self.content)
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
+    return _load_resource_file
 
 
 @pytest.mark.asyncio
 async def test_create_templated_permission_set(
     permission_set_refs, permission_set_content, aws_account_map
 ):
-    @asynccontextmanager
-    async def mock_aiofiles_open(file_path, mode):
-        content = permission_set_content  # Replace with your test data
-        yield MockAioFilesOpen(content)
-
     with patch(
-        "iambic.plugins.v0_1_0.aws.identity_center.permission_set.template_generation.aiofiles.open",
-        new=mock_aiofiles_open,
+        "iambic.plugins.v0_1_0.aws.identity_center.permission_set.template_generation.load_resource_file",
+        new=mock_load_resource_file(permission_set_content),
     ):
         # Mock other methods used in the function
         calculate_import_preference = MagicMock(return_value=True)
@@ -515,15 +502,9 @@ async def test_create_templated_permission_set_import_rules(
         },
     ]
     for test_rule in test_rules:
-
-        @asynccontextmanager
-        async def mock_aiofiles_open(file_path, mode):
-            content = permission_set_content  # Replace with your test data
-            yield MockAioFilesOpen(content)
-
         with patch(
-            "iambic.plugins.v0_1_0.aws.identity_center.permission_set.template_generation.aiofiles.open",
-            new=mock_aiofiles_open,
+            "iambic.plugins.v0_1_0.aws.identity_center.permission_set.template_generation.load_resource_file",
+            new=mock_load_resource_file(permission_set_content),
         ):
             # Mock other methods used in the function
             calculate_import_preference = MagicMock(return_value=True)
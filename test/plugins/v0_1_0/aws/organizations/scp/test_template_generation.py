@@ -13,6 +13,7 @@ from unittest.mock import MagicMock
 import pytest
 
 import iambic.plugins.v0_1_0.aws.organizations.scp.template_generation as template_generation
+from iambic.core.utils import load_resource_file
 from iambic.plugins.v0_1_0.aws.event_bridge.models import (
     SCPMessageDetails as SCPPolicyMessageDetails,
 )
@@ -252,9 +253,10 @@ async def test_generate_scp_resource_files(
     resource_files = await generate_scp_resource_files(exe_message, aws_account)
 
     assert len(resource_files.get("policies")) == 1
-    with open(resource_files.get("policies")[0].get("file_path"), "r") as f:
-        output = json.load(f)
-        assert output.get("Id") == data[-1].get("Id")
+    output = await load_resource_file(
+        resource_files.get("policies")[0].get("file_path")
+    )
+    assert output.get("Id") == data[-1].get("Id")
 
 
 @pytest.mark.asyncio
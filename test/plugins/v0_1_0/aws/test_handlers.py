@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+from unittest import mock
+
+import boto3
+import pytest
+from moto import mock_iam, mock_sqs, mock_sts
+
+from iambic.core.context import ctx
+from iambic.core.iambic_enum import Command
+from iambic.core.models import ExecutionMessage
+from iambic.plugins.v0_1_0.aws.handlers import (
+    apply_iam_templates,
+    detect_changes,
+    get_template_dependencies,
+    import_service_resources,
+)
+from iambic.plugins.v0_1_0.aws.iam.group.models import AwsIamGroupTemplate
+from iambic.plugins.v0_1_0.aws.iam.policy.models import AwsIamManagedPolicyTemplate
+from iambic.plugins.v0_1_0.aws.iam.role.models import AwsIamRoleTemplate
+from iambic.plugins.v0_1_0.aws.iam.user.models import AwsIamUserTemplate
+from iambic.plugins.v0_1_0.aws.iam.utils import wait_for_iam_resource
+from iambic.plugins.v0_1_0.aws.iambic_plugin import AWSConfig
+from iambic.plugins.v0_1_0.aws.identity_center.permission_set.models import (
+    AwsIdentityCenterPermissionSetTemplate,
+)
+from iambic.plugins.v0_1_0.aws.models import AWSAccount
+
+
+@pytest.mark.asyncio
+async def test_apply_iam_templates_waits_for_created_prerequisites():
+    with mock_iam(), mock_sts(), tempfile.TemporaryDirectory() as repo_dir:
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="example_account",
+            hub_role_arn="arn:aws:iam::123456789012:role/example-hub-role",
+            spoke_role_arn="arn:aws:iam::123456789012:role/example-spoke-role",
+        )
+        config = AWSConfig(accounts=[aws_account])
+        policy_template = AwsIamManagedPolicyTemplate(
+            identifier="example_policy",
+            file_path=os.path.join(repo_dir, "policy.yaml"),
+            properties={
+                "policy_name": "example_policy",
+                "policy_document": {
+                    "version": "2012-10-17",
+                    "statement": [
+                        {
+                            "effect": "Allow",
+                            "action": ["s3:ListBucket"],
+                            "resource": "*",
+                        }
+                    ],
+                },
+            },
+        )
+        group_template = AwsIamGroupTemplate(
+            identifier="example_group",
+            file_path=os.path.join(repo_dir, "group.yaml"),
+            properties={
+                "group_name": "example_group",
+                "managed_policies": [
+                    {"policy_arn": "arn:aws:iam::123456789012:policy/example_policy"}
+                ],
+            },
+        )
+        user_template = AwsIamUserTemplate(
+            identifier="example_user",
+            file_path=os.path.join(repo_dir, "user.yaml"),
+            properties={
+                "user_name": "example_user",
+                "groups": [{"group_name": "example_group"}],
+            },
+        )
+
+        with mock.patch.object(ctx, "eval_only", False), mock.patch(
+            "iambic.plugins.v0_1_0.aws.iam.utils.wait_for_iam_resource",
+            wraps=wait_for_iam_resource,
+        ) as wait_for_iam_resource_spy:
+            template_changes = await apply_iam_templates(
+                None, config, [user_template, group_template, policy_template]
+            )
+
+        assert len(template_changes) == 3
+        # Only the resources created in this run are polled
+        assert sorted(
+            call.args[0].__name__ for call in wait_for_iam_resource_spy.call_args_list
+        ) == ["get_group", "get_policy"]
+        iam_client = boto3.client("iam")
+        assert [
+            group["GroupName"]
+            for group in iam_client.list_groups_for_user(UserName="example_user")[
+                "Groups"
+            ]
+        ] == ["example_group"]
+
+
+def test_get_template_dependencies():
+    config = AWSConfig(
+        accounts=[AWSAccount(account_id="123456789012", account_name="example_account")]
+    )
+    policy_arn = "arn:aws:iam::{{var.account_id}}:policy/example_policy"
+    templates = [
+        AwsIamUserTemplate(
+            identifier="example_user",
+            file_path="user.yaml",
+            properties={
+                "user_name": "example_user",
+                "groups": [{"group_name": "example_group"}],
+            },
+        ),
+        AwsIamRoleTemplate(
+            identifier="example_role",
+            file_path="role.yaml",
+            properties={
+                "role_name": "example_role",
+                "permissions_boundary": {"policy_arn": policy_arn},
+            },
+        ),
+        AwsIamGroupTemplate(
+            identifier="example_group",
+            file_path="group.yaml",
+            properties={
+                "group_name": "example_group",
+                "managed_policies": [{"policy_arn": policy_arn}],
+            },
+        ),
+        AwsIamManagedPolicyTemplate(
+            identifier="example_policy",
+            file_path="policy.yaml",
+            properties={
+                "policy_name": "example_policy",
+                "policy_document": {"statement": []},
+            },
+        ),
+        AwsIamRoleTemplate(
+            identifier="unrelated_role",
+            file_path="unrelated_role.yaml",
+            properties={
+                "role_name": "unrelated_role",
+                "managed_policies": [{"policy_arn": f"{policy_arn}_v2"}],
+            },
+        ),
+        AwsIdentityCenterPermissionSetTemplate(
+            identifier="example_permission_set",
+            file_path="permission_set.yaml",
+            properties={
+                "name": "example_permission_set",
+                "customer_managed_policy_references": [{"name": "example_policy"}],
+            },
+        ),
+    ]
+
+    assert get_template_dependencies(config, templates) == {
+        0: {2},
+        1: {3},
+        2: {3},
+        5: {3},
+    }
+    # Without a managed policy or group to wait on everything runs concurrently
+    assert not get_template_dependencies(config, [templates[1], templates[4]])
+
+
+def _cloudtrail_event(role_name: str, event_name: str = "DeleteRole") -> str:
+    return json.dumps(
+        {
+            "detail": {
+                "userIdentity": {
+                    "principalId": "AROAEXAMPLE:someone@example.com",
+                    "sessionContext": {
+                        "sessionIssuer": {
+                            "arn": "arn:aws:iam::123456789012:role/someone"
+                        }
+                    },
+                },
+                "recipientAccountId": "123456789012",
+                "eventName": event_name,
+                "eventSource": "iam.amazonaws.com",
+                "requestParameters": {"roleName": role_name},
+                "responseElements": None,
+            }
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_detect_changes_drains_queues_concurrently():
+    with mock_sqs(), mock_sts(), tempfile.TemporaryDirectory() as repo_dir:
+        aws_account = AWSAccount(
+            account_id="123456789012",
+            account_name="example_account",
+            hub_role_arn="arn:aws:iam::123456789012:role/example-hub-role",
+            spoke_role_arn="arn:aws:iam::123456789012:role/example-spoke-role",
+        )
+        sqs_client = boto3.client("sqs", region_name="us-east-1")
+        queue_arns = []
+        for queue_elem in range(2):
+            queue_url = sqs_client.create_queue(QueueName=f"queue-{queue_elem}")[
+                "QueueUrl"
+            ]
+            queue_arns.append(f"arn:aws:sqs:us-east-1:123456789012:queue-{queue_elem}")
+            for role_elem in range(15):
+                sqs_client.send_message(
+                    QueueUrl=queue_url,
+                    MessageBody=_cloudtrail_event(f"role-{queue_elem}-{role_elem}"),
+                )
+                # Repeated events for a resource are collapsed to a single fetch
+                sqs_client.send_message(
+                    QueueUrl=queue_url,
+                    MessageBody=_cloudtrail_event(
+                        f"role-{queue_elem}-{role_elem}", "TagRole"
+                    ),
+                )
+            sqs_client.send_message(QueueUrl=queue_url, MessageBody="not json")
+        config = AWSConfig(
+            accounts=[aws_account], sqs_cloudtrail_changes_queues=queue_arns
+        )
+
+        with mock.patch(
+            "iambic.plugins.v0_1_0.aws.handlers.get_existing_template_map",
+            new=mock.AsyncMock(return_value={}),
+        ), mock.patch(
+            "iambic.plugins.v0_1_0.aws.handlers.collect_aws_roles",
+            new=mock.AsyncMock(),
+        ) as collect_aws_roles, mock.patch(
+            "iambic.plugins.v0_1_0.aws.handlers.generate_aws_role_templates",
+            new=mock.AsyncMock(),
+        ), mock.patch(
+            "iambic.plugins.v0_1_0.aws.utils.SQS_WAIT_TIME_SECONDS", 0
+        ):
+            commit_message = await detect_changes(config, repo_dir)
+
+        role_messages = collect_aws_roles.call_args.args[-1]
+        assert sorted(role_message.role_name for role_message in role_messages) == (
+            sorted(
+                f"role-{queue_elem}-{role_elem}"
+                for queue_elem in range(2)
+                for role_elem in range(15)
+            )
+        )
+        # The TagRole events are coalesced into the DeleteRole of each role
+        assert all(role_message.delete for role_message in role_messages)
+        assert commit_message.count("performed action DeleteRole") == 30
+        assert commit_message.count("performed action TagRole") == 30
+        for queue_elem in range(2):
+            queue_url = sqs_client.get_queue_url(QueueName=f"queue-{queue_elem}")[
+                "QueueUrl"
+            ]
+            assert "Messages" not in sqs_client.receive_message(
+                QueueUrl=queue_url, WaitTimeSeconds=0
+            )
+
+
+@pytest.mark.asyncio
+async def test_import_service_resources_resumes_from_checkpoints(tmp_path):
+    collected_accounts = []
+    interrupted_accounts = set()
+
+    async def collect_example_resources(
+        exe_message, config, existing_template_map, detect_messages
+    ):
+        if exe_message.provider_id in interrupted_accounts:
+            interrupted_accounts.remove(exe_message.provider_id)
+            # Fail once the collection of the other account has been checkpointed
+            other_message = exe_message.copy(update={"provider_id": "123456789012"})
+            while not other_message.is_checkpointed("collect_example_resources"):
+                await asyncio.sleep(0.01)
+            raise RuntimeError("Interrupted")
+        collected_accounts.append(exe_message.provider_id)
+
+    async def generate_example_templates(*args, **kwargs):
+        pass
+
+    config = AWSConfig(
+        accounts=[
+            AWSAccount(account_id="123456789012", account_name="example_account"),
+            AWSAccount(account_id="210987654321", account_name="other_account"),
+        ]
+    )
+    exe_message = ExecutionMessage(
+        execution_id="execution_id", command=Command.IMPORT, checkpoint=True
+    )
+    with mock.patch("iambic.core.utils.__WRITABLE_DIRECTORY__", str(tmp_path)):
+        # Collections are only checkpointed when checkpointing is enabled
+        await import_service_resources(
+            exe_message.copy(update={"checkpoint": False}),
+            config,
+            str(tmp_path),
+            "example",
+            [collect_example_resources],
+            [generate_example_templates],
+        )
+        assert sorted(collected_accounts) == ["123456789012", "210987654321"]
+        assert not os.path.exists(
+            os.path.join(tmp_path, ".iambic", "execution_id", "checkpoints")
+        )
+        interrupted_accounts.add("210987654321")
+        collected_accounts.clear()
+
+        import_args = [
+            exe_message,
+            config,
+            str(tmp_path),
+            "example",
+            [collect_example_resources],
+            [generate_example_templates],
+        ]
+        with pytest.raises(RuntimeError):
+            await import_service_resources(*import_args)
+        assert collected_accounts == ["123456789012"]
+
+        # Only the interrupted account is collected again
+        await import_service_resources(*import_args)
+        assert collected_accounts == ["123456789012", "210987654321"]
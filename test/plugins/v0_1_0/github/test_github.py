@@ -14,6 +14,7 @@ from cryptography.hazmat.primitives.asymmetric import ec
 from iambic.core.utils import jws_encode_with_past_time
 from iambic.plugins.v0_1_0.github.github import (
     BODY_MAX_LENGTH,
+    COMMIT_MESSAGE_FOR_GIT_APPLY_ABSOLUTE_TIME,
     MERGEABLE_STATE_BLOCKED,
     MERGEABLE_STATE_CLEAN,
     HandleIssueCommentReturnCode,
@@ -23,6 +24,7 @@ from iambic.plugins.v0_1_0.github.github import (
     get_session_name,
     handle_issue_comment,
     handle_pull_request,
+    is_last_commit_relative_to_absolute_change,
     maybe_merge,
 )
 from iambic.plugins.v0_1_0.github.iambic_plugin import GithubBotApprover
@@ -304,6 +306,17 @@ def test_format_github_url():
     assert url == expected_url
 
 
+def test_is_last_commit_relative_to_absolute_change():
+    templates_repo = MagicMock()
+    branch_commit = templates_repo.get_branch.return_value.commit
+    branch_commit.commit.message = COMMIT_MESSAGE_FOR_GIT_APPLY_ABSOLUTE_TIME
+    assert is_last_commit_relative_to_absolute_change(templates_repo, "fake-branch")
+    templates_repo.get_branch.assert_called_with("fake-branch")
+
+    branch_commit.commit.message = "Add new role"
+    assert not is_last_commit_relative_to_absolute_change(templates_repo, "fake-branch")
+
+
 @pytest.fixture
 def pull_request_context():
     return {
@@ -4,6 +4,7 @@ import asyncio
 import os
 import shutil
 import tempfile
+from unittest import mock
 
 import git
 import pytest
@@ -262,3 +263,26 @@ async def test_apply_git_changes_with_git_rm_template(
     config_path = f"{repo_dir}/{TEST_CONFIG_PATH}"
     template_change_details = await apply_git_changes(config_path, repo_dir)
     assert template_change_details is not None
+
+
+@pytest.mark.asyncio
+async def test_apply_git_changes_reuses_flagged_modified_templates(templates_repo):
+    config_path, repo_dir = templates_repo
+    config = await load_config(config_path)
+    template_path = f"{repo_dir}/{TEST_TEMPLATE_PATH}"
+    template = load_templates([template_path], config.template_map)[0]
+    template.deleted = True
+    template.write()
+
+    with mock.patch(
+        "iambic.request_handler.git_apply.load_templates", wraps=load_templates
+    ) as load_templates_spy:
+        await apply_git_changes(config_path, repo_dir)
+
+    # The modified file is only loaded by the batch load,
+    # the version written by flag_expired_resources is reused afterwards.
+    loaded_paths = [
+        str(path) for call in load_templates_spy.call_args_list for path in call.args[0]
+    ]
+    assert loaded_paths.count(template_path) == 1
+    assert not os.path.exists(template_path)
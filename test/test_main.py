@@ -4,13 +4,14 @@ import asyncio
 import os
 import shutil
 import tempfile
+from unittest import mock
 
 import pytest
 
 import iambic.plugins.v0_1_0.example
 from iambic.config.dynamic_config import load_config
 from iambic.core.utils import gather_templates
-from iambic.main import ctx, run_apply
+from iambic.main import ctx, load_repo_config_and_templates, run_apply, run_expire
 
 TEST_TEMPLATE_YAML = """template_type: NOQ::Example::LocalFile
 name: test_template
@@ -83,3 +84,27 @@ def test_run_apply(mock_context, example_test_filesystem):
     with open(f"{repo_dir}/{TEST_TEMPLATE_PATH}", "r") as f:
         after_template_content = "\n".join(f.readlines())
     assert "tomorrow" not in after_template_content
+
+
+def test_load_repo_config_and_templates(example_test_filesystem):
+    _, repo_dir = example_test_filesystem
+    config, templates = asyncio.run(load_repo_config_and_templates(repo_dir, []))
+    assert "NOQ::Example::LocalFile" in config.template_map
+    assert f"{repo_dir}/{TEST_TEMPLATE_PATH}" in [str(path) for path in templates]
+
+    # Provided templates are not gathered
+    with mock.patch("iambic.main.gather_templates", side_effect=AssertionError):
+        _, templates = asyncio.run(
+            load_repo_config_and_templates(repo_dir, ["fake_template.yaml"])
+        )
+    assert templates == ["fake_template.yaml"]
+
+
+def test_run_expire_uses_a_single_event_loop(example_test_filesystem):
+    _, repo_dir = example_test_filesystem
+    with mock.patch("iambic.main.asyncio.run", wraps=asyncio.run) as mock_run:
+        run_expire([], repo_dir)
+    assert mock_run.call_count == 1
+
+    with open(f"{repo_dir}/{TEST_TEMPLATE_PATH}", "r") as f:
+        assert "tomorrow" not in f.read()